@@ -13,9 +13,36 @@ Components:
 - ECAN: Economic Attention (3×3×3×3 = 81 states)
 """
 
-from .core import CognitiveSingularity
+import importlib
 
 __version__ = "1.0.0"
 __all__ = [
-    "CognitiveSingularity"
-]
\ No newline at end of file
+    "AsyncCognitiveSingularity",
+    "CognitiveSingularity",
+    "DistributedSingularity",
+    "ProcessPoolEngine",
+    "ThreadPoolEngine"
+]
+
+# Exports are imported on first access, so importing the package (or only
+# the core) never pulls in asyncio, multiprocessing or concurrent.futures
+_EXPORTS = {
+    "AsyncCognitiveSingularity": ".aio",
+    "CognitiveSingularity": ".core",
+    "DistributedSingularity": ".distributed",
+    "ProcessPoolEngine": ".parallel",
+    "ThreadPoolEngine": ".parallel"
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
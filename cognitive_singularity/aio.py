@@ -0,0 +1,185 @@
+"""
+asyncio front end for the cognitive singularity.
+
+AsyncCognitiveSingularity queues concurrent process() calls and runs them as
+adaptive micro-batches through the vectorised batch path in an executor, so
+the event loop never blocks on NumPy work.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .core import CognitiveSingularity
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCognitiveSingularity:
+    """
+    Micro-batching asyncio wrapper around a CognitiveSingularity.
+    
+    A batch is dispatched as soon as max_batch_size queries are waiting or
+    max_wait seconds have passed since its first query arrived. Requests that
+    pile up while a batch is running are drained without waiting, so batches
+    grow with load and shrink to single queries when the service is idle.
+    Once max_queue_size queries are pending, process() waits for room
+    (backpressure) instead of growing the queue without bound. When a batch
+    fails, its queries are rerun one at a time, so one bad query only fails
+    its own caller. The queue and batching task follow the running loop, so
+    one instance can serve several asyncio.run() calls in turn.
+    """
+    
+    def __init__(self, singularity: Optional[CognitiveSingularity] = None,
+                 max_batch_size: int = 256, max_wait: float = 0.001,
+                 max_queue_size: int = 4096, executor: Optional[Executor] = None):
+        """
+        Args:
+            singularity: Instance that runs the batches (created if omitted)
+            max_batch_size: Upper bound on queries per batch
+            max_wait: Seconds a partial batch may wait for more queries
+            max_queue_size: Pending queries allowed before process() blocks
+            executor: Executor for the batch work (loop default if omitted)
+        """
+        if max_batch_size < 1 or max_queue_size < 1:
+            raise ValueError("max_batch_size and max_queue_size must be positive")
+        if max_wait < 0:
+            raise ValueError(f"max_wait must be non-negative, got {max_wait}")
+        
+        self.singularity = singularity if singularity is not None else CognitiveSingularity()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue_size = max_queue_size
+        self.executor = executor
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Requests taken off the queue for the batch being collected or run
+        self._batch: List[Tuple[str, asyncio.Future]] = []
+        self.batches = 0
+        self.queries = 0
+    
+    async def process(self, query: str) -> Dict[str, Any]:
+        """Process one query; the result matches process_cognitive_query exactly."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._loop is not loop:
+            self._start(loop)
+        
+        future = loop.create_future()
+        await self._queue.put((query, future))
+        return await future
+    
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Create the queue and batching task on loop. State bound to an earlier
+        loop is dropped: asyncio.run() cancels that loop's tasks when it ends.
+        """
+        self._loop = loop
+        self._batch = []
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._worker = loop.create_task(self._run())
+    
+    async def _run(self) -> None:
+        """Collect queued requests into batches and run them one at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect(loop)
+            queries = [query for query, _ in batch]
+            
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, self.singularity.process_cognitive_queries, queries)
+            except Exception as error:
+                if len(batch) == 1:
+                    _settle(batch[0][1], error=error)
+                else:
+                    await self._run_singly(loop, batch)
+            else:
+                for (_, future), result in zip(batch, results):
+                    _settle(future, result)
+            
+            self.batches += 1
+            self.queries += len(batch)
+    
+    async def _run_singly(self, loop: asyncio.AbstractEventLoop,
+                          batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Rerun a failed batch one query at a time, so each caller gets its own result or error."""
+        for query, future in batch:
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, self.singularity.process_cognitive_queries, [query])
+            except Exception as error:
+                _settle(future, error=error)
+            else:
+                _settle(future, results[0])
+    
+    async def _collect(self, loop: asyncio.AbstractEventLoop) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for one request, then gather more until the size or time bound."""
+        batch = self._batch = []
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    def stats(self) -> Dict[str, float]:
+        """Batching counters: batches run, queries served and mean batch size."""
+        return {
+            'batches': self.batches,
+            'queries': self.queries,
+            'mean_batch_size': self.queries / self.batches if self.batches else 0.0,
+            'pending': self._queue.qsize() if self._queue is not None else 0
+        }
+    
+    async def close(self) -> None:
+        """Stop the batching task; requests still waiting for a result are cancelled."""
+        if self._worker is None:
+            return
+        
+        # A worker bound to an earlier loop was cancelled when asyncio.run() ended it
+        if self._loop is asyncio.get_running_loop():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            
+            for _, future in self._batch:
+                future.cancel()
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                future.cancel()
+        self._batch = []
+        self._worker = None
+        self._queue = None
+        self._loop = None
+    
+    async def __aenter__(self) -> "AsyncCognitiveSingularity":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+def _settle(future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+    """Resolve future unless its caller has already gone away (e.g. cancelled)."""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
@@ -0,0 +1,277 @@
+"""
+Offline benchmark suite for the cognitive pipeline.
+
+Each case times one hot path (encoding, single and batched processing,
+thread, process and distributed engines, tensor-field generation, config
+export, the large shape preset, quantised weights, result caching) and
+reports throughput plus p50/p99 latency. Results are plain JSON so they can
+be committed as a baseline and compared on later runs.
+"""
+
+import os
+import platform
+import tempfile
+import time
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .cache import ResultCache
+from .core import CognitiveSingularity
+
+FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.25
+
+
+class Regression(NamedTuple):
+    """A benchmark whose per-item latency grew beyond the threshold."""
+    name: str
+    baseline: float
+    current: float
+    
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def make_query(fields: int, id: int = 0) -> str:
+    """A GraphQL query selecting the given number of nested fields."""
+    selection = " ".join(f"field{i} {{ value }}" for i in range(fields))
+    return f"query Benchmark {{ cognitive(id: {id}) {{ {selection} }} }}"
+
+
+def make_queries(count: int, fields: int = 4) -> List[str]:
+    """
+    Distinct queries of the same shape, so nothing is served from cache
+    (they differ in an argument, not in layout, so normalisation keeps them apart).
+    """
+    return [make_query(fields, id) for id in range(count)]
+
+
+def measure(fn: Callable[[], Any], iterations: int, items: int = 1,
+            warmup: int = 1) -> Dict[str, float]:
+    """
+    Time fn over iterations calls and summarise the latency distribution.
+    items is the number of queries one call handles, for per-item throughput.
+    """
+    for _ in range(warmup):
+        fn()
+    
+    samples = np.empty(iterations, dtype=np.float64)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples[i] = time.perf_counter() - start
+    
+    total = float(samples.sum())
+    return {
+        'iterations': iterations,
+        'items': items,
+        'p50': float(np.percentile(samples, 50)),
+        'p99': float(np.percentile(samples, 99)),
+        'mean': total / iterations,
+        'per_item': total / (iterations * items),
+        'throughput': iterations * items / total if total > 0 else float('inf')
+    }
+
+
+def _cycle(values: List[Any]) -> Callable[[], Any]:
+    """Return a function yielding values round-robin, one per call."""
+    state = {'i': 0}
+    
+    def next_value():
+        value = values[state['i'] % len(values)]
+        state['i'] += 1
+        return value
+    
+    return next_value
+
+
+def run_benchmarks(quick: bool = False, include_processes: bool = True,
+                   only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Run every benchmark case and return {name: measurement}.
+    quick shrinks iteration counts for smoke runs; only filters by name prefix.
+    """
+    scale = 0.05 if quick else 1.0
+    
+    def iters(n: int) -> int:
+        return max(2, int(n * scale))
+    
+    results: Dict[str, Dict[str, float]] = {}
+    
+    def case(name: str, fn: Callable[[], Any], iterations: int, items: int = 1) -> None:
+        if only is None or any(name.startswith(prefix) for prefix in only):
+            results[name] = measure(fn, iters(iterations), items)
+    
+    uncached = CognitiveSingularity(encoding_cache_size=0, plan_cache_size=0)
+    cached = CognitiveSingularity()
+    
+    for fields in (1, 16, 256):
+        next_query = _cycle(make_queries(64, fields))
+        case(f"encode/uncached/fields={fields}",
+             lambda: uncached.graphql_query_to_tensor(next_query()), 2000)
+    
+    hot_query = make_query(4)
+    case("encode/cached", lambda: cached.graphql_query_to_tensor(hot_query), 20000)
+    case("query/cached", lambda: cached.process_cognitive_query(hot_query), 20000)
+    case("query/compact", lambda: cached.process_cognitive_query(hot_query, compact=True), 20000)
+    next_query = _cycle(make_queries(256))
+    case("query/uncached", lambda: uncached.process_cognitive_query(next_query()), 2000)
+    
+    # Whole results cached by fingerprint: 256 distinct queries, all hits once filled
+    result_cached = CognitiveSingularity(result_cache=ResultCache())
+    repeated = make_queries(256)
+    for query in repeated:
+        result_cached.process_cognitive_query(query)
+    next_repeat = _cycle(repeated)
+    case("query/result_cache", lambda: result_cached.process_cognitive_query(next_repeat()), 20000)
+    
+    # Weights kept as block int8 and dequantised inside the GNN and ESN loops
+    quantised = CognitiveSingularity(encoding_cache_size=0, field_type='q8_0')
+    case("query/quantised/q8_0", lambda: quantised.process_cognitive_query(next_query()), 2000)
+    
+    # Attention-only endpoint: plans are cached, encodings are not
+    selective = CognitiveSingularity(encoding_cache_size=0)
+    case("query/selected/ecan", lambda: selective.process_cognitive_query(next_query(), components='ecan'), 2000)
+    
+    for batch_size in (1, 64, 1024):
+        batch = make_queries(batch_size)
+        matrix = cached.graphql_queries_to_tensor(batch)
+        case(f"batch/activate/size={batch_size}",
+             lambda: cached.process_tensor_batch(matrix), 20000 // batch_size + 20, batch_size)
+        case(f"batch/queries/size={batch_size}",
+             lambda: uncached.process_cognitive_queries(batch), 2000 // batch_size + 5, batch_size)
+    
+    # Same batch, results kept as one float32 matrix instead of per-query dicts
+    case("batch/compact/size=1024", lambda: uncached.process_cognitive_queries(batch, compact=True), 7, len(batch))
+    
+    # MetroHash64 fingerprints of a batch of distinct queries
+    from .graphql import query_fingerprints
+    
+    fingerprint_batch = make_queries(1024)
+    case("hash/fingerprints/size=1024", lambda: query_fingerprints(fingerprint_batch), 200, len(fingerprint_batch))
+    
+    case("field/generate", lambda: cached.generate_tensor_field(seed=0), 2000)
+    
+    # The 390,005-state preset, built only when selected (construction takes seconds)
+    if only is None or any("preset/large".startswith(prefix) or prefix.startswith("preset/large")
+                           for prefix in only):
+        large = CognitiveSingularity(shapes='large', encoding_cache_size=0)
+        next_query = _cycle(make_queries(256))
+        case("preset/large/query", lambda: large.process_cognitive_query(next_query()), 20)
+        large_batch = make_queries(64)
+        case("preset/large/batch/size=64", lambda: large.process_cognitive_queries(large_batch, compact=True),
+             3, len(large_batch))
+    case("construct/default", CognitiveSingularity, 500)
+    
+    with ExitStack() as stack:
+        directory = stack.enter_context(tempfile.TemporaryDirectory())
+        config_path = os.path.join(directory, "bench.ggml")
+        case("config/save", lambda: cached.save_ggml_config(config_path), 500)
+        
+        from .parallel import ProcessPoolEngine, ThreadPoolEngine
+        
+        batch = make_queries(1024)
+        for threads in (1, 2, 4):
+            name = f"engine/threads={threads}"
+            if only is None or any(name.startswith(prefix) for prefix in only):
+                engine = stack.enter_context(ThreadPoolEngine(
+                    CognitiveSingularity(encoding_cache_size=0), max_workers=threads, chunk_size=128))
+                case(name, lambda: engine.process_cognitive_queries(batch), 10, len(batch))
+        
+        if include_processes:
+            for processes in (1, 2, 4):
+                name = f"engine/processes={processes}"
+                if only is None or any(name.startswith(prefix) for prefix in only):
+                    engine = stack.enter_context(ProcessPoolEngine(
+                        max_workers=processes, capacity=1024, chunk_size=128, encoding_cache_size=0))
+                    case(name, lambda: engine.process_states(batch), 10, len(batch))
+            
+            # One worker process per component, scattered over socket pairs
+            if only is None or any("engine/distributed".startswith(prefix) for prefix in only):
+                from .distributed import DistributedSingularity
+                
+                cluster = stack.enter_context(DistributedSingularity(CognitiveSingularity(encoding_cache_size=0)))
+                case("engine/distributed", lambda: cluster.process_cognitive_queries(batch), 10, len(batch))
+    
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine a run happened on."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def make_report(results: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    """Wrap results in the machine-readable report format."""
+    return {
+        'version': FORMAT_VERSION,
+        'environment': environment(),
+        'results': results
+    }
+
+
+def environment_changes(report: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    """
+    {field: (recorded, current)} for every environment field that differs
+    between baseline and report; empty when either records none.
+    """
+    recorded, current = baseline.get('environment'), report.get('environment')
+    if not recorded or not current:
+        return {}
+    return {key: (recorded.get(key), current.get(key))
+            for key in sorted(set(recorded) | set(current)) if recorded.get(key) != current.get(key)}
+
+
+def _check_environment(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Raise ValueError when report ran somewhere other than where baseline was recorded."""
+    changes = environment_changes(report, baseline)
+    if changes:
+        described = ", ".join(f"{key} {recorded!r} -> {current!r}" for key, (recorded, current) in changes.items())
+        raise ValueError(f"Baseline was recorded in a different environment ({described}); "
+                         f"timings are not comparable")
+
+
+def merge_baseline(report: Dict[str, Any], baseline: Optional[Dict[str, Any]],
+                   ignore_environment: bool = False) -> Dict[str, Any]:
+    """
+    A baseline with the cases in report refreshed and every other case kept,
+    so re-recording a few cases cannot hide a slowdown elsewhere. Raises
+    ValueError when the environments differ and some cases would be kept,
+    since they would then be labelled with an environment they never ran in.
+    """
+    if baseline is not None and not ignore_environment and set(baseline.get('results', {})) - set(report['results']):
+        _check_environment(report, baseline)
+    results = dict(baseline.get('results', {})) if baseline is not None else {}
+    results.update(report['results'])
+    return dict(report, results=results)
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        threshold: float = DEFAULT_THRESHOLD,
+                        ignore_environment: bool = False) -> List[Regression]:
+    """
+    Return the benchmarks whose per-item latency exceeds the baseline by more
+    than threshold (0.25 = 25% slower). Cases missing from either side are skipped.
+    Raises ValueError when the baseline was recorded in another environment
+    (see environment()), unless ignore_environment.
+    """
+    if not ignore_environment:
+        _check_environment(report, baseline)
+    
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None or previous['per_item'] <= 0:
+            continue
+        if current['per_item'] > previous['per_item'] * (1 + threshold):
+            regressions.append(Regression(name, previous['per_item'], current['per_item']))
+    
+    return regressions
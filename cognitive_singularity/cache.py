@@ -0,0 +1,419 @@
+"""
+Bounded caches for the cognitive pipeline.
+
+TensorCache keeps the most recently used query encodings so that repeated
+GraphQL queries skip the encoding step entirely. PlanCache keeps compiled
+query plans by normalised text, with an index from raw query text, so each
+distinct query shape is parsed once and equivalent queries share a plan.
+ResultCache keeps the processed states of whole queries by fingerprint, so
+a repeated query skips encoding and every activation.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+import numpy as np
+
+
+class TensorCache:
+    """
+    Bounded LRU cache of encoded query tensors keyed by query text.
+    Cached tensors are stored read-only so they can be shared without copying.
+    All operations are guarded by a lock, so one cache can serve many threads.
+    """
+    
+    def __init__(self, maxsize: int = 1024):
+        """Create an empty cache holding at most maxsize tensors."""
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+    
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the cached tensor for key (marking it most recent), or None."""
+        with self._lock:
+            tensor = self._entries.get(key)
+            if tensor is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return tensor
+    
+    def put(self, key: str, tensor: np.ndarray) -> np.ndarray:
+        """Store tensor under key, evicting the least recently used entry if full."""
+        tensor.setflags(write=False)
+        with self._lock:
+            self._entries[key] = tensor
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        
+        return tensor
+    
+    def clear(self) -> None:
+        """Drop every cached tensor and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of cache effectiveness counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+class PlanCache:
+    """
+    Bounded LRU cache of compiled query plans keyed by normalised text.
+    An alias index maps raw query text to its plan, so a repeated query skips
+    parsing and a differently written but equivalent query reuses the plan
+    already cached for its normalised text. Evicting a plan drops its aliases,
+    so no more than maxsize plans are ever kept alive. Guarded by a lock like
+    TensorCache.
+    """
+    
+    def __init__(self, maxsize: int = 1024, max_aliases: Optional[int] = None):
+        """
+        Create an empty cache of at most maxsize plans and max_aliases raw
+        texts (4 * maxsize by default).
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        
+        self.maxsize = maxsize
+        self.max_aliases = 4 * maxsize if max_aliases is None else max_aliases
+        self._lock = threading.Lock()
+        self._plans: "OrderedDict[str, Any]" = OrderedDict()
+        self._aliases: "OrderedDict[str, Any]" = OrderedDict()
+        # Raw texts aliasing each cached plan, by normalised text
+        self._alias_keys: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._plans)
+    
+    def __contains__(self, text: str) -> bool:
+        return text in self._plans
+    
+    def get(self, query: str) -> Optional[Any]:
+        """Return the plan compiled for this raw query text (marking it most recent), or None."""
+        with self._lock:
+            plan = self._aliases.get(query)
+            if plan is None:
+                self.misses += 1
+                return None
+            
+            self._aliases.move_to_end(query)
+            self._plans.move_to_end(plan.text)
+            self.hits += 1
+            return plan
+    
+    def put(self, query: str, plan: Any) -> Any:
+        """
+        Store plan for the raw query text and return the canonical plan: the
+        one already cached under plan.text when there is one.
+        """
+        with self._lock:
+            cached = self._plans.get(plan.text)
+            if cached is not None:
+                plan = cached
+                self.shared += 1
+            self._plans[plan.text] = plan
+            self._plans.move_to_end(plan.text)
+            previous = self._aliases.get(query)
+            if previous is not None and previous.text != plan.text:
+                self._unlink(query, previous.text)
+            self._aliases[query] = plan
+            self._aliases.move_to_end(query)
+            self._alias_keys.setdefault(plan.text, set()).add(query)
+            
+            while len(self._plans) > self.maxsize:
+                text, _ = self._plans.popitem(last=False)
+                for alias in self._alias_keys.pop(text, ()):
+                    del self._aliases[alias]
+                self.evictions += 1
+            while len(self._aliases) > self.max_aliases:
+                alias, evicted = self._aliases.popitem(last=False)
+                self._unlink(alias, evicted.text)
+        
+        return plan
+    
+    def _unlink(self, alias: str, text: str) -> None:
+        """Forget that alias points at the plan for text."""
+        aliases = self._alias_keys.get(text)
+        if aliases is not None:
+            aliases.discard(alias)
+            if not aliases:
+                del self._alias_keys[text]
+    
+    def clear(self) -> None:
+        """Drop every cached plan and reset the counters."""
+        with self._lock:
+            self._plans.clear()
+            self._aliases.clear()
+            self._alias_keys.clear()
+            self.hits = 0
+            self.misses = 0
+            self.shared = 0
+            self.evictions = 0
+    
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of cache effectiveness counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'shared': self.shared,
+                'evictions': self.evictions,
+                'size': len(self._plans),
+                'aliases': len(self._aliases),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+# Approximate bookkeeping per ResultCache entry (key, record, array header,
+# index slots), counted against max_bytes on top of the cached array
+ENTRY_OVERHEAD = 384
+
+EVICTION_POLICIES = ('lru', 'lfu')
+
+_NO_VERSION = object()
+
+
+class _Entry:
+    """A cached value with its size, expiry time and access count."""
+    
+    __slots__ = ('value', 'nbytes', 'expires', 'count')
+    
+    def __init__(self, value: np.ndarray, nbytes: int, expires: float):
+        self.value = value
+        self.nbytes = nbytes
+        self.expires = expires
+        self.count = 1
+
+
+class ResultCache:
+    """
+    Bounded cache of query results (read-only state arrays) keyed by query
+    fingerprint and component selection.
+    
+    Entries are bounded by count and optionally by bytes (array bytes plus
+    ENTRY_OVERHEAD each) and evicted least recently ('lru') or least
+    frequently ('lfu', ties broken by recency) used. With a ttl, entries
+    older than ttl seconds are dropped when next looked up (or by expire()).
+    check_version() drops every entry when the components' configuration
+    changes. Guarded by a lock like TensorCache; use one cache per instance.
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None,
+                 policy: str = 'lru', ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_entries: Most results kept
+            max_bytes: Most bytes kept (None for no byte bound)
+            policy: Eviction policy, 'lru' or 'lfu'
+            ttl: Seconds a result stays valid (None never expires)
+            clock: Monotonic time source in seconds
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy!r}; expected one of {EVICTION_POLICIES}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl must be positive, got {ttl}")
+        
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, _Entry] = {}
+        # Keys by access count, each in recency order; LRU keeps every key at count 1
+        self._buckets: Dict[int, "OrderedDict[Hashable, None]"] = {}
+        self._version: Any = _NO_VERSION
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.bypasses = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+    
+    def _unlink(self, key: Hashable) -> _Entry:
+        """Remove key from the entries and its bucket (lock held)."""
+        entry = self._entries.pop(key)
+        bucket = self._buckets[entry.count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[entry.count]
+        self.nbytes -= entry.nbytes
+        return entry
+    
+    def _link(self, key: Hashable, entry: _Entry) -> None:
+        """Add key as the most recent entry of its count's bucket (lock held)."""
+        self._entries[key] = entry
+        bucket = self._buckets.get(entry.count)
+        if bucket is None:
+            bucket = self._buckets[entry.count] = OrderedDict()
+        bucket[key] = None
+        self.nbytes += entry.nbytes
+    
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """Return the cached result for key (recording the access), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if self.ttl is not None and entry.expires <= self.clock():
+                self._unlink(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            if self.policy == 'lfu':
+                self._unlink(key)
+                entry.count += 1
+                self._link(key, entry)
+            else:
+                self._buckets[1].move_to_end(key)
+            self.hits += 1
+            return entry.value
+    
+    def put(self, key: Hashable, value: np.ndarray) -> np.ndarray:
+        """
+        Store value (made read-only) under key and evict down to the bounds.
+        A value larger than max_bytes on its own is returned but not kept.
+        """
+        value.setflags(write=False)
+        nbytes = value.nbytes + ENTRY_OVERHEAD
+        with self._lock:
+            if key in self._entries:
+                self._unlink(key)
+            if self.max_bytes is not None and nbytes > self.max_bytes:
+                return value
+            
+            # Evict before inserting: under LFU the new entry has the lowest count
+            while self._entries and (len(self._entries) >= self.max_entries or (
+                    self.max_bytes is not None and self.nbytes + nbytes > self.max_bytes)):
+                self._unlink(next(iter(self._buckets[min(self._buckets)])))
+                self.evictions += 1
+            
+            expires = self.clock() + self.ttl if self.ttl is not None else float('inf')
+            self._link(key, _Entry(value, nbytes, expires))
+        
+        return value
+    
+    def expire(self) -> int:
+        """Drop every entry past its ttl now; returns how many were dropped."""
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            now = self.clock()
+            expired = [key for key, entry in self._entries.items() if entry.expires <= now]
+            for key in expired:
+                self._unlink(key)
+            self.expirations += len(expired)
+            return len(expired)
+    
+    def check_version(self, version: Hashable) -> None:
+        """
+        Invalidate every entry when version (a token of the components'
+        configuration) differs from the one the entries were cached under.
+        """
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    if self._version is not _NO_VERSION:
+                        self._clear_entries()
+                        self.invalidations += 1
+                    self._version = version
+    
+    def invalidate(self) -> None:
+        """Drop every entry (e.g. after changing weights in place), keeping the counters."""
+        with self._lock:
+            self._clear_entries()
+            self.invalidations += 1
+    
+    def record_bypass(self) -> None:
+        """Count a lookup skipped because its result is not cacheable."""
+        with self._lock:
+            self.bypasses += 1
+    
+    def _clear_entries(self) -> None:
+        self._entries.clear()
+        self._buckets.clear()
+        self.nbytes = 0
+    
+    def clear(self) -> None:
+        """Drop every cached result and reset the counters."""
+        with self._lock:
+            self._clear_entries()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+            self.invalidations = 0
+            self.bypasses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache effectiveness counters, for sizing the bounds."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'bypasses': self.bypasses,
+                'size': len(self._entries),
+                'bytes': self.nbytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'policy': self.policy,
+                'ttl': self.ttl,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,193 @@
+"""
+Binary tensor-field checkpoints.
+
+File layout (all integers little-endian):
+
+    magic        4 bytes   b"CSTF"
+    version      uint32
+    alignment    uint32    payload alignment in bytes
+    count        uint32    number of tensors
+    count entries, each:
+        name_len uint16, name (utf-8)
+        dtype    uint8     code from DTYPE_CODES
+        ndim     uint8, shape (ndim x uint64; the logical shape, also for
+                 q8_0 tensors whose payload is whole blocks)
+        offset   uint64    absolute payload offset, a multiple of alignment
+        nbytes   uint64
+    payloads, each starting at its aligned offset
+
+Payloads are raw little-endian arrays, so load_tensor_field can hand out
+zero-copy np.memmap views and many processes can share one file through
+the page cache. Quantised fields (see quant) are stored in their compact
+form and load back as Float16Tensor / BlockQ8Tensor over the same views.
+"""
+
+import os
+import struct
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from .quant import BLOCK_Q8_0, QuantizedTensor, Tensor, from_storage, storage_nbytes
+
+MAGIC = b"CSTF"
+VERSION = 1
+DEFAULT_ALIGNMENT = 64
+
+# On-disk dtype codes; codes are never reused
+DTYPE_CODES = {
+    0: np.dtype('<f4'),
+    1: np.dtype('<f2'),
+    2: BLOCK_Q8_0,
+}
+
+# quant storage type of each dtype code, for payload size checks
+_QTYPES = {0: 'f32', 1: 'f16', 2: 'q8_0'}
+
+_PREAMBLE = struct.Struct('<4sIII')
+_ENTRY_HEAD = struct.Struct('<H')
+_ENTRY_TYPE = struct.Struct('<BB')
+_ENTRY_TAIL = struct.Struct('<QQ')
+
+
+class CheckpointEntry(NamedTuple):
+    """Offset table row describing one stored tensor."""
+    name: str
+    dtype: np.dtype
+    shape: Tuple[int, ...]
+    offset: int
+    nbytes: int
+
+
+def _dtype_code(dtype: np.dtype) -> int:
+    for code, stored in DTYPE_CODES.items():
+        if stored == dtype.newbyteorder('<'):
+            return code
+    raise ValueError(f"Unsupported checkpoint dtype: {dtype}")
+
+
+def _align(offset: int, alignment: int) -> int:
+    return -(-offset // alignment) * alignment
+
+
+def save_tensor_field(tensor_field: Dict[str, Tensor], path: str,
+                      alignment: int = DEFAULT_ALIGNMENT) -> str:
+    """
+    Write a tensor field to a binary checkpoint and return the path.
+    Tensors are stored in dict order with aligned payloads.
+    """
+    if alignment < 1 or alignment & (alignment - 1):
+        raise ValueError(f"alignment must be a power of two, got {alignment}")
+    
+    arrays = []
+    for name, tensor in tensor_field.items():
+        # Quantised tensors store their compact payload under the logical shape
+        shape = tensor.shape
+        tensor = tensor.data if isinstance(tensor, QuantizedTensor) else np.asarray(tensor)
+        dtype = DTYPE_CODES[_dtype_code(tensor.dtype)]
+        arrays.append((name, tuple(shape), np.ascontiguousarray(tensor, dtype=dtype)))
+    
+    header_size = _PREAMBLE.size
+    for name, shape, tensor in arrays:
+        header_size += (_ENTRY_HEAD.size + len(name.encode('utf-8')) + _ENTRY_TYPE.size
+                        + 8 * len(shape) + _ENTRY_TAIL.size)
+    
+    entries = []
+    offset = _align(header_size, alignment)
+    for name, shape, tensor in arrays:
+        entries.append(CheckpointEntry(name, tensor.dtype, shape, offset, tensor.nbytes))
+        offset = _align(offset + tensor.nbytes, alignment)
+    
+    with open(path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, alignment, len(entries)))
+        for entry in entries:
+            encoded = entry.name.encode('utf-8')
+            f.write(_ENTRY_HEAD.pack(len(encoded)))
+            f.write(encoded)
+            f.write(_ENTRY_TYPE.pack(_dtype_code(entry.dtype), len(entry.shape)))
+            f.write(struct.pack(f'<{len(entry.shape)}Q', *entry.shape))
+            f.write(_ENTRY_TAIL.pack(entry.offset, entry.nbytes))
+        
+        for entry, (_, _, tensor) in zip(entries, arrays):
+            f.write(b'\0' * (entry.offset - f.tell()))
+            f.write(tensor.data)
+    
+    return path
+
+
+def _read(f, size: int, what: str, path: str) -> bytes:
+    """Read exactly size bytes; a short read means the header is truncated."""
+    data = f.read(size)
+    if len(data) < size:
+        raise ValueError(f"Truncated checkpoint {path}: {what} ends at byte {f.tell()}")
+    return data
+
+
+def read_checkpoint_header(path: str) -> List[CheckpointEntry]:
+    """
+    Read and validate the offset table of a checkpoint. Truncated headers,
+    payloads past the end of the file and payload sizes that do not match
+    the stored shape raise ValueError naming the entry.
+    """
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ValueError(f"{path} is too short to be a tensor-field checkpoint")
+        
+        magic, version, alignment, count = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a tensor-field checkpoint (magic {magic!r})")
+        if version != VERSION:
+            raise ValueError(f"Unsupported checkpoint version {version} in {path}")
+        
+        entries = []
+        for index in range(count):
+            (name_len,) = _ENTRY_HEAD.unpack(_read(f, _ENTRY_HEAD.size, f"entry {index}", path))
+            try:
+                name = _read(f, name_len, f"entry {index}", path).decode('utf-8')
+            except UnicodeDecodeError:
+                raise ValueError(f"Corrupt name for entry {index} in {path}") from None
+            code, ndim = _ENTRY_TYPE.unpack(_read(f, _ENTRY_TYPE.size, f"entry {name!r}", path))
+            shape = struct.unpack(f'<{ndim}Q', _read(f, 8 * ndim, f"entry {name!r}", path))
+            offset, nbytes = _ENTRY_TAIL.unpack(_read(f, _ENTRY_TAIL.size, f"entry {name!r}", path))
+            
+            if code not in DTYPE_CODES:
+                raise ValueError(f"Unknown dtype code {code} for {name!r} in {path}")
+            expected = storage_nbytes(shape, _QTYPES[code])
+            if nbytes != expected:
+                raise ValueError(f"Payload of {name!r} in {path} is {nbytes} bytes, "
+                                 f"expected {expected} for shape {shape}")
+            if offset + nbytes > file_size:
+                raise ValueError(f"Payload of {name!r} in {path} ends at byte {offset + nbytes}, "
+                                 f"past the end of the file ({file_size} bytes)")
+            entries.append(CheckpointEntry(name, DTYPE_CODES[code], tuple(shape), offset, nbytes))
+    
+    return entries
+
+
+def load_tensor_field(path: str, mmap: bool = True) -> Dict[str, Tensor]:
+    """
+    Load a tensor field written by save_tensor_field.
+    
+    With mmap=True every tensor is a read-only np.memmap view into a single
+    mapping of the file, so loading is O(header) and the payload is shared
+    through the page cache. With mmap=False the tensors are read into memory.
+    """
+    entries = read_checkpoint_header(path)
+    
+    if mmap:
+        raw = np.memmap(path, dtype=np.uint8, mode='r')
+        return {
+            entry.name: from_storage(raw[entry.offset:entry.offset+entry.nbytes].view(entry.dtype), entry.shape)
+            for entry in entries
+        }
+    
+    tensor_field = {}
+    with open(path, 'rb') as f:
+        for entry in entries:
+            f.seek(entry.offset)
+            count = entry.nbytes // entry.dtype.itemsize
+            tensor_field[entry.name] = from_storage(np.fromfile(f, dtype=entry.dtype, count=count), entry.shape)
+    
+    return tensor_field
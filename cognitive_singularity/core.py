@@ -3,13 +3,74 @@ Core CognitiveSingularity implementation - the unified field that orchestrates a
 """
 
 import numpy as np
-from typing import Dict, Tuple, Any, Optional
-import json
+from typing import Dict, Tuple, Any, Optional, Iterable, Iterator, List, Sequence, Union
+import copy
+import functools
 import logging
-from pathlib import Path
+import math
+import threading
+
+from .cache import PlanCache, ResultCache, TensorCache
+from .checkpoint import load_tensor_field, save_tensor_field
+from .ecan import AttentionBank
+from .graphql import GraphQLSyntaxError, QueryPlan, compile_query, opaque_plan
+from .layout import QueryArena
+from .metrics import Metrics
+from .quant import Tensor, storage_nbytes
+from .registry import ComponentRegistry, Shapes, default_registry, generate_tensor_field
+from .results import QueryResult, ResultBatch, ResultSchema
 
 logger = logging.getLogger(__name__)
 
+# A component selection: None (all), a name, a list of names, or 'auto'
+Components = Union[None, str, Iterable[str]]
+
+# Batches are encoded and activated in row chunks of about this many values,
+# so temporaries stay flat however wide the components grow
+BATCH_CHUNK_ELEMENTS = 1 << 20
+
+# States are enumerated this many at a time by iter_states()
+STATE_CHUNK = 1 << 20
+
+
+@functools.lru_cache(maxsize=256)
+def _prime_factors(n: int) -> Tuple[Tuple[int, int], ...]:
+    """(prime, count) pairs of n, computed once per n."""
+    factors = {}
+    d = 2
+    while d * d <= n:
+        while n % d == 0:
+            factors[d] = factors.get(d, 0) + 1
+            n //= d
+        d += 1
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return tuple(factors.items())
+
+
+@functools.lru_cache(maxsize=16)
+def _ggml_config(components: Tuple[Tuple[str, Tuple[int, ...]], ...], field_type: str) -> Dict[str, Any]:
+    """The GGML configuration of the given component shapes and field type, built once per set."""
+    total = sum(math.prod(shape) for _, shape in components)
+    config = {
+        "version": "1.0.0",
+        "tensor_field": {
+            "shape": [total],
+            "prime_factorization": dict(_prime_factors(total)),
+            "components": {
+                name: {"shape": list(shape), "params": math.prod(shape)}
+                for name, shape in components
+            }
+        },
+        "unified_field": "graphql-neural-hypergraph-membrane",
+        "frame_problem": "SOLVED"
+    }
+    # Quantised fields record their storage type; the float32 config stays as specified
+    if field_type != 'f32':
+        config["tensor_field"]["type"] = field_type
+        config["tensor_field"]["nbytes"] = sum(storage_nbytes(shape, field_type) for _, shape in components)
+    return config
+
 
 class CognitiveSingularity:
     """
@@ -19,188 +80,580 @@ class CognitiveSingularity:
     
     This is the core orchestrator that unifies all cognitive components
     through GraphQL as the universal cognitive protocol.
+    
+    Instances are thread-safe: encoding and tensor-field generation draw from
+    per-call np.random.Generator objects rather than the global NumPy RNG, and
+    the encoding cache is guarded by its own lock. One instance can therefore
+    be shared by every thread of a server (see parallel.ThreadPoolEngine).
     """
     
-    def __init__(self):
-        """Initialize the cognitive singularity with all component tensor shapes."""
-        self.components = {
-            'gnn': (7, 7, 7),        # 343 states = 7³
-            'das': (11, 5, 2),       # 110 states = 2 × 5 × 11
-            'esn': (13, 3, 3),       # 117 states = 3² × 13
-            'membrane': (5, 5, 5),   # 125 states = 5³
-            'ecan': (3, 3, 3, 3)     # 81 states = 3⁴
-        }
+    def __init__(self, encoding_cache_size: int = 1024, metrics: Optional[Metrics] = None,
+                 registry: Optional[ComponentRegistry] = None,
+                 tensor_field: Optional[Dict[str, Tensor]] = None,
+                 plan_cache_size: int = 1024, shapes: Shapes = None, field_type: str = 'f32',
+                 result_cache: Optional[ResultCache] = None):
+        """
+        Initialize the cognitive singularity with all component tensor shapes.
+        
+        Args:
+            encoding_cache_size: Number of query encodings kept in the LRU
+                tensor cache (0 disables caching)
+            metrics: Opt-in instrumentation; when None no timings are taken
+            registry: Components to run; defaults to the five built-ins
+                (gnn 7³, das 11×5×2, esn 13×3², membrane 5³, ecan 3⁴)
+            tensor_field: Learned weights for the built-in components (e.g. a
+                loaded checkpoint); defaults to the DEFAULT_FIELD_SEED field
+            plan_cache_size: Number of compiled query plans kept by
+                normalised text (0 parses every query)
+            shapes: Shapes of the built-in components: a preset name such as
+                'large', or {name: shape} overrides (see registry.PRESETS)
+            field_type: Storage of the learned weights: 'f32', or 'f16' /
+                'q8_0' to keep them quantised (see quant)
+            result_cache: Opt-in cache of whole query results by fingerprint
+                (see process_cognitive_query); None processes every query
+        """
+        if registry is not None and (tensor_field is not None or shapes is not None or field_type != 'f32'):
+            raise ValueError("tensor_field, shapes and field_type only apply to the default registry; "
+                             "pass them to default_registry() instead")
         
-        # Calculate total degrees of freedom
-        self.total_freedom = sum(np.prod(shape) for shape in self.components.values())
+        # Compile the components into an immutable plan: offsets, shapes and
+        # activation callables are fixed here, never looked up per query
+        if registry is None:
+            registry = default_registry(tensor_field, shapes=shapes, field_type=field_type)
+            default_layout = shapes is None
+        else:
+            default_layout = False
+        self.field_type = field_type
+        self.plan = registry.compile()
+        self.components = dict(self.plan.components)
+        self._all_columns = tuple(range(len(self.plan)))
+        self._schemas: Dict[Tuple[int, ...], ResultSchema] = {}
+        self.layout = self.plan.layout
+        self.total_freedom = self.layout.total
         
         # Verify the magical number 776
-        assert self.total_freedom == 776, f"Expected 776 states, got {self.total_freedom}"
+        if default_layout:
+            assert self.total_freedom == 776, f"Expected 776 states, got {self.total_freedom}"
         
-        logger.info(f"🌌 Cognitive Singularity initialized with {self.total_freedom} degrees of freedom")
-        logger.info(f"🔮 Prime factorization: {self.prime_factorize(self.total_freedom)}")
+        self.encoding_cache = TensorCache(encoding_cache_size) if encoding_cache_size > 0 else None
+        self.plan_cache = PlanCache(plan_cache_size) if plan_cache_size > 0 else None
+        
+        # Stateful components make results depend on earlier queries, so they
+        # are never cached; versioned ones invalidate the cache when they change
+        self.result_cache = result_cache
+        self._stateful_columns = frozenset(column for column, step in enumerate(self.plan.steps)
+                                           if getattr(step.processor, 'stateful', False))
+        self._versioned = tuple(step.processor for step in self.plan.steps
+                                if hasattr(step.processor, 'version'))
+        
+        # Component-level attention, seeded with each component's degrees of freedom
+        self.attention = AttentionBank(len(self.components), focus_size=len(self.components),
+                                       sti=[entry.size for entry in self.layout])
+        
+        # Per-thread reusable buffers for the single-query hot path
+        self._local = threading.local()
+        
+        self.metrics = metrics
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🌌 Cognitive Singularity initialized with %d degrees of freedom", self.total_freedom)
+            logger.info("🔮 Prime factorization: %s", self.prime_factorize(self.total_freedom))
     
     def prime_factorize(self, n: int) -> Dict[int, int]:
         """
         Discover the prime essence of cognitive complexity.
         Returns prime factorization as {prime: count} dictionary.
         """
-        factors = {}
-        d = 2
-        while d * d <= n:
-            while n % d == 0:
-                factors[d] = factors.get(d, 0) + 1
-                n //= d
-            d += 1
-        if n > 1:
-            factors[n] = factors.get(n, 0) + 1
-        
-        # Convert numpy types to native Python types for JSON serialization
-        return {int(k): int(v) for k, v in factors.items()}
+        # Native ints keep the result JSON serialisable
+        return dict(_prime_factors(int(n)))
     
     def enumerate_all_states(self) -> np.ndarray:
         """
-        Enumerate all 776 quantum states across all components.
-        Returns flattened state vector for validation.
+        Enumerate all quantum states (776 by default) across all components.
+        Returns flattened state vector for validation: every state's index in
+        the flat tensor, component by component in layout order. State i of a
+        component is layout[name].offset + i, so all states are distinct
+        (earlier versions restarted at 0 for every component).
         """
-        states = []
-        for name, shape in self.components.items():
-            component_states = np.arange(np.prod(shape)).reshape(shape)
-            states.append(component_states.flatten())
-        
-        return np.concatenate(states)
+        return np.arange(self.total_freedom)
     
-    def generate_tensor_field(self) -> Dict[str, np.ndarray]:
+    def iter_states(self, chunk_size: int = STATE_CHUNK) -> Iterator[np.ndarray]:
+        """enumerate_all_states() in consecutive chunks of at most chunk_size states."""
+        for start in range(0, self.total_freedom, chunk_size):
+            yield np.arange(start, min(start + chunk_size, self.total_freedom))
+    
+    def generate_tensor_field(self, seed: Optional[int] = None, out: Optional[Dict[str, Tensor]] = None,
+                              field_type: Optional[str] = None) -> Dict[str, Tensor]:
         """
         Generate the complete tensor field for all components.
         Each component gets its own tensor initialized to proper shape.
+        Passing a seed makes the field reproducible; None draws fresh entropy.
+        With out, the values are written into its (component-shaped) arrays.
+        field_type defaults to this instance's storage type.
         """
-        tensor_field = {}
-        for name, shape in self.components.items():
-            # Initialize with small random values for numerical stability
-            tensor_field[name] = np.random.normal(0, 0.01, shape).astype(np.float32)
+        # Initialize with small random values for numerical stability
+        return generate_tensor_field(self.components, seed=seed, out=out,
+                                     field_type=self.field_type if field_type is None else field_type)
+    
+    def save_tensor_field(self, path: str, tensor_field: Optional[Dict[str, Tensor]] = None,
+                          seed: Optional[int] = None) -> str:
+        """
+        Persist a tensor field (generated from seed if not given) as a binary checkpoint.
+        """
+        if tensor_field is None:
+            tensor_field = self.generate_tensor_field(seed=seed)
+        
+        self._check_tensor_field(tensor_field)
+        save_tensor_field(tensor_field, path)
         
+        logger.info(f"💾 Tensor field checkpoint saved to {path}")
+        return path
+    
+    def load_tensor_field(self, path: str, mmap: bool = True) -> Dict[str, Tensor]:
+        """
+        Load a binary tensor-field checkpoint, checking it matches the component shapes.
+        With mmap=True the tensors are zero-copy np.memmap views of the file.
+        """
+        tensor_field = load_tensor_field(path, mmap=mmap)
+        self._check_tensor_field(tensor_field)
         return tensor_field
     
+    def _check_tensor_field(self, tensor_field: Dict[str, Tensor]) -> None:
+        """Raise ValueError unless tensor_field has exactly our component shapes."""
+        if list(tensor_field) != list(self.components):
+            raise ValueError(f"Tensor field components {list(tensor_field)} "
+                             f"do not match {list(self.components)}")
+        for name, shape in self.components.items():
+            if tuple(tensor_field[name].shape) != tuple(shape):
+                raise ValueError(f"Tensor field {name} has shape {tensor_field[name].shape}, "
+                                 f"expected {shape}")
+    
     def calculate_attention_weights(self) -> np.ndarray:
         """
         Calculate attention weights across all components using ECAN principles.
-        Returns normalized attention vector of length 5 (one per component).
+        Returns the positive STI of self.attention normalised to sum to one,
+        one entry per component (uniform when no component has positive STI).
         """
-        # Simple attention based on component complexity (degrees of freedom)
-        complexities = [np.prod(shape) for shape in self.components.values()]
-        attention = np.array(complexities, dtype=np.float32)
+        attention = np.maximum(self.attention.sti, 0).astype(np.float32)
+        total = attention.sum()
+        if total <= 0:
+            return np.full(len(attention), 1 / len(attention), dtype=np.float32)
         
-        # Normalize to sum to 1.0
-        attention = attention / attention.sum()
+        return attention / total
+    
+    def compile_query(self, query: str) -> QueryPlan:
+        """
+        Return the (possibly cached) compiled plan of a query. Text that is
+        not valid GraphQL still gets a plan, keyed by its raw text.
+        """
+        plan_cache = self.plan_cache
+        if plan_cache is not None:
+            plan = plan_cache.get(query)
+            if plan is not None:
+                return plan
         
-        return attention
+        try:
+            plan = compile_query(query)
+        except GraphQLSyntaxError as error:
+            plan = opaque_plan(query, str(error))
+        
+        return plan_cache.put(query, plan) if plan_cache is not None else plan
     
     def graphql_query_to_tensor(self, query: str) -> np.ndarray:
         """
         Convert GraphQL query to tensor representation for cognitive processing.
-        This is the universal interface that all components use.
+        This is the universal interface that all components use. Queries with
+        the same normalised text have the same tensor.
+        """
+        return self._encode_query(query).copy()
+    
+    def _arena(self) -> QueryArena:
+        """Return this thread's reusable query arena."""
+        arena = getattr(self._local, 'arena', None)
+        if arena is None:
+            arena = self._local.arena = QueryArena(self.layout)
+        return arena
+    
+    def _encode_query(self, query: str, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Return the (possibly cached, read-only) encoding of a query.
+        Without a cache the query is encoded into out when one is given.
+        """
+        plan = self.compile_query(query)
+        if self.encoding_cache is None:
+            return self._encode_plan(plan, out)
+        
+        # Keyed by normalised text, so equivalent queries share one encoding
+        tensor = self.encoding_cache.get(plan.text)
+        if tensor is None:
+            tensor = self.encoding_cache.put(plan.text, self._encode_plan(plan))
+        
+        return tensor
+    
+    def _encode_uncached(self, query: str, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Encode a query, bypassing the encoding cache."""
+        return self._encode_plan(self.compile_query(query), out)
+    
+    def _encode_plan(self, plan: QueryPlan, out: Optional[np.ndarray] = None,
+                     columns: Optional[Tuple[int, ...]] = None) -> np.ndarray:
         """
-        # Simple encoding: hash query to get consistent tensor
-        query_hash = hash(query) % (2**16)  # Keep it manageable
+        Encode a compiled query from the stable fingerprint of its normalised text.
+        With columns, only those components' slices are written.
+        """
+        # Stable digest keeps encodings identical across worker processes
+        query_hash = plan.fingerprint
         
         # Map to high-dimensional space
-        tensor = np.zeros(776, dtype=np.float32)
+        tensor = np.empty(self.total_freedom, dtype=np.float32) if out is None else out
+        scratch = self._arena().scratch
+        entries = self.layout.entries
+        if columns is not None:
+            entries = [entries[column] for column in columns]
         
         # Distribute hash across components proportionally
-        offset = 0
-        for name, shape in self.components.items():
-            size = np.prod(shape)
-            # Use hash to seed deterministic random pattern
-            np.random.seed(query_hash + offset)
-            component_pattern = np.random.normal(0, 0.1, size)
-            tensor[offset:offset+size] = component_pattern
-            offset += size
+        for entry in entries:
+            # Use hash to seed a private, deterministic generator per component;
+            # 0.1 * N(0, 1) draws the same values as rng.normal(0, 0.1), and
+            # drawing a large slice in scratch-sized pieces continues the same stream
+            rng = np.random.default_rng([query_hash, entry.offset])
+            if entry.size <= len(scratch):
+                pattern = rng.standard_normal(out=scratch[:entry.size])
+                np.multiply(pattern, 0.1, out=tensor[entry.slice], casting='same_kind')
+                continue
+            for start in range(entry.offset, entry.offset + entry.size, len(scratch)):
+                stop = min(start + len(scratch), entry.offset + entry.size)
+                pattern = rng.standard_normal(out=scratch[:stop - start])
+                np.multiply(pattern, 0.1, out=tensor[start:stop], casting='same_kind')
         
         return tensor
     
-    def process_cognitive_query(self, query: str) -> Dict[str, Any]:
+    def _encode_selected(self, plan: QueryPlan, columns: Tuple[int, ...],
+                         out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        The encoding of a query for the selected components: the cached full
+        tensor when there is one, else just the selected slices (not cached).
+        Component generators are seeded per slice, so both agree exactly.
+        """
+        if self.encoding_cache is not None and plan.text in self.encoding_cache:
+            tensor = self.encoding_cache.get(plan.text)
+            if tensor is not None:
+                return tensor
+        return self._encode_plan(plan, out, columns)
+    
+    def select_components(self, components: Components,
+                          queries: Sequence[str] = ()) -> Tuple[int, ...]:
+        """
+        Resolve a component selection to plan columns (in plan order).
+        
+        Args:
+            components: None for every component, a component name or list of
+                names, or 'auto' to run the components the queries' field
+                selections name (see ComponentRegistry.register fields);
+                queries naming no component run every component
+            queries: The queries an 'auto' selection is inferred from (their union)
+        """
+        if components is None:
+            return self._all_columns
+        if isinstance(components, str):
+            if components != 'auto':
+                return self.plan.select((components,))
+            columns = set()
+            for query in queries:
+                columns.update(self.plan.infer(self.compile_query(query).fields))
+            return tuple(sorted(columns)) or self._all_columns
+        return self.plan.select(components)
+    
+    def result_schema(self, components: Components = None) -> ResultSchema:
+        """The schema of compact results for the selected components."""
+        return self._schema(self.select_components(components))
+    
+    def _schema(self, columns: Tuple[int, ...]) -> ResultSchema:
+        """The schema of the given plan columns, built once per selection."""
+        schema = self._schemas.get(columns)
+        if schema is None:
+            schema = self._schemas[columns] = ResultSchema.from_steps(
+                self.plan.steps[column] for column in columns)
+        return schema
+    
+    def process_cognitive_query(self, query: str, components: Components = None,
+                                compact: bool = False) -> Union[Dict[str, Any], QueryResult]:
         """
         Process a GraphQL query through the entire cognitive architecture.
         This is the main entry point for cognitive computation.
+        
+        components restricts the run to some components (a name, a list of
+        names, or 'auto' to infer them from the query's field selection; see
+        select_components). Skipped components are neither encoded nor run
+        and are absent from the result.
+        
+        With compact=True the result is a QueryResult: the same mapping,
+        backed by one float32 state per component (see results.py).
+        
+        With a result_cache, results are cached by the query's fingerprint
+        (equivalent queries share an entry) and component selection, so a
+        repeated query skips encoding and every activation. Selections with
+        a stateful component bypass the cache.
         """
-        logger.info(f"🧠 Processing cognitive query: {query[:100]}...")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🧠 Processing cognitive query: %s...", query[:100])
         
-        # Convert query to tensor representation
-        query_tensor = self.graphql_query_to_tensor(query)
+        metrics = self.metrics
+        if metrics is not None:
+            started = clock = metrics.clock()
         
-        # Process through each component (simplified for now)
-        results = {}
-        offset = 0
+        arena = self._arena()
+        columns = self._all_columns if components is None else self.select_components(components, (query,))
+        steps = self.plan.steps
+        states = key = None
+        result_cache = self.result_cache
+        if result_cache is not None:
+            if self._stateful_columns.isdisjoint(columns):
+                if self._versioned:
+                    result_cache.check_version(tuple(processor.version for processor in self._versioned))
+                key = (self.compile_query(query).fingerprint, columns)
+                states = result_cache.get(key)
+            else:
+                result_cache.record_bypass()
         
-        for name, shape in self.components.items():
-            size = np.prod(shape)
-            component_input = query_tensor[offset:offset+size].reshape(shape)
+        if states is None:
+            # Convert query to tensor representation
+            if len(columns) == len(self._all_columns):
+                query_tensor = self._encode_query(query, out=arena.query)
+            else:
+                query_tensor = self._encode_selected(self.compile_query(query), columns, out=arena.query)
+            if metrics is not None:
+                clock = metrics.lap('encode', clock)
             
-            # Each component processes its slice of the tensor
-            if name == 'gnn':
-                results[name] = self._process_gnn(component_input)
-            elif name == 'das':
-                results[name] = self._process_das(component_input)
-            elif name == 'esn':
-                results[name] = self._process_esn(component_input)
-            elif name == 'membrane':
-                results[name] = self._process_membrane(component_input)
-            elif name == 'ecan':
-                results[name] = self._process_ecan(component_input)
+            # Each component processes its slice of the tensor into the arena
+            for column in columns:
+                step = steps[column]
+                output = step.activate(query_tensor[step.slice], arena.outputs[column])
+                output.sum(out=arena.cells[column])
+                if metrics is not None:
+                    clock = metrics.lap(step.name, clock)
             
-            offset += size
+            if compact or key is not None:
+                if len(columns) == len(self._all_columns):
+                    states = arena.states.copy()
+                else:
+                    states = arena.states[list(columns)]
+                if key is not None:
+                    states = result_cache.put(key, states)
+        elif metrics is not None:
+            clock = metrics.lap('result_cache', clock)
+        
+        if compact:
+            results = QueryResult(self._schema(columns), states)
+        else:
+            results = {}
+            # Arena states are indexed by column, extracted states by position
+            if states is None:
+                values, positions = arena.states.tolist(), columns
+            else:
+                values, positions = states.tolist(), range(len(columns))
+            for column, position in zip(columns, positions):
+                step = steps[column]
+                results[step.name] = {
+                    'shape': step.shape,
+                    'processed_states': values[position],
+                    'component': step.label
+                }
+        
+        if metrics is not None:
+            metrics.lap('results', clock)
+            metrics.lap('query', started)
+            metrics.increment('queries')
         
         return results
     
-    def _process_gnn(self, tensor: np.ndarray) -> Dict[str, Any]:
-        """Process tensor through Graph Neural Network component."""
-        # Simple GNN simulation - in real implementation would use actual GNN
-        processed = np.tanh(tensor)  # Activation
+    def graphql_queries_to_tensor(self, queries: Sequence[str], out: Optional[np.ndarray] = None,
+                                  components: Components = None) -> np.ndarray:
+        """
+        Encode a batch of GraphQL queries into a single (N, 776) float32 matrix.
+        Row i is identical to graphql_query_to_tensor(queries[i]).
+        If out is given, the encodings are written into it instead.
+        With components, only the selected slices are encoded (see
+        select_components); the others are zero, or left untouched in out.
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            clock = metrics.clock()
+        
+        if components is None:
+            matrix = np.empty((len(queries), self.total_freedom), dtype=np.float32) if out is None else out
+            for i, query in enumerate(queries):
+                matrix[i] = self._encode_query(query)
+        else:
+            columns = self.select_components(components, queries)
+            matrix = np.zeros((len(queries), self.total_freedom), dtype=np.float32) if out is None else out
+            for i, query in enumerate(queries):
+                row = matrix[i]
+                tensor = self._encode_selected(self.compile_query(query), columns, out=row)
+                if tensor is not row:
+                    for column in columns:
+                        step = self.plan.steps[column]
+                        row[step.slice] = tensor[step.slice]
+        
+        if metrics is not None:
+            metrics.lap('batch.encode', clock)
+        return matrix
+    
+    def process_tensor_batch(self, matrix: np.ndarray, out: Optional[np.ndarray] = None,
+                             activations: Optional[np.ndarray] = None,
+                             components: Components = None) -> np.ndarray:
+        """
+        Run every component activation across a whole (N, 776) batch at once.
+        Returns an (N, num_components) float32 matrix of processed states,
+        one column per component in self.components order.
+        Rows run in chunks of about BATCH_CHUNK_ELEMENTS values per
+        component, so temporaries stay bounded for very wide components.
+        
+        Args:
+            matrix: Encoded queries, one per row
+            out: Optional (N, num_components) buffer for the processed states
+            activations: Optional (N, 776) buffer that receives every
+                component's activated tensor alongside the state sums
+            components: Names of the components to run; the states then
+                have one column per selected component, in plan order
+        """
+        matrix = np.asarray(matrix, dtype=np.float32)
+        columns = self.select_components(components)
+        steps = self.plan.steps
+        rows = matrix.shape[0]
+        states = np.empty((rows, len(columns)), dtype=np.float32) if out is None else out
+        chunk = self._chunk_rows(max((steps[column].size for column in columns), default=1))
+        if activations is None:
+            # Activations are only scratch: one chunk of the widest component is enough
+            scratch = np.empty((min(rows, chunk), max((steps[column].size for column in columns), default=0)),
+                               dtype=np.float32)
+        
+        metrics = self.metrics
+        if metrics is not None:
+            clock = metrics.clock()
+        
+        # Per-segment pairwise sums keep every row bit-identical to the
+        # single-query path (np.add.reduceat sums sequentially and does not)
+        for start in range(0, rows, chunk):
+            stop = min(start + chunk, rows)
+            for index, column in enumerate(columns):
+                step = steps[column]
+                if activations is None:
+                    target = scratch[:stop - start, :step.size]
+                else:
+                    target = activations[start:stop, step.slice]
+                block = step.activate_batch(matrix[start:stop, step.slice], target)
+                block.sum(axis=1, out=states[start:stop, index])
+                if metrics is not None:
+                    clock = metrics.lap(f'batch.{step.name}', clock)
+        
+        if metrics is not None:
+            metrics.increment('batch_rows', matrix.shape[0])
+        return states
+    
+    def process_cognitive_queries(self, queries: Iterable[str], components: Components = None,
+                                  compact: bool = False) -> Union[List[Dict[str, Any]], ResultBatch]:
+        """
+        Process many GraphQL queries through the cognitive architecture as one batch.
+        Each entry of the returned list matches process_cognitive_query exactly.
+        components selects the components for the whole batch; 'auto' runs
+        the union of the components every query names. With compact=True the
+        states are returned as one ResultBatch instead of a list of dicts.
+        """
+        queries = list(queries)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🧠 Processing cognitive batch of %d queries", len(queries))
+        
+        columns = self._all_columns if components is None else self.select_components(components, queries)
+        names = None if len(columns) == len(self._all_columns) else [self.plan.steps[column].name for column in columns]
+        
+        # Encode and activate chunk by chunk through one reused matrix
+        chunk = self._chunk_rows(self.total_freedom)
+        states = np.empty((len(queries), len(columns)), dtype=np.float32)
+        matrix = np.zeros((min(len(queries), chunk), self.total_freedom), dtype=np.float32)
+        for start in range(0, len(queries), chunk):
+            batch = queries[start:start + chunk]
+            encoded = self.graphql_queries_to_tensor(batch, out=matrix[:len(batch)], components=names)
+            self.process_tensor_batch(encoded, out=states[start:start + len(batch)], components=names)
+        
+        metrics = self.metrics
+        if metrics is None:
+            return self.results_from_states(states, names, compact=compact)
+        
+        clock = metrics.clock()
+        results = self.results_from_states(states, names, compact=compact)
+        metrics.lap('batch.results', clock)
+        metrics.increment('batches')
+        return results
+    
+    def _chunk_rows(self, width: int) -> int:
+        """Rows per chunk for row-wise work on width values per row."""
+        return max(1, BATCH_CHUNK_ELEMENTS // max(width, 1))
+    
+    def results_from_states(self, states: np.ndarray, components: Components = None,
+                            compact: bool = False) -> Union[List[Dict[str, Any]], ResultBatch]:
+        """
+        Build per-query result dicts from an (N, num_components) state matrix,
+        or from the states of the selected components (names) only.
+        With compact=True the matrix is wrapped, not copied, in a ResultBatch.
+        """
+        if compact:
+            return ResultBatch(self.result_schema(components), states)
+        steps = [self.plan.steps[column] for column in self.select_components(components)]
+        results = []
+        for row in states.tolist():
+            results.append({
+                step.name: {
+                    'shape': step.shape,
+                    'processed_states': value,
+                    'component': step.label
+                }
+                for step, value in zip(steps, row)
+            })
+        
+        return results
+    
+    def _process_component(self, name: str, tensor: np.ndarray) -> Dict[str, Any]:
+        """Process one component tensor through its planned processor."""
+        step = self.plan[name]
+        flat = np.ascontiguousarray(tensor).reshape(-1)
+        processed = step.activate(flat, np.empty_like(flat))
         return {
             'shape': tensor.shape,
             'processed_states': float(processed.sum()),
-            'component': 'GraphQL-GNN'
+            'component': step.label
         }
     
+    def _process_gnn(self, tensor: np.ndarray) -> Dict[str, Any]:
+        """Process tensor through Graph Neural Network component."""
+        return self._process_component('gnn', tensor)
+    
     def _process_das(self, tensor: np.ndarray) -> Dict[str, Any]:
         """Process tensor through Distributed AtomSpace component."""
-        # Simple DAS simulation
-        processed = 1 / (1 + np.exp(-tensor))  # Sigmoid activation
-        return {
-            'shape': tensor.shape,
-            'processed_states': float(processed.sum()),
-            'component': 'DAS-Hypergraph'
-        }
+        return self._process_component('das', tensor)
     
     def _process_esn(self, tensor: np.ndarray) -> Dict[str, Any]:
         """Process tensor through Echo State Network component."""
-        # Simple ESN simulation - reservoir dynamics
-        processed = tensor * 0.95  # Echo state property (spectral radius < 1)
-        return {
-            'shape': tensor.shape,
-            'processed_states': float(processed.sum()),
-            'component': 'ESN-Reservoir'
-        }
+        return self._process_component('esn', tensor)
     
     def _process_membrane(self, tensor: np.ndarray) -> Dict[str, Any]:
         """Process tensor through P-System Membrane component."""
-        # Simple membrane computation simulation
-        processed = np.abs(tensor)  # P-system rules always produce positive symbols
-        return {
-            'shape': tensor.shape,
-            'processed_states': float(processed.sum()),
-            'component': 'P-System-Membrane'
-        }
+        return self._process_component('membrane', tensor)
     
     def _process_ecan(self, tensor: np.ndarray) -> Dict[str, Any]:
         """Process tensor through Economic Attention component."""
-        # Simple ECAN simulation - attention allocation
-        processed = tensor / tensor.sum() if tensor.sum() != 0 else tensor
+        return self._process_component('ecan', tensor)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of instrumentation: stage timings and counters (when metrics
+        are enabled) and encoding, plan and result cache effectiveness (when
+        caching is enabled).
+        """
         return {
-            'shape': tensor.shape,
-            'processed_states': float(processed.sum()),
-            'component': 'ECAN-Attention'
+            'metrics': self.metrics.stats() if self.metrics is not None else None,
+            'encoding_cache': self.encoding_cache.stats() if self.encoding_cache is not None else None,
+            'plan_cache': self.plan_cache.stats() if self.plan_cache is not None else None,
+            'result_cache': self.result_cache.stats() if self.result_cache is not None else None
         }
     
     def generate_ggml_config(self) -> Dict[str, Any]:
@@ -208,28 +661,13 @@ class CognitiveSingularity:
         Generate the GGML configuration file as specified in cognitive-singularity.md.
         This is the final deliverable that validates the implementation.
         """
-        config = {
-            "version": "1.0.0",
-            "tensor_field": {
-                "shape": [self.total_freedom],
-                "prime_factorization": self.prime_factorize(self.total_freedom),
-                "components": {}
-            },
-            "unified_field": "graphql-neural-hypergraph-membrane",
-            "frame_problem": "SOLVED"
-        }
-        
-        # Add each component's configuration
-        for name, shape in self.components.items():
-            config["tensor_field"]["components"][name] = {
-                "shape": list(shape),
-                "params": int(np.prod(shape))
-            }
-        
-        return config
+        # The shared config is invariant per component set; callers get their own copy
+        return copy.deepcopy(_ggml_config(tuple(self.components.items()), self.field_type))
     
     def save_ggml_config(self, path: Optional[str] = None) -> str:
         """Save GGML configuration to file."""
+        import json
+        
         if path is None:
             path = "cognitive-singularity.ggml"
         
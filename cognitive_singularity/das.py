@@ -0,0 +1,785 @@
+"""
+DAS-Hypergraph: an indexed, array-backed AtomSpace behind the das component.
+
+Atoms (nodes and links) are rows in typed NumPy columns: a type id, an
+interned name id (-1 for links), a truth value (strength, confidence) and a
+CSR-style outgoing set. Columns grow by doubling, so millions of atoms cost
+a few dozen bytes each rather than a Python object apiece.
+
+Indexes:
+- hash indexes from (type, name) to node and (type, outgoing) to link,
+  which also deduplicate atoms;
+- per-type and per-name handle lists;
+- an incoming-set index, compiled lazily into a sorted (target, link)
+  table with a small pending tail, so bulk loads never pay per-insert
+  index maintenance.
+
+match() starts from the most selective index available (the smallest
+incoming set of a fixed outgoing atom, then the name, then the type) and
+filters candidates with vectorised column checks, so its cost follows the
+size of the answer rather than the size of the store.
+
+ShardedAtomSpace partitions atoms across AtomSpace shards running in local
+worker processes (a stand-in for remote DAS nodes) and scatters queries to
+them concurrently.
+"""
+
+import functools
+import hashlib
+import multiprocessing
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .registry import sigmoid_kernel
+
+NODE_TYPE = 'ConceptNode'
+
+
+class Variable(NamedTuple):
+    """A named wildcard in a match() outgoing pattern; repeated names must bind equal atoms."""
+    name: str
+
+
+Pattern = Sequence[Union[int, None, Variable]]
+
+
+class _Column:
+    """Growable typed column with amortised O(1) appends."""
+    
+    __slots__ = ('data', 'size', 'shared')
+    
+    def __init__(self, dtype, capacity: int = 64):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+        # Set when AtomSpace.copy() hands this column to a second store
+        self.shared = False
+    
+    def _reserve(self, extra: int) -> None:
+        needed = self.size + extra
+        if needed > len(self.data):
+            grown = np.empty(max(needed, 2 * len(self.data)), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+    
+    def append(self, value) -> int:
+        self._reserve(1)
+        self.data[self.size] = value
+        self.size += 1
+        return self.size - 1
+    
+    def extend(self, values: np.ndarray) -> int:
+        """Append many values, returning the index of the first."""
+        start = self.size
+        self._reserve(len(values))
+        self.data[start:start + len(values)] = values
+        self.size += len(values)
+        return start
+    
+    def view(self) -> np.ndarray:
+        return self.data[:self.size]
+    
+    def copy(self) -> "_Column":
+        column = _Column.__new__(_Column)
+        column.data = self.data[:self.size].copy()
+        column.size = self.size
+        column.shared = False
+        return column
+    
+    def frozen(self) -> np.ndarray:
+        """A read-only view of the current contents."""
+        view = self.data[:self.size]
+        view.flags.writeable = False
+        return view
+
+
+class AtomSpace:
+    """
+    In-memory hypergraph store with columnar atoms and hash indexes.
+    Atoms are addressed by integer handles (their row). Append-only;
+    thread-safe through one re-entrant lock.
+    """
+    
+    def __init__(self, check_outgoing: bool = True):
+        """
+        Args:
+            check_outgoing: Require link targets to be handles in this store;
+                shards disable it because their links point at global handles
+        """
+        self.check_outgoing = check_outgoing
+        self.version = 0
+        
+        self.type_names: List[str] = []
+        self._type_ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        
+        self._type = _Column(np.int32)
+        self._name = _Column(np.int64)
+        self._strength = _Column(np.float32)
+        self._confidence = _Column(np.float32)
+        self._outgoing_ptr = _Column(np.int64)
+        self._outgoing_ptr.append(0)
+        self._outgoing = _Column(np.int64)
+        self._outgoing_owner = _Column(np.int64)
+        
+        self._nodes: Dict[Tuple[int, int], int] = {}
+        self._links: Dict[Tuple[int, Tuple[int, ...]], int] = {}
+        self._by_type: Dict[int, _Column] = {}
+        self._by_name: Dict[int, _Column] = {}
+        
+        # Incoming index: outgoing entries [0, _compiled) sorted by target
+        self._compiled = 0
+        self._incoming_targets = np.empty(0, dtype=np.int64)
+        self._incoming_links = np.empty(0, dtype=np.int64)
+        
+        self._lock = threading.RLock()
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+    
+    def __len__(self) -> int:
+        return self._type.size
+    
+    def copy(self) -> "AtomSpace":
+        """An independent copy of the store; later additions to either do not reach the other."""
+        with self._lock:
+            # The incoming index arrays are replaced on rebuild, never written, so both keep them
+            state = self.__getstate__()
+            for key, value in state.items():
+                if isinstance(value, _Column):
+                    state[key] = value.copy()
+                elif isinstance(value, (list, dict)):
+                    state[key] = value.copy()
+            # Index columns are shared until either store appends to one (see _index_column)
+            for index in ('_by_type', '_by_name'):
+                for column in state[index].values():
+                    column.shared = True
+        
+        space = AtomSpace.__new__(AtomSpace)
+        space.__setstate__(state)
+        return space
+    
+    @staticmethod
+    def _index_column(index: Dict[int, _Column], key: int, capacity: int) -> _Column:
+        """index[key] ready for appending: created when missing, copied when shared by copy()."""
+        column = index.get(key)
+        if column is None:
+            column = index[key] = _Column(np.int64, capacity)
+        elif column.shared:
+            column = index[key] = column.copy()
+        return column
+    
+    def _type_id(self, type_name: str, create: bool = False) -> Optional[int]:
+        type_id = self._type_ids.get(type_name)
+        if type_id is None and create:
+            type_id = self._type_ids[type_name] = len(self.type_names)
+            self.type_names.append(type_name)
+        return type_id
+    
+    def _name_id(self, name: str, create: bool = False) -> Optional[int]:
+        name_id = self._name_ids.get(name)
+        if name_id is None and create:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+    
+    def _append_atoms(self, type_id: int, name_ids: np.ndarray, arities: np.ndarray,
+                      outgoing: np.ndarray, strength: float, confidence: float) -> np.ndarray:
+        """Append rows to every column and the per-type index; returns the new handles."""
+        count = len(name_ids)
+        start = self._type.extend(np.full(count, type_id, dtype=np.int32))
+        handles = np.arange(start, start + count, dtype=np.int64)
+        self._name.extend(name_ids)
+        self._strength.extend(np.full(count, strength, dtype=np.float32))
+        self._confidence.extend(np.full(count, confidence, dtype=np.float32))
+        self._outgoing_ptr.extend(self._outgoing.size + np.cumsum(arities))
+        self._outgoing.extend(outgoing)
+        self._outgoing_owner.extend(np.repeat(handles, arities))
+        self._index_column(self._by_type, type_id, 64).extend(handles)
+        self.version += 1
+        return handles
+    
+    def add_node(self, type_name: str, name: str, strength: float = 1.0,
+                 confidence: float = 0.0) -> int:
+        """Add a node (or return the existing one with that type and name)."""
+        return int(self.add_nodes(type_name, [name], strength, confidence)[0])
+    
+    def add_nodes(self, type_name: str, names: Iterable[str], strength: float = 1.0,
+                  confidence: float = 0.0) -> np.ndarray:
+        """Bulk-add nodes of one type, returning their handles in input order."""
+        with self._lock:
+            type_id = self._type_id(type_name, create=True)
+            handles, fresh = [], []
+            pending: Dict[int, int] = {}
+            for name in names:
+                name_id = self._name_id(name, create=True)
+                handle = self._nodes.get((type_id, name_id))
+                if handle is None:
+                    handle = pending.get(name_id)
+                if handle is None:
+                    # Provisional handle: position in the fresh batch, encoded negative
+                    handle = pending[name_id] = -1 - len(fresh)
+                    fresh.append(name_id)
+                handles.append(handle)
+            
+            if fresh:
+                fresh_ids = np.array(fresh, dtype=np.int64)
+                created = self._append_atoms(type_id, fresh_ids, np.zeros(len(fresh), dtype=np.int64),
+                                             np.empty(0, dtype=np.int64), strength, confidence)
+                for name_id, handle in zip(fresh, created.tolist()):
+                    self._nodes[(type_id, name_id)] = handle
+                    self._index_column(self._by_name, name_id, 4).append(handle)
+            
+            handles = np.array(handles, dtype=np.int64)
+            provisional = handles < 0
+            if fresh:
+                handles[provisional] = created[-1 - handles[provisional]]
+            return handles
+    
+    def add_link(self, type_name: str, outgoing: Sequence[int], strength: float = 1.0,
+                 confidence: float = 0.0) -> int:
+        """Add a link over the given atoms (or return the existing identical link)."""
+        outgoing = np.asarray(outgoing, dtype=np.int64).reshape(1, -1)
+        return int(self.add_links(type_name, outgoing, strength, confidence)[0])
+    
+    def add_links(self, type_name: str, outgoing: Union[np.ndarray, Sequence[Sequence[int]]],
+                  strength: float = 1.0, confidence: float = 0.0) -> np.ndarray:
+        """
+        Bulk-add links of one type. outgoing is an (N, arity) array or a list
+        of handle sequences (arities may differ). Returns handles in input order.
+        """
+        if isinstance(outgoing, np.ndarray) and outgoing.ndim == 2:
+            rows = outgoing.astype(np.int64, copy=False).tolist()
+        else:
+            rows = [list(map(int, row)) for row in outgoing]
+        
+        with self._lock:
+            if self.check_outgoing and rows:
+                flat = np.fromiter((item for row in rows for item in row), dtype=np.int64)
+                if len(flat) and (flat.min() < 0 or flat.max() >= len(self)):
+                    raise ValueError("Link outgoing sets must reference existing atoms")
+            
+            type_id = self._type_id(type_name, create=True)
+            handles, fresh = [], []
+            pending: Dict[Tuple[int, ...], int] = {}
+            for row in rows:
+                key = tuple(row)
+                handle = self._links.get((type_id, key))
+                if handle is None:
+                    handle = pending.get(key)
+                if handle is None:
+                    handle = pending[key] = -1 - len(fresh)
+                    fresh.append(key)
+                handles.append(handle)
+            
+            if fresh:
+                arities = np.fromiter(map(len, fresh), dtype=np.int64, count=len(fresh))
+                targets = np.fromiter((item for key in fresh for item in key), dtype=np.int64,
+                                      count=int(arities.sum()))
+                created = self._append_atoms(type_id, np.full(len(fresh), -1, dtype=np.int64),
+                                             arities, targets, strength, confidence)
+                for key, handle in zip(fresh, created.tolist()):
+                    self._links[(type_id, key)] = handle
+            
+            handles = np.array(handles, dtype=np.int64)
+            provisional = handles < 0
+            if fresh:
+                handles[provisional] = created[-1 - handles[provisional]]
+            return handles
+    
+    def set_truth(self, handle: int, strength: float, confidence: float) -> None:
+        with self._lock:
+            self._strength.data[handle] = strength
+            self._confidence.data[handle] = confidence
+            self.version += 1
+    
+    def get_node(self, type_name: str, name: str) -> Optional[int]:
+        type_id, name_id = self._type_ids.get(type_name), self._name_ids.get(name)
+        return self._nodes.get((type_id, name_id))
+    
+    def get_link(self, type_name: str, outgoing: Sequence[int]) -> Optional[int]:
+        key = tuple(int(item) for item in outgoing)
+        return self._links.get((self._type_ids.get(type_name), key))
+    
+    def type_of(self, handle: int) -> str:
+        return self.type_names[self._type.data[handle]]
+    
+    def name_of(self, handle: int) -> Optional[str]:
+        name_id = self._name.data[handle]
+        return self.names[name_id] if name_id >= 0 else None
+    
+    def truth(self, handle: int) -> Tuple[float, float]:
+        return float(self._strength.data[handle]), float(self._confidence.data[handle])
+    
+    def outgoing(self, handle: int) -> np.ndarray:
+        ptr = self._outgoing_ptr.data
+        return self._outgoing.data[ptr[handle]:ptr[handle + 1]].copy()
+    
+    def by_type(self, type_name: str) -> np.ndarray:
+        """Handles of every atom of a type, in insertion order."""
+        column = self._by_type.get(self._type_ids.get(type_name))
+        return column.view().copy() if column is not None else np.empty(0, dtype=np.int64)
+    
+    def by_name(self, name: str) -> np.ndarray:
+        """Handles of every node with a name, across types."""
+        column = self._by_name.get(self._name_ids.get(name))
+        return column.view().copy() if column is not None else np.empty(0, dtype=np.int64)
+    
+    @property
+    def strength(self) -> np.ndarray:
+        return self._strength.frozen()
+    
+    @property
+    def confidence(self) -> np.ndarray:
+        return self._confidence.frozen()
+    
+    def _compile_incoming(self, force: bool = False) -> None:
+        """
+        Fold pending outgoing entries into the sorted incoming table once the
+        tail outgrows a fraction of it (or always, when forced).
+        """
+        pending = self._outgoing.size - self._compiled
+        if not pending or (not force and pending < max(1024, self._compiled // 8)):
+            return
+        
+        targets = self._outgoing.view()
+        order = np.argsort(targets, kind='stable')
+        self._incoming_targets = targets[order]
+        self._incoming_links = self._outgoing_owner.view()[order]
+        self._compiled = len(targets)
+    
+    def incoming(self, handle: int) -> np.ndarray:
+        """Handles of the links that contain an atom, in ascending order."""
+        with self._lock:
+            self._compile_incoming()
+            lo, hi = np.searchsorted(self._incoming_targets, [handle, handle + 1])
+            links = self._incoming_links[lo:hi]
+            if self._compiled < self._outgoing.size:
+                tail = slice(self._compiled, self._outgoing.size)
+                hits = np.flatnonzero(self._outgoing.data[tail] == handle)
+                links = np.concatenate([links, self._outgoing_owner.data[tail][hits]])
+            return np.unique(links)
+    
+    def incoming_counts(self, handles: np.ndarray) -> np.ndarray:
+        """Number of outgoing references to each of many atoms, in one pass."""
+        with self._lock:
+            self._compile_incoming(force=True)
+            handles = np.asarray(handles, dtype=np.int64)
+            return (np.searchsorted(self._incoming_targets, handles, side='right')
+                    - np.searchsorted(self._incoming_targets, handles, side='left'))
+    
+    def _candidates(self, type_id: Optional[int], name_id: Optional[int],
+                    fixed: List[Tuple[int, int]]) -> np.ndarray:
+        """Starting candidates from the most selective index that applies."""
+        if fixed:
+            sets = [self.incoming(handle) for _, handle in fixed]
+            return min(sets, key=len)
+        if name_id is not None:
+            column = self._by_name.get(name_id)
+            return column.view() if column is not None else np.empty(0, dtype=np.int64)
+        if type_id is not None:
+            column = self._by_type.get(type_id)
+            return column.view() if column is not None else np.empty(0, dtype=np.int64)
+        return np.arange(len(self), dtype=np.int64)
+    
+    def bind(self, type_name: Optional[str] = None, outgoing: Optional[Pattern] = None,
+             name: Optional[str] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Match atoms and return (handles, bindings): bindings maps every
+        Variable in the outgoing pattern to the atoms it bound, aligned
+        with handles. See match() for the pattern syntax.
+        """
+        fixed, variables = [], {}
+        for position, item in enumerate(outgoing or ()):
+            if isinstance(item, Variable):
+                variables.setdefault(item.name, []).append(position)
+            elif item is not None:
+                fixed.append((position, int(item)))
+        
+        empty = np.empty(0, dtype=np.int64)
+        unmatched = (empty, {variable: empty for variable in variables})
+        with self._lock:
+            type_id = name_id = None
+            if type_name is not None:
+                type_id = self._type_ids.get(type_name)
+                if type_id is None:
+                    return unmatched
+            if name is not None:
+                name_id = self._name_ids.get(name)
+                if name_id is None:
+                    return unmatched
+            
+            candidates = self._candidates(type_id, name_id, fixed)
+            if type_id is not None:
+                candidates = candidates[self._type.data[candidates] == type_id]
+            if name_id is not None:
+                candidates = candidates[self._name.data[candidates] == name_id]
+            
+            bindings = {}
+            if outgoing is not None:
+                ptr = self._outgoing_ptr.data
+                starts = ptr[candidates]
+                keep = (ptr[candidates + 1] - starts) == len(outgoing)
+                candidates, starts = candidates[keep], starts[keep]
+                
+                targets = self._outgoing.data
+                for position, handle in fixed:
+                    keep = targets[starts + position] == handle
+                    candidates, starts = candidates[keep], starts[keep]
+                for variable, positions in variables.items():
+                    bound = targets[starts + positions[0]]
+                    keep = np.ones(len(candidates), dtype=bool)
+                    for position in positions[1:]:
+                        keep &= targets[starts + position] == bound
+                    candidates, starts = candidates[keep], starts[keep]
+                    for name_ in bindings:
+                        bindings[name_] = bindings[name_][keep]
+                    bindings[variable] = bound[keep]
+            
+            order = np.argsort(candidates, kind='stable')
+            return candidates[order], {key: value[order] for key, value in bindings.items()}
+    
+    def match(self, type_name: Optional[str] = None, outgoing: Optional[Pattern] = None,
+              name: Optional[str] = None) -> np.ndarray:
+        """
+        Handles of atoms matching every given constraint, ascending.
+        
+        Args:
+            type_name: Atom type
+            outgoing: Link pattern of exactly this arity; each position is a
+                handle (must match), None (anything) or a Variable
+            name: Node name
+        """
+        return self.bind(type_name, outgoing, name)[0]
+    
+    def stats(self) -> Dict[str, Any]:
+        columns = (self._type, self._name, self._strength, self._confidence,
+                   self._outgoing_ptr, self._outgoing, self._outgoing_owner)
+        return {
+            'atoms': len(self),
+            'nodes': len(self._nodes),
+            'links': len(self._links),
+            'types': len(self.type_names),
+            'column_bytes': sum(column.data.nbytes for column in columns)
+        }
+
+
+def _route(*parts: Any) -> int:
+    """Stable shard routing hash (independent of PYTHONHASHSEED)."""
+    digest = hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _serve_shard(connection) -> None:
+    """Worker loop: execute AtomSpace method calls until told to stop."""
+    space = AtomSpace(check_outgoing=False)
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        method, args = request
+        try:
+            connection.send((True, getattr(space, method)(*args)))
+        except Exception as error:
+            connection.send((False, error))
+    connection.close()
+
+
+class _LocalShard:
+    """In-process shard with the same send/receive protocol as a worker."""
+    
+    def __init__(self):
+        self.space = AtomSpace(check_outgoing=False)
+        self._reply = None
+    
+    def send(self, method: str, args: tuple) -> None:
+        try:
+            self._reply = (True, getattr(self.space, method)(*args))
+        except Exception as error:
+            self._reply = (False, error)
+    
+    def receive(self) -> Tuple[bool, Any]:
+        reply, self._reply = self._reply, None
+        return reply
+    
+    def close(self) -> None:
+        pass
+
+
+class _ProcessShard:
+    """A shard living in a worker process, spoken to over a pipe."""
+    
+    def __init__(self, context):
+        self._connection, child = context.Pipe()
+        self._process = context.Process(target=_serve_shard, args=(child,), daemon=True)
+        self._process.start()
+        child.close()
+    
+    def send(self, method: str, args: tuple) -> None:
+        self._connection.send((method, args))
+    
+    def receive(self) -> Tuple[bool, Any]:
+        return self._connection.recv()
+    
+    def close(self) -> None:
+        try:
+            self._connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._connection.close()
+
+
+class ShardedAtomSpace:
+    """
+    AtomSpace partitioned across shards by a stable hash of each atom's key.
+    
+    Global handles encode the shard: handle = local * num_shards + shard.
+    Links store global handles, so any shard can hold a link over atoms on
+    other shards; incoming() and match() gather from every shard. With
+    processes=True each shard runs in its own worker process and requests
+    are scattered to all of them before any reply is awaited.
+    Usable as a context manager; shard processes stop on exit.
+    """
+    
+    def __init__(self, shards: int = 2, processes: bool = True, mp_context: Optional[Any] = None):
+        if shards < 1:
+            raise ValueError(f"shards must be positive, got {shards}")
+        
+        context = mp_context if mp_context is not None else multiprocessing.get_context()
+        self.num_shards = shards
+        self._shards = [_ProcessShard(context) if processes else _LocalShard() for _ in range(shards)]
+        self._lock = threading.Lock()
+    
+    def _global(self, shard: int, local: np.ndarray) -> np.ndarray:
+        return np.asarray(local, dtype=np.int64) * self.num_shards + shard
+    
+    def _call(self, shard: int, method: str, *args) -> Any:
+        with self._lock:
+            self._shards[shard].send(method, args)
+            ok, value = self._shards[shard].receive()
+        if not ok:
+            raise value
+        return value
+    
+    def _scatter(self, calls: Dict[int, Tuple[str, tuple]]) -> Dict[int, Any]:
+        """Send one request per shard, then gather every reply.
+        
+        Every request that was sent has its reply read before the first error
+        (from the shard, or from the pipe while sending or receiving) is
+        raised, so a failing shard never leaves another shard's reply queued
+        for the next call.
+        """
+        replies, errors, sent = {}, [], []
+        with self._lock:
+            for shard, (method, args) in calls.items():
+                try:
+                    self._shards[shard].send(method, args)
+                except Exception as error:
+                    errors.append(error)
+                else:
+                    sent.append(shard)
+            for shard in sent:
+                try:
+                    ok, value = self._shards[shard].receive()
+                except Exception as error:
+                    errors.append(error)
+                    continue
+                if ok:
+                    replies[shard] = value
+                else:
+                    errors.append(value)
+        if errors:
+            raise errors[0]
+        return replies
+    
+    def _broadcast(self, method: str, *args) -> Dict[int, Any]:
+        return self._scatter({shard: (method, args) for shard in range(self.num_shards)})
+    
+    def _locate(self, handle: int) -> Tuple[int, int]:
+        """(shard, local handle) of a global handle."""
+        return handle % self.num_shards, handle // self.num_shards
+    
+    def __len__(self) -> int:
+        return sum(self._broadcast('__len__').values())
+    
+    def add_node(self, type_name: str, name: str, strength: float = 1.0,
+                 confidence: float = 0.0) -> int:
+        return int(self.add_nodes(type_name, [name], strength, confidence)[0])
+    
+    def add_nodes(self, type_name: str, names: Iterable[str], strength: float = 1.0,
+                  confidence: float = 0.0) -> np.ndarray:
+        names = list(names)
+        shards = np.array([_route(type_name, name) % self.num_shards for name in names], dtype=np.int64)
+        groups = {shard: np.flatnonzero(shards == shard) for shard in np.unique(shards).tolist()}
+        replies = self._scatter({
+            shard: ('add_nodes', (type_name, [names[i] for i in rows], strength, confidence))
+            for shard, rows in groups.items()
+        })
+        
+        handles = np.empty(len(names), dtype=np.int64)
+        for shard, rows in groups.items():
+            handles[rows] = self._global(shard, replies[shard])
+        return handles
+    
+    def add_link(self, type_name: str, outgoing: Sequence[int], strength: float = 1.0,
+                 confidence: float = 0.0) -> int:
+        return int(self.add_links(type_name, [list(outgoing)], strength, confidence)[0])
+    
+    def add_links(self, type_name: str, outgoing: Union[np.ndarray, Sequence[Sequence[int]]],
+                  strength: float = 1.0, confidence: float = 0.0) -> np.ndarray:
+        rows = [tuple(int(item) for item in row) for row in
+                (outgoing.tolist() if isinstance(outgoing, np.ndarray) else outgoing)]
+        shards = np.array([_route(type_name, row) % self.num_shards for row in rows], dtype=np.int64)
+        groups = {shard: np.flatnonzero(shards == shard) for shard in np.unique(shards).tolist()}
+        replies = self._scatter({
+            shard: ('add_links', (type_name, [rows[i] for i in indices], strength, confidence))
+            for shard, indices in groups.items()
+        })
+        
+        handles = np.empty(len(rows), dtype=np.int64)
+        for shard, indices in groups.items():
+            handles[indices] = self._global(shard, replies[shard])
+        return handles
+    
+    def get_node(self, type_name: str, name: str) -> Optional[int]:
+        shard = _route(type_name, name) % self.num_shards
+        local = self._call(shard, 'get_node', type_name, name)
+        return None if local is None else int(self._global(shard, local))
+    
+    def type_of(self, handle: int) -> str:
+        shard, local = self._locate(handle)
+        return self._call(shard, 'type_of', local)
+    
+    def name_of(self, handle: int) -> Optional[str]:
+        shard, local = self._locate(handle)
+        return self._call(shard, 'name_of', local)
+    
+    def outgoing(self, handle: int) -> np.ndarray:
+        shard, local = self._locate(handle)
+        return self._call(shard, 'outgoing', local)
+    
+    def incoming(self, handle: int) -> np.ndarray:
+        replies = self._broadcast('incoming', handle)
+        return np.sort(np.concatenate([self._global(shard, local) for shard, local in replies.items()]))
+    
+    def bind(self, type_name: Optional[str] = None, outgoing: Optional[Pattern] = None,
+             name: Optional[str] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """AtomSpace.bind across every shard; handles come back global and ascending."""
+        if name is not None and type_name is not None and outgoing is None:
+            shard = _route(type_name, name) % self.num_shards
+            replies = {shard: self._call(shard, 'bind', type_name, None, name)}
+        else:
+            replies = self._broadcast('bind', type_name, outgoing, name)
+        
+        handles = np.concatenate([self._global(shard, local) for shard, (local, _) in replies.items()])
+        order = np.argsort(handles, kind='stable')
+        variables = next(iter(replies.values()))[1].keys()
+        bindings = {variable: np.concatenate([bound[variable] for _, bound in replies.values()])[order]
+                    for variable in variables}
+        return handles[order], bindings
+    
+    def match(self, type_name: Optional[str] = None, outgoing: Optional[Pattern] = None,
+              name: Optional[str] = None) -> np.ndarray:
+        return self.bind(type_name, outgoing, name)[0]
+    
+    def stats(self) -> Dict[str, Any]:
+        per_shard = self._broadcast('stats')
+        totals = {key: sum(stats[key] for stats in per_shard.values())
+                  for key in ('atoms', 'nodes', 'links', 'column_bytes')}
+        totals['shards'] = [per_shard[shard] for shard in range(self.num_shards)]
+        return totals
+    
+    def close(self) -> None:
+        for shard in self._shards:
+            shard.close()
+        self._shards = []
+    
+    def __enter__(self) -> "ShardedAtomSpace":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@functools.lru_cache(maxsize=16)
+def _concept_store(size: int, prefix: str) -> Tuple[AtomSpace, np.ndarray]:
+    """
+    A store holding just the with_concepts nodes, and their handles. The
+    Python add_nodes loop dominates construction, so it runs once per
+    process; the store is only ever copied and the handles are read-only.
+    """
+    atomspace = AtomSpace()
+    concepts = atomspace.add_nodes(NODE_TYPE, (f"{prefix}:{index}" for index in range(size)))
+    concepts.flags.writeable = False
+    return atomspace, concepts
+
+
+class HypergraphProcessor:
+    """
+    das component processor backed by an AtomSpace.
+    
+    Each of the component's states is tied to one concept node. A state's
+    activation is sigmoid(x + weight * log1p(incoming(concept))), so
+    concepts that more links reference are primed. With no links the bias
+    is zero and the activation is exactly the plain sigmoid.
+    """
+    
+    label = 'DAS-Hypergraph'
+    batched = True
+    
+    def __init__(self, atomspace: AtomSpace, concepts: np.ndarray, weight: float = 1.0):
+        """
+        Args:
+            atomspace: Store to read incoming sets from
+            concepts: Concept node handle for each state, in state order
+            weight: Scale of the log incoming-degree bias
+        """
+        self.atomspace = atomspace
+        self.concepts = np.asarray(concepts, dtype=np.int64)
+        self.weight = weight
+        self._support = (None, None)
+    
+    @classmethod
+    def with_concepts(cls, size: int, atomspace: Optional[AtomSpace] = None,
+                      prefix: str = 'das', weight: float = 1.0) -> "HypergraphProcessor":
+        """
+        Create (or find) ConceptNodes '<prefix>:0' .. '<prefix>:<size-1>' for the states.
+        Without an atomspace, a copy of a per-process template store is used.
+        """
+        if atomspace is None:
+            template, concepts = _concept_store(int(size), prefix)
+            return cls(template.copy(), concepts, weight)
+        concepts = atomspace.add_nodes(NODE_TYPE, (f"{prefix}:{index}" for index in range(size)))
+        return cls(atomspace, concepts, weight)
+    
+    @property
+    def version(self) -> int:
+        """The store's version: results change only when the store does."""
+        return self.atomspace.version
+    
+    def support(self) -> Optional[np.ndarray]:
+        """Per-state bias, recomputed only when the store has changed; None when all zero."""
+        version, support = self._support
+        if version != self.atomspace.version:
+            counts = self.atomspace.incoming_counts(self.concepts)
+            support = (self.weight * np.log1p(counts)).astype(np.float32) if counts.any() else None
+            self._support = (self.atomspace.version, support)
+        return support
+    
+    def activate(self, block: np.ndarray, out: np.ndarray) -> np.ndarray:
+        support = self.support()
+        if support is None:
+            return sigmoid_kernel(block, out)
+        np.add(block, support, out=out)
+        return sigmoid_kernel(out, out)
@@ -0,0 +1,575 @@
+"""
+Component sharding across worker processes and nodes.
+
+DistributedSingularity hosts each component (gnn, das, esn, membrane, ecan)
+in its own worker: a local process connected over a socket pair, or a
+ComponentServer on another node reached over TCP. The coordinator encodes
+queries with its own CognitiveSingularity, scatters every component's slice
+of the (N, 776) batch to that component's worker before awaiting any reply,
+so components run concurrently, then gathers the per-row states (or full
+activations) back into one matrix. Results are bit-identical to the
+in-process batch path.
+
+A worker that times out, disconnects or sends a malformed frame is closed
+and its slice runs in-process instead (or the call raises WorkerError when
+fallback is off); it is restarted, or reconnected, on a later call after
+retry_interval seconds. Each worker owns its component's state: links
+added to the coordinator's das AtomSpace, for example, do not reach the
+worker's copy.
+
+Frame layout (integers little-endian), one request or reply per frame:
+
+    magic        2 bytes   b"CF"
+    kind         uint8     REQUEST, RESPONSE, ERROR or SHUTDOWN
+    flags        uint8     FLAG_STATES: reply with row sums, not activations
+    request_id   uint32
+    rows         uint32
+    width        uint32
+    nbytes       uint64    payload size
+    payload      rows x width little-endian float32, row-major
+                 (ERROR: a utf-8 message of at most MAX_MESSAGE_BYTES)
+
+Frame sizes are checked against the header before any payload is
+allocated: REQUEST/RESPONSE payloads are capped (MAX_FRAME_BYTES by
+default), and a server only accepts requests of its component's width and
+at most max_rows rows. ComponentServer has no authentication, so bind it to
+a trusted interface.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import selectors
+import socket
+import struct
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .core import CognitiveSingularity, Components
+from .registry import ComponentProcessor, _rowwise
+from .results import ResultBatch
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CF"
+
+REQUEST = 1
+RESPONSE = 2
+ERROR = 3
+SHUTDOWN = 4
+
+FLAG_STATES = 1
+
+# Largest REQUEST/RESPONSE payload recv_frame accepts unless told otherwise
+MAX_FRAME_BYTES = 1 << 28
+# Largest ERROR or SHUTDOWN payload
+MAX_MESSAGE_BYTES = 4096
+# Default row limit of one request to a ComponentServer
+MAX_ROWS = 1 << 16
+
+_HEADER = struct.Struct('<2sBBIIIQ')
+_FLOAT = np.dtype('<f4')
+
+# Seconds allowed to finish reading a reply that has started arriving
+_READ_GRACE = 0.1
+
+Address = Tuple[str, int]
+
+
+class FrameError(ConnectionError):
+    """A frame that does not follow the wire format."""
+
+
+class WorkerError(RuntimeError):
+    """A component worker that failed a request."""
+    
+    def __init__(self, component: str, message: str):
+        super().__init__(f"{component} worker: {message}")
+        self.component = component
+
+
+class Frame(NamedTuple):
+    """One decoded frame; payload is the raw bytes after the header."""
+    kind: int
+    flags: int
+    request_id: int
+    rows: int
+    width: int
+    payload: bytearray
+    
+    def array(self) -> np.ndarray:
+        """The payload as a (rows, width) float32 matrix (zero-copy)."""
+        return np.frombuffer(self.payload, dtype=_FLOAT).reshape(self.rows, self.width)
+
+
+def send_frame(sock: socket.socket, kind: int, request_id: int = 0, payload: Any = b'',
+               rows: int = 0, width: int = 0, flags: int = 0) -> None:
+    """Write one frame; payload is bytes or a C-contiguous little-endian float32 array."""
+    view = memoryview(payload).cast('B')
+    sock.sendall(_HEADER.pack(MAGIC, kind, flags, request_id, rows, width, view.nbytes))
+    if view.nbytes:
+        sock.sendall(view)
+
+
+def _recv_into(sock: socket.socket, view: memoryview) -> bool:
+    """Fill view from sock; False on a clean end of stream before any byte."""
+    received = 0
+    while received < len(view):
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            if received == 0:
+                return False
+            raise FrameError("Connection closed mid-frame")
+        received += count
+    return True
+
+
+def recv_frame(sock: socket.socket, max_bytes: Optional[int] = MAX_FRAME_BYTES) -> Optional[Frame]:
+    """
+    Read one frame, or return None when the peer closed the connection.
+    REQUEST/RESPONSE payloads over max_bytes (None: no limit) and ERROR or
+    SHUTDOWN payloads over MAX_MESSAGE_BYTES are rejected before any
+    payload memory is allocated.
+    """
+    header = bytearray(_HEADER.size)
+    if not _recv_into(sock, memoryview(header)):
+        return None
+    magic, kind, flags, request_id, rows, width, nbytes = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise FrameError(f"Bad frame magic {bytes(magic)!r}")
+    if kind in (REQUEST, RESPONSE):
+        if nbytes != rows * width * _FLOAT.itemsize:
+            raise FrameError(f"Payload of {nbytes} bytes does not hold {rows}x{width} float32 values")
+        if max_bytes is not None and nbytes > max_bytes:
+            raise FrameError(f"Payload of {nbytes} bytes exceeds the {max_bytes}-byte limit")
+    elif kind in (ERROR, SHUTDOWN):
+        if nbytes > MAX_MESSAGE_BYTES:
+            raise FrameError(f"Message of {nbytes} bytes exceeds the {MAX_MESSAGE_BYTES}-byte limit")
+    else:
+        raise FrameError(f"Unknown frame kind {kind}")
+    
+    payload = bytearray(nbytes)
+    if nbytes and not _recv_into(sock, memoryview(payload)):
+        raise FrameError("Connection closed mid-frame")
+    return Frame(kind, flags, request_id, rows, width, payload)
+
+
+def serve_component(sock: socket.socket, processor: ComponentProcessor, width: Optional[int] = None,
+                    max_rows: Optional[int] = MAX_ROWS) -> None:
+    """
+    Worker loop: activate every REQUEST frame's (rows, size) block and reply
+    with the activations, or their row sums under FLAG_STATES, until SHUTDOWN
+    or the coordinator disconnects. Processor errors, and requests that are
+    not width wide or have more than max_rows rows, are answered with ERROR
+    frames and the loop carries on. Payloads are capped at width x max_rows
+    floats (MAX_FRAME_BYTES when width is unknown; no cap when max_rows is None).
+    """
+    activate = processor.activate if getattr(processor, 'batched', False) else _rowwise(processor.activate)
+    if max_rows is None:
+        max_bytes = None
+    elif width is None:
+        max_bytes = MAX_FRAME_BYTES
+    else:
+        max_bytes = width * max_rows * _FLOAT.itemsize
+    try:
+        while True:
+            frame = recv_frame(sock, max_bytes)
+            if frame is None or frame.kind == SHUTDOWN:
+                break
+            if frame.kind != REQUEST:
+                raise FrameError(f"Unexpected frame kind {frame.kind}")
+            
+            try:
+                if width is not None and frame.width != width:
+                    raise ValueError(f"Expected blocks {width} values wide, got {frame.width}")
+                if max_rows is not None and frame.rows > max_rows:
+                    raise ValueError(f"At most {max_rows} rows per request, got {frame.rows}")
+                block = frame.array()
+                output = activate(block, np.empty(block.shape, dtype=_FLOAT))
+                if frame.flags & FLAG_STATES:
+                    # Pairwise row sums, exactly as CognitiveSingularity.process_tensor_batch
+                    output = output.sum(axis=1, dtype=_FLOAT).reshape(-1, 1)
+                output = np.ascontiguousarray(output, dtype=_FLOAT)
+            except Exception as error:
+                message = f"{type(error).__name__}: {error}".encode('utf-8')[:MAX_MESSAGE_BYTES]
+                send_frame(sock, ERROR, frame.request_id, message)
+            else:
+                send_frame(sock, RESPONSE, frame.request_id, output, *output.shape)
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        sock.close()
+
+
+class ComponentServer:
+    """
+    Host one component for remote coordinators on a TCP address; every
+    connection is served by its own thread. Usable as a context manager.
+    """
+    
+    def __init__(self, processor: ComponentProcessor, host: str = '127.0.0.1', port: int = 0,
+                 width: Optional[int] = None, max_rows: int = MAX_ROWS):
+        """
+        Args:
+            processor: The component to run (e.g. from default_registry())
+            host: Interface to listen on (there is no authentication)
+            port: Port to listen on; 0 picks a free one (see address)
+            width: The component's size; requests of another width are rejected
+            max_rows: Most rows accepted in one request
+        """
+        self.processor = processor
+        self.width = width
+        self.max_rows = max_rows
+        self._listener = socket.create_server((host, port))
+        self.address: Address = self._listener.getsockname()[:2]
+        self._thread: Optional[threading.Thread] = None
+    
+    def serve_forever(self) -> None:
+        """Accept and serve coordinators until close()."""
+        while True:
+            try:
+                connection, _ = self._listener.accept()
+            except OSError:
+                return
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=serve_component, args=(connection, self.processor, self.width, self.max_rows),
+                             daemon=True).start()
+    
+    def start(self) -> "ComponentServer":
+        """Serve from a background thread; returns self."""
+        self._thread = threading.Thread(target=self.serve_forever, name="component-server", daemon=True)
+        self._thread.start()
+        logger.info(f"🛰️ Component server listening on {self.address[0]}:{self.address[1]}")
+        return self
+    
+    def close(self) -> None:
+        """Stop accepting connections (open ones end when their coordinator disconnects)."""
+        try:
+            # Wakes a blocked accept(), which close() alone does not on Linux
+            self._listener.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._listener.close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+    
+    def __enter__(self) -> "ComponentServer":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _serve_process(sock: socket.socket, processor: ComponentProcessor, width: int,
+                   inherited: Sequence[socket.socket]) -> None:
+    """
+    Entry point of a local worker process. A forked worker first closes its
+    copies of the coordinator's sockets, so every worker still sees the end
+    of its stream when the coordinator goes away. Its only peer is the
+    coordinator, so batches of any number of rows are accepted.
+    """
+    for connection in inherited:
+        connection.close()
+    serve_component(sock, processor, width, max_rows=None)
+
+
+class _Worker:
+    """The coordinator's end of one component worker: a local process or a remote address."""
+    
+    def __init__(self, name: str, processor: ComponentProcessor, width: int, address: Optional[Address],
+                 context, timeout: float):
+        self.name = name
+        self.processor = processor
+        self.width = width
+        self.address = address
+        self.context = context
+        self.timeout = timeout
+        self.sock: Optional[socket.socket] = None
+        self.process = None
+        self.peers: List["_Worker"] = []
+        self.retry_at = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.restarts = 0
+        self.fallbacks = 0
+    
+    def connect(self) -> None:
+        if self.address is not None:
+            self.sock = socket.create_connection(self.address, timeout=self.timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self.sock, child = socket.socketpair()
+            inherited = []
+            if self.context.get_start_method() == 'fork':
+                inherited = [peer.sock for peer in self.peers if peer.sock is not None]
+            self.process = self.context.Process(target=_serve_process,
+                                                args=(child, self.processor, self.width, inherited),
+                                                name=f"component-{self.name}", daemon=True)
+            self.process.start()
+            child.close()
+    
+    def ready(self, retry_interval: float) -> bool:
+        """Whether the worker is connected, reconnecting (or respawning) it when due."""
+        if self.sock is not None:
+            return True
+        now = time.monotonic()
+        if now < self.retry_at:
+            return False
+        try:
+            self.connect()
+        except OSError as error:
+            logger.warning(f"⚠️ Component worker {self.name} unavailable: {error}")
+            self.retry_at = now + retry_interval
+            return False
+        self.restarts += 1
+        return True
+    
+    def send(self, request_id: int, block: np.ndarray, flags: int, deadline: float) -> None:
+        self.sock.settimeout(max(deadline - time.monotonic(), 1e-3))
+        send_frame(self.sock, REQUEST, request_id, block, *block.shape, flags=flags)
+        self.requests += 1
+    
+    def receive(self, deadline: float, max_bytes: int) -> Frame:
+        """Read one reply of at most max_bytes from a socket that is ready to read."""
+        self.sock.settimeout(max(deadline - time.monotonic(), _READ_GRACE))
+        frame = recv_frame(self.sock, max_bytes)
+        if frame is None:
+            raise ConnectionResetError("worker closed the connection")
+        return frame
+    
+    def fail(self, error: BaseException, retry_interval: float) -> None:
+        """Drop the connection (its stream may hold a stale reply) and schedule a restart."""
+        logger.warning(f"⚠️ Component worker {self.name} failed: {error!r}")
+        self.failures += 1
+        self.retry_at = time.monotonic() + retry_interval
+        self.close(graceful=False)
+    
+    def close(self, graceful: bool = True) -> None:
+        if self.sock is not None:
+            if graceful:
+                try:
+                    self.sock.settimeout(1.0)
+                    send_frame(self.sock, SHUTDOWN)
+                except OSError:
+                    pass
+            self.sock.close()
+            self.sock = None
+        if self.process is not None:
+            if graceful:
+                self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout=5)
+            self.process = None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'alive': self.sock is not None,
+            'address': self.address,
+            'requests': self.requests,
+            'failures': self.failures,
+            'restarts': self.restarts,
+            'fallbacks': self.fallbacks
+        }
+
+
+class DistributedSingularity:
+    """
+    Run every component of a CognitiveSingularity in its own worker.
+    
+    Components named in addresses are served by ComponentServers at those
+    (host, port) addresses; the rest get a local worker process each,
+    started here. Calls scatter one request per selected component, then
+    gather the replies within timeout seconds. One batch runs at a time;
+    concurrent callers are serialised by a lock. Usable as a context
+    manager; workers are stopped on exit.
+    """
+    
+    def __init__(self, singularity: Optional[CognitiveSingularity] = None,
+                 addresses: Optional[Dict[str, Address]] = None, timeout: float = 10.0,
+                 fallback: bool = True, retry_interval: float = 1.0,
+                 mp_context: Optional[Any] = None):
+        """
+        Args:
+            singularity: Coordinator instance: encodes queries, builds results
+                and runs fallbacks; its processors are copied into local
+                workers (created if omitted)
+            addresses: Component name -> (host, port) of a remote ComponentServer
+            timeout: Seconds a call waits for all of its replies
+            fallback: Run a failed worker's slice in-process instead of raising WorkerError
+            retry_interval: Seconds before a failed worker is restarted or reconnected
+            mp_context: multiprocessing context for local workers (defaults to the platform default)
+        """
+        if timeout <= 0:
+            raise ValueError(f"timeout must be positive, got {timeout}")
+        addresses = dict(addresses or {})
+        
+        self.singularity = singularity if singularity is not None else CognitiveSingularity()
+        unknown = set(addresses).difference(self.singularity.components)
+        if unknown:
+            raise ValueError(f"Unknown components {sorted(unknown)}; expected some of {list(self.singularity.components)}")
+        
+        self.timeout = timeout
+        self.fallback = fallback
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        
+        context = mp_context if mp_context is not None else multiprocessing.get_context()
+        self._workers: List[_Worker] = [
+            _Worker(step.name, step.processor, step.size, addresses.get(step.name), context, timeout)
+            for step in self.singularity.plan.steps
+        ]
+        # Local workers first, so forked processes do not inherit remote connections
+        for worker in sorted(self._workers, key=lambda worker: worker.address is not None):
+            worker.peers = self._workers
+            try:
+                worker.connect()
+            except OSError as error:
+                worker.fail(error, retry_interval)
+        
+        logger.info(f"🛰️ Distributed singularity started with {len(self._workers)} component workers")
+    
+    def process_tensor_batch(self, matrix: np.ndarray, out: Optional[np.ndarray] = None,
+                             activations: Optional[np.ndarray] = None,
+                             components: Components = None) -> np.ndarray:
+        """
+        CognitiveSingularity.process_tensor_batch with every component run by
+        its worker: (N, num_components) float32 processed states, and the
+        activated tensors in activations when given.
+        """
+        singularity = self.singularity
+        matrix = np.asarray(matrix, dtype=np.float32)
+        columns = singularity.select_components(components)
+        rows = matrix.shape[0]
+        states = np.empty((rows, len(columns)), dtype=np.float32) if out is None else out
+        
+        chunk = singularity._chunk_rows(singularity.total_freedom)
+        with self._lock:
+            for start in range(0, rows, chunk):
+                stop = min(start + chunk, rows)
+                self._scatter_gather(matrix[start:stop], columns, states[start:stop],
+                                     None if activations is None else activations[start:stop])
+        return states
+    
+    def _scatter_gather(self, matrix: np.ndarray, columns: Sequence[int], states: np.ndarray,
+                        activations: Optional[np.ndarray]) -> None:
+        """Run one chunk: send every request, then collect every reply (lock held)."""
+        steps = self.singularity.plan.steps
+        flags = FLAG_STATES if activations is None else 0
+        request_id = next(self._request_ids) & 0xFFFFFFFF
+        deadline = time.monotonic() + self.timeout
+        
+        pending, local = [], []
+        for index, column in enumerate(columns):
+            worker = self._workers[column]
+            block = np.ascontiguousarray(matrix[:, steps[column].slice], dtype=_FLOAT)
+            if worker.ready(self.retry_interval):
+                try:
+                    worker.send(request_id, block, flags, deadline)
+                    pending.append((index, column, block))
+                    continue
+                except OSError as error:
+                    worker.fail(error, self.retry_interval)
+            local.append((index, column, block))
+        
+        # Wait on every pending worker at once: replies are read as they
+        # arrive, and only workers still silent at the deadline are failed
+        errors = []
+        waiting = {self._workers[column].sock: (index, column, block) for index, column, block in pending}
+        with selectors.DefaultSelector() as selector:
+            for sock in waiting:
+                selector.register(sock, selectors.EVENT_READ)
+            while waiting:
+                remaining = deadline - time.monotonic()
+                ready = selector.select(max(remaining, 0))
+                if not ready and remaining <= 0:
+                    break
+                for key, _ in ready:
+                    selector.unregister(key.fileobj)
+                    index, column, block = waiting.pop(key.fileobj)
+                    worker = self._workers[column]
+                    try:
+                        frame = worker.receive(deadline, block.nbytes)
+                        if frame.kind == ERROR:
+                            errors.append(WorkerError(worker.name, frame.payload.decode('utf-8', 'replace')))
+                            continue
+                        width = 1 if flags else block.shape[1]
+                        if frame.kind != RESPONSE or frame.request_id != request_id or \
+                                (frame.rows, frame.width) != (block.shape[0], width):
+                            raise FrameError(f"Unexpected reply {frame.kind}/{frame.request_id} "
+                                             f"of shape {(frame.rows, frame.width)}")
+                    except OSError as error:
+                        worker.fail(error, self.retry_interval)
+                        local.append((index, column, block))
+                        continue
+                    
+                    if flags:
+                        states[:, index] = frame.array()[:, 0]
+                    else:
+                        target = activations[:, steps[column].slice]
+                        target[...] = frame.array()
+                        target.sum(axis=1, out=states[:, index])
+        
+        for index, column, block in waiting.values():
+            self._workers[column].fail(TimeoutError(f"no reply within {self.timeout} s"), self.retry_interval)
+            local.append((index, column, block))
+        
+        for index, column, block in local:
+            worker = self._workers[column]
+            if not self.fallback:
+                errors.append(WorkerError(worker.name, "unavailable"))
+                continue
+            worker.fallbacks += 1
+            step = steps[column]
+            if activations is None:
+                target = np.empty(block.shape, dtype=np.float32)
+            else:
+                target = activations[:, step.slice]
+            step.activate_batch(block, target).sum(axis=1, out=states[:, index])
+        
+        if errors:
+            raise errors[0]
+    
+    def process_cognitive_queries(self, queries: Sequence[str], components: Components = None,
+                                  compact: bool = False) -> Union[List[Dict[str, Any]], ResultBatch]:
+        """
+        Encode queries on the coordinator and run them across the workers.
+        Matches CognitiveSingularity.process_cognitive_queries exactly.
+        """
+        singularity = self.singularity
+        queries = list(queries)
+        columns = singularity.select_components(components, queries)
+        names = None
+        if len(columns) != len(singularity.plan):
+            names = [singularity.plan.steps[column].name for column in columns]
+        
+        matrix = singularity.graphql_queries_to_tensor(queries, components=names)
+        states = self.process_tensor_batch(matrix, components=names)
+        return singularity.results_from_states(states, names, compact=compact)
+    
+    def process_cognitive_query(self, query: str, components: Components = None,
+                                compact: bool = False) -> Union[Dict[str, Any], Any]:
+        """A single query across the workers; matches process_cognitive_query."""
+        if compact:
+            return self.process_cognitive_queries([query], components, compact=True)[0]
+        return self.process_cognitive_queries([query], components)[0]
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-component worker counters: requests, failures, restarts and fallbacks."""
+        return {worker.name: worker.stats() for worker in self._workers}
+    
+    def close(self) -> None:
+        """Stop the local worker processes and disconnect from remote ones."""
+        with self._lock:
+            for worker in self._workers:
+                worker.close()
+    
+    def __enter__(self) -> "DistributedSingularity":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,346 @@
+"""
+ECAN-Attention: economic attention allocation over sparse link graphs.
+
+An AttentionBank holds per-item short-term importance (STI) and long-term
+importance (LTI) and trades them like a currency with its funds:
+
+    stimulate()     pays wages from the funds to stimulated items
+    collect_rent()  charges every item in the attentional focus rent
+    spread()        moves a fraction of each focus item's STI along its
+                    out-links, split in proportion to the link weights
+
+Total STI plus funds is conserved by all three. The attentional focus is
+the focus_size items of highest STI, kept in an IndexedHeap: updating an
+item is O(log n) and reading the top k is O(k log k), so no cycle ever
+re-sorts the whole bank. Spreading gathers the focus rows of the CSR link
+matrix in one vectorised pass, so its cost follows the focus' out-degree
+rather than the number of items.
+
+The ecan component (AttentionProcessor) applies the same spreading to a
+whole query block through sparse products and normalises the result.
+"""
+
+import heapq
+import threading
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from .registry import normalise_kernel
+from .sparse import CSRMatrix, lattice_adjacency
+
+
+class IndexedHeap:
+    """
+    Max-heap of item ids ordered by an external key array, with a position
+    index so any item can be re-sifted after its key changes. Ties go to the
+    lower item id, so the order is total and deterministic.
+    """
+    
+    # Above this fraction of changed items a bulk update re-sorts instead of sifting
+    REBUILD_FRACTION = 1 / 16
+    
+    def __init__(self, keys: np.ndarray):
+        """
+        Args:
+            keys: 1-D key array, read (not copied) on every comparison; call
+                update() or update_many() after writing to it
+        """
+        self.keys = keys
+        self.rebuild()
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def rebuild(self) -> None:
+        """Re-order every item; a descending sort is a valid heap."""
+        self._heap = np.lexsort((np.arange(len(self.keys)), -self.keys))
+        self._position = np.empty_like(self._heap)
+        self._position[self._heap] = np.arange(len(self._heap))
+    
+    def _before(self, a: int, b: int) -> bool:
+        key_a, key_b = self.keys[a], self.keys[b]
+        return key_a > key_b or (key_a == key_b and a < b)
+    
+    def _move(self, item: int, position: int) -> None:
+        self._heap[position] = item
+        self._position[item] = position
+    
+    def update(self, item: int) -> None:
+        """Restore the heap order after keys[item] changed."""
+        heap = self._heap
+        position = int(self._position[item])
+        
+        # Sift up
+        while position:
+            parent = (position - 1) >> 1
+            above = int(heap[parent])
+            if not self._before(item, above):
+                break
+            self._move(above, position)
+            position = parent
+        
+        # Sift down
+        size = len(heap)
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and self._before(int(heap[child + 1]), int(heap[child])):
+                child += 1
+            below = int(heap[child])
+            if not self._before(below, item):
+                break
+            self._move(below, position)
+            position = child
+        self._move(item, position)
+    
+    def update_many(self, items: np.ndarray) -> None:
+        """Restore the order after the keys of many (distinct) items changed."""
+        if len(items) > len(self._heap) * self.REBUILD_FRACTION:
+            self.rebuild()
+            return
+        for item in items.tolist():
+            self.update(item)
+    
+    def peek(self) -> int:
+        """The item with the highest key."""
+        return int(self._heap[0])
+    
+    def top(self, k: int) -> np.ndarray:
+        """The k items with the highest keys, in descending order."""
+        heap, keys = self._heap, self.keys
+        size = len(heap)
+        k = min(k, size)
+        result = np.empty(k, dtype=np.int64)
+        if not k:
+            return result
+        
+        # Best-first walk of the heap; only the frontier is ever compared
+        frontier = [(-keys[heap[0]], int(heap[0]), 0)]
+        for index in range(k):
+            _, item, position = heapq.heappop(frontier)
+            result[index] = item
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < size:
+                    below = int(heap[child])
+                    heapq.heappush(frontier, (-keys[below], below, child))
+        return result
+
+
+class AttentionBank:
+    """
+    STI/LTI store with wages, rent, spreading and an indexed attentional focus.
+    Thread-safe: every update holds the bank's lock.
+    """
+    
+    def __init__(self, size: int, links: Optional[CSRMatrix] = None, focus_size: int = 100,
+                 wage: float = 1.0, lti_wage: float = 0.1, rent: float = 0.1,
+                 spread_fraction: float = 0.2, sti: Optional[np.ndarray] = None,
+                 funds: float = 0.0):
+        """
+        Args:
+            size: Number of items
+            links: Optional (size, size) sparse matrix of non-negative link
+                weights; row i lists where item i spreads its importance
+            focus_size: Number of items in the attentional focus
+            wage: STI paid per unit of stimulus
+            lti_wage: LTI earned per unit of stimulus
+            rent: STI charged to each focus item per collect_rent()
+            spread_fraction: Share of a focus item's positive STI spread per cycle
+            sti: Initial STI (defaults to zeros)
+            funds: Initial funds of the bank
+        """
+        if links is not None:
+            if links.shape != (size, size):
+                raise ValueError(f"Links must have shape {(size, size)}, got {links.shape}")
+            if links.nnz and links.data.min() < 0:
+                raise ValueError("Link weights must be non-negative")
+        if focus_size < 1:
+            raise ValueError(f"focus_size must be at least 1, got {focus_size}")
+        if not 0 <= spread_fraction <= 1:
+            raise ValueError(f"spread_fraction must be in [0, 1], got {spread_fraction}")
+        
+        self.size = size
+        if links is not None:
+            # Spread in float64 so STI plus funds stays conserved to rounding
+            links = CSRMatrix(links.indptr, links.indices, links.data.astype(np.float64),
+                              links.shape).row_normalised()
+        self.links = links
+        self.focus_size = min(focus_size, size)
+        self.wage = float(wage)
+        self.lti_wage = float(lti_wage)
+        self.rent = float(rent)
+        self.spread_fraction = float(spread_fraction)
+        self.funds = float(funds)
+        
+        self.sti = np.zeros(size, dtype=np.float64)
+        if sti is not None:
+            self.sti[:] = np.asarray(sti, dtype=np.float64).reshape(-1)
+        self.lti = np.zeros(size, dtype=np.float64)
+        self._heap = IndexedHeap(self.sti)
+        self._lock = threading.RLock()
+    
+    def __getstate__(self):
+        # Locks are rebuilt, not pickled
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    @property
+    def focus(self) -> np.ndarray:
+        """Items of the attentional focus, highest STI first."""
+        return self.top(self.focus_size)
+    
+    def top(self, k: int) -> np.ndarray:
+        """The k items of highest STI, highest first."""
+        with self._lock:
+            return self._heap.top(k)
+    
+    def in_focus(self, item: int) -> bool:
+        """Whether item is in the attentional focus."""
+        return item in self.focus.tolist()
+    
+    def stimulate(self, items: np.ndarray, amounts: Union[float, np.ndarray] = 1.0) -> float:
+        """
+        Pay wages for stimulus: each item earns wage * amount STI (out of the
+        funds) and lti_wage * amount LTI. Repeated items accumulate.
+        Returns the STI paid.
+        """
+        items = np.asarray(items, dtype=np.int64).reshape(-1)
+        amounts = np.broadcast_to(np.asarray(amounts, dtype=np.float64), items.shape)
+        unique, inverse = np.unique(items, return_inverse=True)
+        stimulus = np.bincount(inverse, weights=amounts, minlength=len(unique))
+        
+        with self._lock:
+            wages = self.wage * stimulus
+            self.sti[unique] += wages
+            self.lti[unique] += self.lti_wage * stimulus
+            paid = float(wages.sum())
+            self.funds -= paid
+            self._heap.update_many(unique)
+        return paid
+    
+    def collect_rent(self) -> float:
+        """Charge rent to every item in the attentional focus. Returns the rent collected."""
+        with self._lock:
+            focus = self._heap.top(self.focus_size)
+            self.sti[focus] -= self.rent
+            collected = self.rent * len(focus)
+            self.funds += collected
+            self._heap.update_many(focus)
+        return collected
+    
+    def spread(self, fraction: Optional[float] = None) -> float:
+        """
+        Spread a fraction of every focus item's positive STI along its
+        out-links, split by link weight. Items without out-links keep their
+        STI. Returns the total STI moved.
+        """
+        if self.links is None:
+            return 0.0
+        fraction = self.spread_fraction if fraction is None else fraction
+        indptr, indices, weights = self.links.indptr, self.links.indices, self.links.data
+        
+        with self._lock:
+            sources = self._heap.top(self.focus_size)
+            amounts = fraction * np.maximum(self.sti[sources], 0)
+            degrees = indptr[sources + 1] - indptr[sources]
+            sending = (amounts > 0) & (degrees > 0)
+            sources, amounts, degrees = sources[sending], amounts[sending], degrees[sending]
+            if not len(sources):
+                return 0.0
+            
+            # Stored-entry positions of every source row, gathered in one pass
+            ends = np.cumsum(degrees)
+            positions = (np.arange(ends[-1]) - np.repeat(ends - degrees, degrees)
+                         + np.repeat(indptr[sources], degrees))
+            shares = np.repeat(amounts, degrees) * weights[positions]
+            targets, inverse = np.unique(indices[positions], return_inverse=True)
+            
+            self.sti[sources] -= amounts
+            self.sti[targets] += np.bincount(inverse, weights=shares, minlength=len(targets))
+            self._heap.update_many(np.union1d(sources, targets))
+        return float(amounts.sum())
+    
+    def cycle(self) -> None:
+        """One attention allocation cycle: collect rent, then spread."""
+        with self._lock:
+            self.collect_rent()
+            self.spread()
+
+
+class AttentionProcessor:
+    """
+    Component processor spreading a block's importance over a link graph.
+    With mass-conserving links the output of every row sums to one, like
+    the plain normalisation it refines.
+    """
+    
+    label = 'ECAN-Attention'
+    batched = True
+    
+    def __init__(self, links: CSRMatrix, spread_fraction: float = 0.2, steps: int = 2):
+        """
+        Args:
+            links: Square sparse matrix of non-negative link weights (row i
+                lists where item i spreads to)
+            spread_fraction: Share of every item's importance spread per step
+            steps: Spreading steps per activation
+        """
+        if links.shape[0] != links.shape[1]:
+            raise ValueError(f"Links must be square, got {links.shape}")
+        if steps < 0:
+            raise ValueError(f"steps must be non-negative, got {steps}")
+        
+        self.items = links.shape[0]
+        # Column-stochastic spreading matrix: item j receives w_ij / sum_k w_ik of item i's share
+        self.spreading = links.row_normalised().transpose()
+        self.spread_fraction = float(spread_fraction)
+        self.steps = steps
+        self._local = threading.local()
+    
+    def __getstate__(self):
+        # Per-thread scratch buffers are rebuilt, not pickled
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+    
+    def _scratch(self) -> Tuple[np.ndarray, np.ndarray]:
+        """This thread's reusable (received, matmul work) buffers for single vectors."""
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = (np.empty(self.items, dtype=np.float32),
+                                             np.empty(self.spreading.work_size, dtype=np.float32))
+        return buffers
+    
+    @classmethod
+    def lattice(cls, shape: Tuple[int, ...] = (3, 3, 3, 3), **kwargs) -> "AttentionProcessor":
+        """Spreading over the nearest-neighbour lattice of the given shape."""
+        return cls(lattice_adjacency(shape), **kwargs)
+    
+    def activate(self, block: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """x <- (1 - f) x + f S x for each step, then normalise every row to sum to one."""
+        received = work = None
+        if block.ndim == 1 and out.dtype == np.float32:
+            # Single queries reuse scratch space so the hot path does not allocate
+            received, work = self._scratch()
+        
+        np.copyto(out, block)
+        for _ in range(self.steps):
+            received = self.spreading.matmul(out, out=received, work=work)
+            received *= self.spread_fraction
+            out *= 1 - self.spread_fraction
+            out += received
+        return normalise_kernel(out, out)
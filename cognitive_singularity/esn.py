@@ -0,0 +1,255 @@
+"""
+ESN-Reservoir: a leaky echo state network with a sparse recurrent matrix.
+
+The esn component's 117 states are the reservoir units. Every update mixes
+the previous state through a fixed sparse recurrent matrix W, scaled to a
+spectral radius below one (the echo state property), with the scaled input:
+
+    x_{t+1} = (1 - a) x_t + a tanh(W x_t + s ⊙ u_t)
+
+where s = 1 + w holds per-unit input weights taken from the tensor field
+(quantised weights stay compact and are dequantised chunk by chunk).
+
+By default the processor is pure: each query is held as a constant input
+for a few settling steps from the rest state, so results never depend on
+query order. With stateful=True the reservoir keeps its state between
+queries and every query (or every row of a batch, in order) advances it.
+run() consumes a whole stream in one call, run_batch() drives many
+independent sequences in lockstep, and snapshot()/restore() copy the state.
+"""
+
+import functools
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .quant import as_quantized
+from .sparse import CSRMatrix
+
+# Above this size the spectral radius is estimated by power iteration
+# instead of a dense eigenvalue decomposition
+_DENSE_EIGVALS_LIMIT = 2048
+
+
+def estimate_spectral_radius(matrix: CSRMatrix) -> float:
+    """Largest absolute eigenvalue; exact for small matrices, estimated for large ones."""
+    if not matrix.nnz:
+        return 0.0
+    if matrix.shape[0] <= _DENSE_EIGVALS_LIMIT:
+        return float(np.abs(np.linalg.eigvals(matrix.to_dense().astype(np.float64))).max())
+    return matrix.spectral_radius()
+
+
+@functools.lru_cache(maxsize=16)
+def _random_recurrent(units: int, density: float, seed: int, spectral_radius: float) -> CSRMatrix:
+    """
+    Seeded random W rescaled to spectral_radius. The eigenvalue solve
+    dominates construction, so each W is drawn once per process and shared, read-only.
+    """
+    recurrent = CSRMatrix.random(units, density, np.random.default_rng(seed))
+    radius = estimate_spectral_radius(recurrent)
+    if radius > 0:
+        recurrent = recurrent.scaled(spectral_radius / radius)
+    return recurrent.read_only()
+
+
+class EchoStateReservoir:
+    """
+    Leaky echo state reservoir usable as a component processor.
+    Thread-safe: stateful updates are serialised by a lock.
+    """
+    
+    label = 'ESN-Reservoir'
+    batched = True
+    
+    def __init__(self, recurrent: CSRMatrix, weights: Optional[np.ndarray] = None,
+                 leak: float = 1.0, settle_steps: int = 2, stateful: bool = False):
+        """
+        Args:
+            recurrent: Square sparse recurrent matrix W (used as given)
+            weights: Per-unit input weights w (any shape with one entry per unit);
+                float16 arrays and quantised tensors are kept in their storage type
+            leak: Leak rate a in (0, 1]; 1 replaces the state at every step
+            settle_steps: Steps a query is held for in the pure (stateless) mode
+            stateful: Keep the reservoir state between queries
+        """
+        if recurrent.shape[0] != recurrent.shape[1]:
+            raise ValueError(f"Recurrent matrix must be square, got {recurrent.shape}")
+        if not 0 < leak <= 1:
+            raise ValueError(f"leak must be in (0, 1], got {leak}")
+        if settle_steps < 1:
+            raise ValueError(f"settle_steps must be at least 1, got {settle_steps}")
+        
+        self.units = recurrent.shape[0]
+        self.recurrent = recurrent
+        self.leak = float(leak)
+        self.settle_steps = settle_steps
+        self.stateful = stateful
+        
+        # Quantised weights are dequantised on the fly; float32 ones are folded into 1 + w
+        scale = np.ones(self.units, dtype=np.float32)
+        self.input_weights = as_quantized(weights)
+        if self.input_weights is not None:
+            if self.input_weights.size != self.units:
+                raise ValueError(f"Expected {self.units} input weights, got {self.input_weights.size}")
+            scale = None
+        elif weights is not None:
+            weights = np.asarray(weights, dtype=np.float32).reshape(-1)
+            if weights.shape != (self.units,):
+                raise ValueError(f"Expected {self.units} input weights, got {weights.size}")
+            scale += weights
+        self.input_scale = scale
+        self.state = np.zeros(self.units, dtype=np.float32)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    @classmethod
+    def random(cls, units: int, weights: Optional[np.ndarray] = None,
+               spectral_radius: float = 0.9, density: float = 0.1, seed: int = 0,
+               **kwargs) -> "EchoStateReservoir":
+        """A reservoir with a seeded random sparse W rescaled to the given spectral radius."""
+        if not 0 < spectral_radius < 1:
+            raise ValueError(f"spectral_radius must be in (0, 1), got {spectral_radius}")
+        
+        return cls(_random_recurrent(units, density, seed, spectral_radius), weights, **kwargs)
+    
+    def __getstate__(self):
+        # Locks and per-thread scratch buffers are rebuilt, not pickled
+        state = self.__dict__.copy()
+        del state['_lock'], state['_local']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    def _scratch(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """This thread's reusable (drive, preactivation, matmul work, dequantised) buffers."""
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            dequantised = self.input_weights.work_size if self.input_weights is not None else 0
+            buffers = self._local.buffers = (np.empty(self.units, dtype=np.float32),
+                                             np.empty(self.units, dtype=np.float32),
+                                             np.empty(self.recurrent.work_size, dtype=np.float32),
+                                             np.empty(dequantised, dtype=np.float32))
+        return buffers
+    
+    def _drive(self, inputs: np.ndarray, out: np.ndarray,
+               dequantised: Optional[np.ndarray] = None) -> np.ndarray:
+        """The scaled input s ⊙ u, written into out."""
+        if self.input_weights is None:
+            return np.multiply(inputs, self.input_scale, out=out)
+        np.copyto(out, inputs)
+        return self.input_weights.multiply(out, 1.0, dequantised)
+    
+    def _update(self, state: np.ndarray, drive: np.ndarray, out: np.ndarray,
+                pre: Optional[np.ndarray] = None, work: Optional[np.ndarray] = None) -> np.ndarray:
+        """One reservoir step from state with the already-scaled input drive; out may alias state."""
+        pre = self.recurrent.matmul(state, out=pre, work=work)
+        pre += drive
+        np.tanh(pre, out=pre)
+        if self.leak == 1.0:
+            np.copyto(out, pre)
+        else:
+            pre -= state
+            pre *= self.leak
+            np.add(state, pre, out=out)
+        return out
+    
+    def activate(self, block: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Pure mode: settle every row (or the single vector) from the rest state.
+        Stateful mode: advance the reservoir by each row in order.
+        """
+        if self.stateful:
+            with self._lock:
+                for row, vector in zip(out.reshape(-1, self.units), block.reshape(-1, self.units)):
+                    self._step_locked(vector, row)
+            return out
+        
+        if block.ndim == 1 and out.dtype == np.float32:
+            # Single queries reuse scratch space so the hot path does not allocate
+            drive, pre, work, dequantised = self._scratch()
+            self._drive(block, drive, dequantised)
+        else:
+            drive = self._drive(block, np.empty(block.shape, np.result_type(block, np.float32)))
+            pre = work = None
+        
+        # The first step from rest is just the squashed drive
+        np.tanh(drive, out=out)
+        if self.leak != 1.0:
+            out *= self.leak
+        for _ in range(self.settle_steps - 1):
+            self._update(out, drive, out, pre, work)
+        return out
+    
+    def _step_locked(self, vector: np.ndarray, out: np.ndarray) -> np.ndarray:
+        drive, pre, work, dequantised = self._scratch()
+        self._drive(vector, drive, dequantised)
+        self._update(self.state, drive, self.state, pre, work)
+        np.copyto(out, self.state)
+        return out
+    
+    def step(self, vector: np.ndarray) -> np.ndarray:
+        """Advance the persistent state by one input and return the new state."""
+        with self._lock:
+            return self._step_locked(np.asarray(vector).reshape(-1), np.empty(self.units, np.float32))
+    
+    def run(self, inputs: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Consume a (T, units) input stream, advancing the persistent state,
+        and return the (T, units) states visited.
+        """
+        inputs = np.asarray(inputs).reshape(-1, self.units)
+        if out is None:
+            out = np.empty(inputs.shape, dtype=np.float32)
+        with self._lock:
+            for vector, row in zip(inputs, out):
+                self._step_locked(vector, row)
+        return out
+    
+    def run_batch(self, sequences: np.ndarray,
+                  states: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Drive B independent sequences of shape (B, T, units) in lockstep.
+        
+        Every time step is one batched sparse product over all sequences. The
+        persistent state is left untouched; each sequence starts from the
+        matching row of states (default: rest). Returns the (B, T, units)
+        states visited and the (B, units) final states. Row b equals running
+        sequence b on its own, bit for bit.
+        """
+        sequences = np.asarray(sequences, dtype=np.float32)
+        batch, steps = sequences.shape[:2]
+        current = (np.zeros((batch, self.units), dtype=np.float32) if states is None
+                   else np.array(states, dtype=np.float32).reshape(batch, self.units))
+        
+        outputs = np.empty((batch, steps, self.units), dtype=np.float32)
+        drive = np.empty((batch, self.units), dtype=np.float32)
+        pre = np.empty((batch, self.units), dtype=np.float32)
+        work = np.empty(batch * self.recurrent.work_size, dtype=np.float32)
+        for step in range(steps):
+            self._drive(sequences[:, step], drive)
+            self._update(current, drive, current, pre, work)
+            outputs[:, step] = current
+        return outputs, current
+    
+    def snapshot(self) -> np.ndarray:
+        """A copy of the current reservoir state."""
+        with self._lock:
+            return self.state.copy()
+    
+    def restore(self, snapshot: np.ndarray) -> None:
+        """Overwrite the reservoir state with a snapshot."""
+        snapshot = np.asarray(snapshot, dtype=np.float32).reshape(-1)
+        if snapshot.shape != (self.units,):
+            raise ValueError(f"Expected a {self.units}-unit snapshot, got {snapshot.size}")
+        with self._lock:
+            np.copyto(self.state, snapshot)
+    
+    def reset(self) -> None:
+        """Return the reservoir to its rest state."""
+        with self._lock:
+            self.state[...] = 0
@@ -0,0 +1,550 @@
+"""
+GraphQL parsing and compiled query plans.
+
+parse() turns a GraphQL document into a normalised AST: insignificant
+whitespace, commas and comments are dropped, the shorthand `{ ... }` becomes
+`query { ... }`, arguments and object fields are sorted by name, repeated
+selections of the same field are merged and every selection set is sorted.
+Printing that AST (str(document)) gives the canonical text, so queries that
+differ only in layout or field order have identical normalised text.
+
+compile_query() turns the document into an immutable QueryPlan: the
+normalised text and its stable fingerprint, the selected field paths, the
+nesting depth and a fixed-size feature vector. Plans are cached by
+normalised text (see cache.PlanCache), so equivalent queries share one plan
+and one encoding and each distinct query shape is parsed once.
+"""
+
+import functools
+import json
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .metro import metro_hash64, metro_hash64_batch
+
+# Layout of QueryPlan.features: structural counts, then hashed field names
+STRUCTURE_FEATURES = ('fields', 'depth', 'operations', 'arguments',
+                      'variables', 'fragments', 'directives', 'aliases')
+FIELD_BUCKETS = 24
+FEATURE_SIZE = len(STRUCTURE_FEATURES) + FIELD_BUCKETS
+
+# Each match skips insignificant whitespace, commas and comments, then
+# captures one token; the empty 'eof' match ends the stream
+_TOKEN = re.compile(r'''
+    (?:[\s,\ufeff]+|\#[^\n\r]*)*
+    (?:
+        (?P<spread>\.\.\.)
+      | (?P<punct>[!$&():=@\[\]{|}])
+      | (?P<block>"""(?:\\"""|(?!""")[\s\S])*""")
+      | (?P<string>"(?:\\.|[^"\\\n\r])*")
+      | (?P<number>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?(?![_A-Za-z.]))
+      | (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+      | (?P<eof>\Z)
+      | (?P<error>.)
+    )
+''', re.VERBOSE | re.DOTALL)
+
+OPERATION_TYPES = ('query', 'mutation', 'subscription')
+
+# Deepest nesting of selection sets, list/object values, list types and
+# fragment spreads accepted; deeper documents are syntax errors rather than
+# running the recursive parser and printer out of stack
+MAX_NESTING = 64
+
+# Most selections compile_query visits once fragment spreads are expanded in
+# place; fragments that spread each other several times grow exponentially
+MAX_SELECTIONS = 1 << 14
+
+
+def query_fingerprint(query: str) -> int:
+    """
+    Stable 64-bit fingerprint of a query string: MetroHash64 (seed 0) of its
+    UTF-8 text. Unlike the built-in hash(), this is identical across
+    processes and restarts, and matches go-metro's Hash64 for the same bytes.
+    """
+    return metro_hash64(query.encode('utf-8'))
+
+
+def query_fingerprints(queries: Sequence[str]) -> np.ndarray:
+    """query_fingerprint of many queries at once, as a uint64 array in input order."""
+    return metro_hash64_batch(queries)
+
+
+class GraphQLSyntaxError(ValueError):
+    """A query that is not a valid GraphQL document."""
+    
+    def __init__(self, message: str, position: Optional[int] = None):
+        super().__init__(message if position is None else f"{message} at position {position}")
+        self.position = position
+
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+    position: int
+
+
+def _scan(source: str) -> Tuple[List[str], List[str], List[int]]:
+    """Kinds, values and positions of the significant tokens, ending with 'eof'."""
+    kinds, values, positions = [], [], []
+    for match in _TOKEN.finditer(source):
+        kind = match.lastgroup
+        if kind == 'error':
+            raise GraphQLSyntaxError(f"Unexpected character {match.group(kind)!r}", match.start(kind))
+        kinds.append(kind)
+        values.append(match.group(kind))
+        positions.append(match.start(kind))
+        if kind == 'eof':
+            break
+    return kinds, values, positions
+
+
+def tokenize(source: str) -> Iterator[Token]:
+    """Yield the significant tokens of source, ending with an 'eof' token."""
+    return map(Token, *_scan(source))
+
+
+def _block_string_value(raw: str) -> str:
+    """The value of a block string: common indentation and blank edge lines removed."""
+    lines = raw[3:-3].replace('\\"""', '"""').splitlines()
+    indents = [len(line) - len(line.lstrip(' \t')) for line in lines[1:] if line.strip()]
+    common = min(indents) if indents else 0
+    lines = lines[:1] + [line[common:] for line in lines[1:]]
+    while lines and not lines[0].strip():
+        lines.pop(0)
+    while lines and not lines[-1].strip():
+        lines.pop()
+    return '\n'.join(lines)
+
+
+# Normalised AST. Values and types are kept as their canonical text.
+
+Arguments = Tuple[Tuple[str, str], ...]
+
+
+class Directive(NamedTuple):
+    name: str
+    arguments: Arguments
+    
+    def __str__(self) -> str:
+        return f"@{self.name}{_print_arguments(self.arguments)}"
+
+
+class Field(NamedTuple):
+    alias: Optional[str]
+    name: str
+    arguments: Arguments
+    directives: Tuple[Directive, ...]
+    selections: Tuple["Selection", ...]
+    
+    @property
+    def key(self) -> str:
+        """The response key: the alias when there is one, else the name."""
+        return self.alias or self.name
+    
+    def __str__(self) -> str:
+        if not (self.alias or self.arguments or self.directives or self.selections):
+            return self.name
+        alias = f"{self.alias}: " if self.alias else ""
+        return (f"{alias}{self.name}{_print_arguments(self.arguments)}"
+                f"{_print_directives(self.directives)}{_print_selections(self.selections)}")
+
+
+class FragmentSpread(NamedTuple):
+    name: str
+    directives: Tuple[Directive, ...]
+    
+    def __str__(self) -> str:
+        return f"...{self.name}{_print_directives(self.directives)}"
+
+
+class InlineFragment(NamedTuple):
+    type_condition: Optional[str]
+    directives: Tuple[Directive, ...]
+    selections: Tuple["Selection", ...]
+    
+    def __str__(self) -> str:
+        condition = f" on {self.type_condition}" if self.type_condition else ""
+        return f"...{condition}{_print_directives(self.directives)}{_print_selections(self.selections)}"
+
+
+Selection = Union[Field, FragmentSpread, InlineFragment]
+
+
+class VariableDefinition(NamedTuple):
+    name: str
+    type: str
+    default: Optional[str]
+    
+    def __str__(self) -> str:
+        default = f" = {self.default}" if self.default is not None else ""
+        return f"${self.name}: {self.type}{default}"
+
+
+class Operation(NamedTuple):
+    kind: str
+    name: Optional[str]
+    variables: Tuple[VariableDefinition, ...]
+    directives: Tuple[Directive, ...]
+    selections: Tuple[Selection, ...]
+    
+    def __str__(self) -> str:
+        head = self.kind + (f" {self.name}" if self.name else "")
+        if self.variables:
+            head += "(" + ", ".join(str(variable) for variable in self.variables) + ")"
+        return f"{head}{_print_directives(self.directives)}{_print_selections(self.selections)}"
+
+
+class Fragment(NamedTuple):
+    name: str
+    type_condition: str
+    directives: Tuple[Directive, ...]
+    selections: Tuple[Selection, ...]
+    
+    def __str__(self) -> str:
+        return (f"fragment {self.name} on {self.type_condition}"
+                f"{_print_directives(self.directives)}{_print_selections(self.selections)}")
+
+
+class Document(NamedTuple):
+    operations: Tuple[Operation, ...]
+    fragments: Tuple[Fragment, ...]
+    
+    def __str__(self) -> str:
+        return " ".join(str(definition) for definition in self.operations + self.fragments)
+
+
+def _print_arguments(arguments: Arguments) -> str:
+    if not arguments:
+        return ""
+    return "(" + ", ".join(f"{name}: {value}" for name, value in arguments) + ")"
+
+
+def _print_directives(directives: Tuple[Directive, ...]) -> str:
+    if not directives:
+        return ""
+    return "".join(f" {directive}" for directive in directives)
+
+
+def _print_selections(selections: Tuple[Selection, ...]) -> str:
+    if not selections:
+        return ""
+    return " { " + " ".join(str(selection) for selection in selections) + " }"
+
+
+def _normalise_selections(selections: List[Selection]) -> Tuple[Selection, ...]:
+    """
+    Merge fields with the same response key, name, arguments and directives
+    (their sub-selections are combined), drop exact duplicates and sort.
+    """
+    merged: Dict[object, Selection] = {}
+    for selection in selections:
+        if isinstance(selection, Field):
+            identity = ('field', selection.key, selection.name, selection.arguments, selection.directives)
+            previous = merged.get(identity)
+            if previous is not None:
+                selection = selection._replace(selections=_normalise_selections(
+                    list(previous.selections) + list(selection.selections)))
+            merged[identity] = selection
+        else:
+            merged.setdefault(str(selection), selection)
+    if len(merged) == 1:
+        return tuple(merged.values())
+    return tuple(sorted(merged.values(), key=str))
+
+
+class _Parser:
+    """Recursive-descent parser over the executable subset of GraphQL."""
+    
+    def __init__(self, source: str):
+        self.kinds, self.values, self.positions = _scan(source)
+        self.index = 0
+        self.nesting = 0
+    
+    def advance(self) -> str:
+        """Consume the current token and return its value."""
+        value = self.values[self.index]
+        self.index += 1
+        return value
+    
+    def peek(self, value: str) -> bool:
+        # Punctuator values never collide with names, numbers or strings,
+        # so comparing the value alone identifies the token
+        return self.values[self.index] == value
+    
+    def skip(self, value: str) -> bool:
+        if self.values[self.index] == value:
+            self.index += 1
+            return True
+        return False
+    
+    def expect(self, value: str) -> None:
+        if not self.skip(value):
+            self.fail(f"Expected {value!r}")
+    
+    def at_name(self, value: Optional[str] = None) -> bool:
+        """Whether the current token is a name (equal to value when given)."""
+        return self.kinds[self.index] == 'name' and (value is None or self.values[self.index] == value)
+    
+    def name(self) -> str:
+        if self.kinds[self.index] != 'name':
+            self.fail("Expected a name")
+        return self.advance()
+    
+    def enter(self) -> None:
+        """Open one nesting level; leave it by decrementing self.nesting."""
+        self.nesting += 1
+        if self.nesting > MAX_NESTING:
+            self.fail(f"Nesting deeper than {MAX_NESTING} levels")
+    
+    def fail(self, message: str):
+        index = self.index
+        found = repr(self.values[index]) if self.kinds[index] != 'eof' else "end of input"
+        raise GraphQLSyntaxError(f"{message}, found {found}", self.positions[index])
+    
+    def document(self) -> Document:
+        operations, fragments = [], {}
+        while self.kinds[self.index] != 'eof':
+            if self.peek('{'):
+                operations.append(Operation('query', None, (), (), self.selection_set()))
+            elif self.at_name() and self.values[self.index] in OPERATION_TYPES:
+                operations.append(self.operation())
+            elif self.at_name('fragment'):
+                fragment = self.fragment()
+                if fragment.name in fragments:
+                    self.fail(f"Duplicate fragment {fragment.name!r}")
+                fragments[fragment.name] = fragment
+            else:
+                self.fail("Expected an operation or fragment")
+        if not operations and not fragments:
+            self.fail("Expected a definition")
+        return Document(tuple(operations), tuple(fragments[name] for name in sorted(fragments)))
+    
+    def operation(self) -> Operation:
+        kind = self.advance()
+        name = self.name() if self.at_name() else None
+        variables = []
+        if self.skip('('):
+            if self.peek(')'):
+                self.fail("Expected a variable definition")
+            while not self.skip(')'):
+                self.expect('$')
+                variable = self.name()
+                self.expect(':')
+                type_text = self.type_reference()
+                default = self.value(constant=True) if self.skip('=') else None
+                self.directives()
+                variables.append(VariableDefinition(variable, type_text, default))
+        return Operation(kind, name, tuple(variables), self.directives(), self.selection_set())
+    
+    def fragment(self) -> Fragment:
+        self.advance()
+        name = self.name()
+        if name == 'on':
+            self.fail("Fragment cannot be named 'on'")
+        if self.name() != 'on':
+            self.fail("Expected 'on'")
+        return Fragment(name, self.name(), self.directives(), self.selection_set())
+    
+    def type_reference(self) -> str:
+        if self.skip('['):
+            self.enter()
+            text = f"[{self.type_reference()}]"
+            self.expect(']')
+            self.nesting -= 1
+        else:
+            text = self.name()
+        return text + "!" if self.skip('!') else text
+    
+    def selection_set(self) -> Tuple[Selection, ...]:
+        self.expect('{')
+        if self.peek('}'):
+            self.fail("Expected a selection")
+        self.enter()
+        selections = []
+        while not self.skip('}'):
+            selections.append(self.selection())
+        self.nesting -= 1
+        return _normalise_selections(selections)
+    
+    def selection(self) -> Selection:
+        if self.skip('...'):
+            if self.at_name() and not self.at_name('on'):
+                return FragmentSpread(self.name(), self.directives())
+            type_condition = None
+            if self.at_name('on'):
+                self.advance()
+                type_condition = self.name()
+            return InlineFragment(type_condition, self.directives(), self.selection_set())
+        
+        alias, name = None, self.name()
+        if self.skip(':'):
+            alias, name = name, self.name()
+        if alias == name:
+            alias = None
+        arguments = self.arguments()
+        directives = self.directives()
+        selections = self.selection_set() if self.peek('{') else ()
+        return Field(alias, name, arguments, directives, selections)
+    
+    def arguments(self, constant: bool = False) -> Arguments:
+        if not self.skip('('):
+            return ()
+        if self.peek(')'):
+            self.fail("Expected an argument")
+        arguments = {}
+        while not self.skip(')'):
+            name = self.name()
+            if name in arguments:
+                self.fail(f"Duplicate argument {name!r}")
+            self.expect(':')
+            arguments[name] = self.value(constant)
+        return tuple(sorted(arguments.items()))
+    
+    def directives(self) -> Tuple[Directive, ...]:
+        directives = []
+        while self.skip('@'):
+            directives.append(Directive(self.name(), self.arguments()))
+        return tuple(directives)
+    
+    def value(self, constant: bool = False) -> str:
+        """Parse a value and return its canonical text."""
+        kind = self.kinds[self.index]
+        if kind == 'punct':
+            if self.skip('$'):
+                if constant:
+                    self.fail("Variables are not allowed in constant values")
+                return "$" + self.name()
+            if self.skip('['):
+                self.enter()
+                items = []
+                while not self.skip(']'):
+                    items.append(self.value(constant))
+                self.nesting -= 1
+                return "[" + ", ".join(items) + "]"
+            if self.skip('{'):
+                self.enter()
+                fields = {}
+                while not self.skip('}'):
+                    name = self.name()
+                    self.expect(':')
+                    fields[name] = self.value(constant)
+                self.nesting -= 1
+                return "{" + ", ".join(f"{name}: {fields[name]}" for name in sorted(fields)) + "}"
+            self.fail("Expected a value")
+        
+        if kind in ('number', 'name'):
+            return self.advance()
+        if kind == 'string':
+            try:
+                text = json.loads(self.values[self.index])
+            except ValueError:
+                self.fail("Invalid string escape")
+            self.index += 1
+            return json.dumps(text, ensure_ascii=False)
+        if kind == 'block':
+            return json.dumps(_block_string_value(self.advance()), ensure_ascii=False)
+        self.fail("Expected a value")
+
+
+def parse(query: str) -> Document:
+    """Parse a GraphQL document into its normalised AST; raises GraphQLSyntaxError."""
+    return _Parser(query).document()
+
+
+def normalise(query: str) -> str:
+    """Canonical text of a GraphQL document."""
+    return str(parse(query))
+
+
+class QueryPlan(NamedTuple):
+    """
+    Everything the pipeline needs from a query, computed once per shape.
+    
+    text: Normalised query text (the raw text when the query did not parse)
+    fingerprint: query_fingerprint(text)
+    fields: Sorted dotted paths of every selected field, through fragments
+    depth: Deepest field nesting (0 for an unparsed query)
+    features: Read-only float32 vector of FEATURE_SIZE entries
+    error: The syntax error message for queries that did not parse
+    """
+    text: str
+    fingerprint: int
+    fields: Tuple[str, ...]
+    depth: int
+    features: np.ndarray
+    error: Optional[str] = None
+    
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+
+@functools.lru_cache(maxsize=4096)
+def _field_bucket(name: str) -> int:
+    return query_fingerprint(name) % FIELD_BUCKETS
+
+
+def compile_query(query: str) -> QueryPlan:
+    """Parse and compile a query; raises GraphQLSyntaxError for invalid documents."""
+    document = parse(query)
+    fragments = {fragment.name: fragment for fragment in document.fragments}
+    counts = dict.fromkeys(STRUCTURE_FEATURES, 0)
+    counts['operations'] = len(document.operations)
+    counts['fragments'] = len(document.fragments)
+    counts['variables'] = sum(len(operation.variables) for operation in document.operations)
+    buckets = [0] * FIELD_BUCKETS
+    paths = set()
+    visited = [0]
+    
+    def walk(selections: Tuple[Selection, ...], prefix: str, depth: int, active: Tuple[str, ...],
+             level: int = 1) -> int:
+        if selections and level > MAX_NESTING:
+            raise GraphQLSyntaxError(f"Nesting deeper than {MAX_NESTING} levels through fragments")
+        visited[0] += len(selections)
+        if visited[0] > MAX_SELECTIONS:
+            raise GraphQLSyntaxError(f"More than {MAX_SELECTIONS} selections once fragments are expanded")
+        deepest = depth
+        for selection in selections:
+            counts['directives'] += len(selection.directives)
+            if isinstance(selection, Field):
+                path = f"{prefix}{selection.name}"
+                paths.add(path)
+                counts['fields'] += 1
+                counts['arguments'] += len(selection.arguments)
+                counts['aliases'] += selection.alias is not None
+                buckets[_field_bucket(selection.name)] += 1
+                deepest = max(deepest, walk(selection.selections, path + ".", depth + 1, active, level + 1))
+            elif isinstance(selection, InlineFragment):
+                deepest = max(deepest, walk(selection.selections, prefix, depth, active, level + 1))
+            else:
+                fragment = fragments.get(selection.name)
+                if fragment is None:
+                    raise GraphQLSyntaxError(f"Unknown fragment {selection.name!r}")
+                if selection.name in active:
+                    raise GraphQLSyntaxError(f"Fragment {selection.name!r} spreads itself")
+                deepest = max(deepest, walk(fragment.selections, prefix, depth,
+                                            active + (selection.name,), level + 1))
+        return deepest
+    
+    depth = 0
+    for operation in document.operations:
+        counts['directives'] += len(operation.directives)
+        depth = max(depth, walk(operation.selections, "", 0, ()))
+    
+    counts['depth'] = depth
+    features = np.array([counts[name] for name in STRUCTURE_FEATURES] + buckets, dtype=np.float32)
+    np.log1p(features, out=features)
+    features.setflags(write=False)
+    
+    text = str(document)
+    return QueryPlan(text, query_fingerprint(text), tuple(sorted(paths)), depth, features)
+
+
+def opaque_plan(query: str, error: Optional[str] = None) -> QueryPlan:
+    """A plan for text that is not GraphQL: keyed by the raw text, with no structure."""
+    features = np.zeros(FEATURE_SIZE, dtype=np.float32)
+    features.setflags(write=False)
+    return QueryPlan(query, query_fingerprint(query), (), 0, features, error)
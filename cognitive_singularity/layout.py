@@ -0,0 +1,84 @@
+"""
+Flat tensor layout for the cognitive singularity.
+
+ComponentLayout is the precomputed offset/shape table that maps each
+component onto its slice of the flat tensor (776 states by default). QueryArena holds the
+reusable buffers that let the single-query hot path run without allocating.
+"""
+
+import math
+from typing import Dict, Iterator, NamedTuple, Tuple
+
+import numpy as np
+
+# Encoding draws are made this many values at a time, bounding the arena's scratch
+SCRATCH_SIZE = 1 << 16
+
+
+class LayoutEntry(NamedTuple):
+    """One component's position in the flat tensor."""
+    name: str
+    shape: Tuple[int, ...]
+    offset: int
+    size: int
+    
+    @property
+    def slice(self) -> slice:
+        return slice(self.offset, self.offset + self.size)
+
+
+class ComponentLayout:
+    """
+    Offset/shape table for a set of component tensors laid end to end.
+    Computed once so the hot path never recomputes sizes or offsets.
+    """
+    
+    def __init__(self, components: Dict[str, Tuple[int, ...]]):
+        """Lay the components out in dict order."""
+        entries = []
+        offset = 0
+        for name, shape in components.items():
+            shape = tuple(int(dim) for dim in shape)
+            size = math.prod(shape)
+            entries.append(LayoutEntry(name, shape, offset, size))
+            offset += size
+        
+        self.entries: Tuple[LayoutEntry, ...] = tuple(entries)
+        self.names: Tuple[str, ...] = tuple(entry.name for entry in entries)
+        self.total = offset
+        self.max_size = max((entry.size for entry in entries), default=0)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __iter__(self) -> Iterator[LayoutEntry]:
+        return iter(self.entries)
+    
+    def __getitem__(self, name: str) -> LayoutEntry:
+        return self.entries[self.names.index(name)]
+    
+    def views(self, flat: np.ndarray) -> Dict[str, np.ndarray]:
+        """Component-shaped views into a flat tensor (no copies)."""
+        return {entry.name: flat[entry.slice].reshape(entry.shape) for entry in self.entries}
+
+
+class QueryArena:
+    """
+    Reusable buffers for processing one query at a time.
+    
+    The query tensor and the activation outputs share one layout; every
+    component gets fixed flat views into both, plus a 0-d view of its state
+    cell so sums can be written with out=. Arenas are not thread-safe, so
+    CognitiveSingularity keeps one per thread.
+    """
+    
+    def __init__(self, layout: ComponentLayout):
+        self.query = np.empty(layout.total, dtype=np.float32)
+        self.activations = np.empty(layout.total, dtype=np.float32)
+        self.states = np.empty(len(layout), dtype=np.float32)
+        # Generator output is float64; it is cast into the float32 slices
+        self.scratch = np.empty(min(layout.max_size, SCRATCH_SIZE), dtype=np.float64)
+        
+        self.inputs = tuple(self.query[entry.slice] for entry in layout)
+        self.outputs = tuple(self.activations[entry.slice] for entry in layout)
+        self.cells = tuple(self.states[column, ...] for column in range(len(layout)))
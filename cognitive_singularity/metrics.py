@@ -0,0 +1,138 @@
+"""
+Opt-in instrumentation for the cognitive pipeline.
+
+Metrics collects per-stage monotonic timings, counters and log-bucketed
+latency histograms. A CognitiveSingularity created without a Metrics
+instance skips every timing call, so instrumentation costs nothing unless
+it is switched on.
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Histogram bucket upper bounds: 10 per decade from 100ns to 10s
+BUCKET_BOUNDS = [10 ** (exponent / 10) for exponent in range(-70, 11)]
+
+Exporter = Callable[[Dict[str, Any]], None]
+
+
+class LatencyHistogram:
+    """Fixed log-scale latency histogram with approximate percentiles."""
+    
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+    
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0 <= q <= 100)."""
+        if not self.count:
+            return 0.0
+        
+        rank = q / 100 * self.count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if bucket and seen >= rank:
+                return BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+    
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99)
+        }
+
+
+class Metrics:
+    """
+    Thread-safe registry of stage timings and counters.
+    
+    Stages are timed with lap(), which records the time since a previous
+    clock reading and returns the new reading, so consecutive stages chain
+    without extra clock calls. Exporters receive stats() snapshots, either
+    on demand via export() or automatically every export_interval seconds.
+    """
+    
+    clock = staticmethod(time.perf_counter)
+    
+    def __init__(self, exporters: Optional[List[Exporter]] = None,
+                 export_interval: Optional[float] = None):
+        """
+        Args:
+            exporters: Callables that receive each stats() snapshot
+            export_interval: Seconds between automatic exports (None disables)
+        """
+        self._lock = threading.Lock()
+        self._stages: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, int] = {}
+        self.exporters: List[Exporter] = list(exporters or [])
+        self.export_interval = export_interval
+        self._last_export = self.clock()
+    
+    def lap(self, stage: str, since: float) -> float:
+        """Record the time elapsed since a clock reading; returns the current reading."""
+        now = self.clock()
+        self.observe(stage, now - since)
+        return now
+    
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record one duration for a stage."""
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = LatencyHistogram()
+            histogram.observe(seconds)
+    
+    def increment(self, counter: str, amount: int = 1) -> None:
+        """Add amount to a counter."""
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+        
+        if self.export_interval is not None and self.clock() - self._last_export >= self.export_interval:
+            self.export()
+    
+    def add_exporter(self, exporter: Exporter) -> None:
+        """Register a callable that receives stats() snapshots."""
+        self.exporters.append(exporter)
+    
+    def export(self) -> Dict[str, Any]:
+        """Push a snapshot to every exporter and return it."""
+        self._last_export = self.clock()
+        snapshot = self.stats()
+        for exporter in self.exporters:
+            exporter(snapshot)
+        return snapshot
+    
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of every counter and stage histogram."""
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'stages': {stage: histogram.snapshot() for stage, histogram in self._stages.items()}
+            }
+    
+    def reset(self) -> None:
+        """Forget every recorded timing and counter."""
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
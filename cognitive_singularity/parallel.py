@@ -0,0 +1,320 @@
+"""
+Concurrent execution engines for the cognitive singularity.
+
+ThreadPoolEngine shares one thread-safe CognitiveSingularity between worker
+threads. Each worker runs the vectorised batch path over a chunk of queries;
+NumPy releases the GIL inside its ufunc loops, so chunks overlap their array
+work instead of queueing behind a global lock.
+
+ProcessPoolEngine spreads the same work over worker processes. The tensor
+field and the request/response buffers live in multiprocessing.shared_memory
+as preallocated 776-wide slots; workers encode and activate straight into
+those slots, so only slot indices and query strings cross the process
+boundary and no result objects are pickled back. Given a binary checkpoint,
+every process instead maps the tensor field straight from the file.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .checkpoint import load_tensor_field
+from .core import CognitiveSingularity
+from .layout import ComponentLayout
+from .registry import DEFAULT_FIELD_SEED, ComponentRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadPoolEngine:
+    """
+    Serve cognitive queries from a pool of threads sharing one singularity.
+    Usable as a context manager; the pool is shut down on exit.
+    """
+    
+    def __init__(self, singularity: Optional[CognitiveSingularity] = None,
+                 max_workers: Optional[int] = None, chunk_size: int = 256):
+        """
+        Args:
+            singularity: Shared instance to run queries on (created if omitted)
+            max_workers: Thread count, defaulting to ThreadPoolExecutor's choice
+            chunk_size: Queries handed to one worker per batch call
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        
+        self.singularity = singularity if singularity is not None else CognitiveSingularity()
+        self.chunk_size = chunk_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="cognitive")
+        
+        logger.info(f"🧵 Thread pool engine started with {self._executor._max_workers} workers")
+    
+    def submit(self, query: str) -> "Future[Dict[str, Any]]":
+        """Schedule a single query; the future resolves to its result dict."""
+        return self._executor.submit(self.singularity.process_cognitive_query, query)
+    
+    def process_cognitive_queries(self, queries: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Process queries concurrently in chunks, returning results in input order.
+        Each entry matches CognitiveSingularity.process_cognitive_query exactly.
+        """
+        queries = list(queries)
+        futures = [
+            self._executor.submit(self.singularity.process_cognitive_queries,
+                                  queries[start:start+self.chunk_size])
+            for start in range(0, len(queries), self.chunk_size)
+        ]
+        
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        
+        return results
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._executor.shutdown(wait=wait)
+    
+    def __enter__(self) -> "ThreadPoolEngine":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+
+class SharedSlots:
+    """
+    Preallocated float32 slot buffers in named shared memory.
+    Each buffer is exposed as an ndarray view of shape (capacity, width).
+    """
+    
+    def __init__(self, layout: Dict[str, int], capacity: int,
+                 names: Optional[Dict[str, str]] = None):
+        """
+        Create (or, when names are given, attach to) one block per buffer.
+        
+        Args:
+            layout: Buffer name -> row width in float32 elements
+            capacity: Number of rows (slots) in every buffer
+            names: Existing shared memory block names to attach to
+        """
+        self.capacity = capacity
+        self.owner = names is None
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        
+        for key, width in layout.items():
+            nbytes = max(capacity * width * 4, 1)
+            if self.owner:
+                block = shared_memory.SharedMemory(create=True, size=nbytes)
+            else:
+                block = shared_memory.SharedMemory(name=names[key])
+            self._blocks[key] = block
+            self.arrays[key] = np.ndarray((capacity, width), dtype=np.float32, buffer=block.buf)
+    
+    @property
+    def names(self) -> Dict[str, str]:
+        """Shared memory block names, for attaching from another process."""
+        return {key: block.name for key, block in self._blocks.items()}
+    
+    def close(self) -> None:
+        """Release this process's mappings, unlinking them if we created them."""
+        self.arrays.clear()
+        for block in self._blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+        self._blocks.clear()
+
+
+# Per-process state installed by _init_worker in every pool process
+_worker = None
+
+
+class _WorkerState:
+    """Shared buffers and a private singularity held by one pool process."""
+    
+    def __init__(self, layout: Dict[str, int], capacity: int, names: Dict[str, str],
+                 field_names: Optional[Dict[str, str]], field_path: Optional[str],
+                 encoding_cache_size: int, registry: Optional[ComponentRegistry],
+                 components: Dict[str, tuple]):
+        self.slots = SharedSlots(layout, capacity, names)
+        
+        if field_path is not None:
+            self.field_slots = None
+            self.tensor_field = load_tensor_field(field_path, mmap=True)
+        else:
+            self.field_slots = SharedSlots({'field': layout['requests']}, 1, field_names)
+            self.tensor_field = ComponentLayout(components).views(self.field_slots.arrays['field'][0])
+        
+        # Built-in components read their learned weights from the shared field
+        self.singularity = CognitiveSingularity(
+            encoding_cache_size=encoding_cache_size, registry=registry,
+            tensor_field=self.tensor_field if registry is None else None)
+
+
+def _init_worker(*args) -> None:
+    """Attach the shared buffers once per worker process."""
+    global _worker
+    _worker = _WorkerState(*args)
+
+
+def _worker_process_queries(start: int, queries: Sequence[str]) -> int:
+    """Encode and activate queries into slots start..start+len(queries)."""
+    stop = start + len(queries)
+    arrays = _worker.slots.arrays
+    _worker.singularity.graphql_queries_to_tensor(queries, out=arrays['requests'][start:stop])
+    return _worker_process_slots(start, stop)
+
+
+def _worker_process_slots(start: int, stop: int) -> int:
+    """Activate already-encoded request slots start..stop into the response slots."""
+    arrays = _worker.slots.arrays
+    _worker.singularity.process_tensor_batch(arrays['requests'][start:stop],
+                                             out=arrays['states'][start:stop],
+                                             activations=arrays['responses'][start:stop])
+    return stop - start
+
+
+def _wait_all(futures: List[Future]) -> None:
+    """
+    Wait for every future, then raise the first failure. Raising early would
+    release the slots while other chunks of the window still write into them.
+    """
+    wait(futures)
+    for future in futures:
+        future.result()
+
+
+class ProcessPoolEngine:
+    """
+    Serve cognitive queries from a pool of worker processes over shared memory.
+    
+    The engine owns four shared buffers: the flat tensor field, request slots
+    holding encoded queries, response slots holding activated tensors, and a
+    (capacity, num_components) matrix of processed states. When field_path
+    names a binary checkpoint, the field is memory-mapped from that file in
+    every process instead of living in shared memory. Batches larger than
+    the slot capacity are processed in capacity-sized windows. One engine runs
+    one batch at a time; concurrent callers are serialised by a lock.
+    Usable as a context manager; workers and shared memory are released on exit.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, capacity: int = 4096,
+                 chunk_size: int = 256, field_seed: Optional[int] = DEFAULT_FIELD_SEED,
+                 field_path: Optional[str] = None, encoding_cache_size: int = 1024,
+                 registry: Optional[ComponentRegistry] = None, mp_context: Optional[Any] = None):
+        """
+        Args:
+            max_workers: Worker process count (defaults to os.cpu_count())
+            capacity: Number of 776-wide request/response slots
+            chunk_size: Slots handed to one worker per task
+            field_seed: Seed for the shared tensor field, which supplies the
+                built-in components' learned weights
+            field_path: Binary checkpoint to map instead of generating a field
+            encoding_cache_size: Per-worker encoding cache size
+            registry: Components to run (must be picklable); defaults to the built-ins
+            mp_context: multiprocessing context (defaults to the platform default)
+        """
+        if capacity < 1 or chunk_size < 1:
+            raise ValueError(f"capacity and chunk_size must be positive, got {capacity}, {chunk_size}")
+        
+        self.singularity = CognitiveSingularity(encoding_cache_size=0, registry=registry)
+        self.capacity = capacity
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        
+        width = self.singularity.total_freedom
+        layout = {
+            'requests': width,
+            'responses': width,
+            'states': len(self.singularity.components)
+        }
+        self.slots = SharedSlots(layout, capacity)
+        
+        if field_path is not None:
+            self.field_slots = None
+            self.tensor_field = self.singularity.load_tensor_field(field_path, mmap=True)
+        else:
+            self.field_slots = SharedSlots({'field': width}, 1)
+            self.tensor_field = self.singularity.layout.views(self.field_slots.arrays['field'][0])
+            self.singularity.generate_tensor_field(seed=field_seed, out=self.tensor_field)
+        
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context if mp_context is not None else multiprocessing.get_context(),
+            initializer=_init_worker,
+            initargs=(layout, capacity, self.slots.names,
+                      self.field_slots.names if self.field_slots is not None else None,
+                      field_path, encoding_cache_size, registry, self.singularity.components)
+        )
+        
+        logger.info(f"⚙️ Process pool engine started with {self._executor._max_workers} workers "
+                    f"and {capacity} shared slots")
+    
+    def process_states(self, queries: Iterable[str]) -> np.ndarray:
+        """
+        Process queries across the pool and return their (N, num_components)
+        processed-state matrix, in input order.
+        """
+        queries = list(queries)
+        states = np.empty((len(queries), len(self.singularity.components)), dtype=np.float32)
+        
+        with self._lock:
+            for window in range(0, len(queries), self.capacity):
+                batch = queries[window:window+self.capacity]
+                futures = [
+                    self._executor.submit(_worker_process_queries, start,
+                                          batch[start:start+self.chunk_size])
+                    for start in range(0, len(batch), self.chunk_size)
+                ]
+                _wait_all(futures)
+                states[window:window+len(batch)] = self.slots.arrays['states'][:len(batch)]
+        
+        return states
+    
+    def process_tensor_states(self, matrix: np.ndarray) -> np.ndarray:
+        """Activate an already-encoded (N, 776) batch across the pool."""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        states = np.empty((matrix.shape[0], len(self.singularity.components)), dtype=np.float32)
+        
+        with self._lock:
+            for window in range(0, matrix.shape[0], self.capacity):
+                rows = min(self.capacity, matrix.shape[0] - window)
+                self.slots.arrays['requests'][:rows] = matrix[window:window+rows]
+                futures = [
+                    self._executor.submit(_worker_process_slots, start,
+                                          min(start + self.chunk_size, rows))
+                    for start in range(0, rows, self.chunk_size)
+                ]
+                _wait_all(futures)
+                states[window:window+rows] = self.slots.arrays['states'][:rows]
+        
+        return states
+    
+    def process_cognitive_queries(self, queries: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Process queries across the pool, returning result dicts in input order.
+        Each entry matches CognitiveSingularity.process_cognitive_query exactly.
+        """
+        return self.singularity.results_from_states(self.process_states(queries))
+    
+    def shutdown(self) -> None:
+        """Stop the workers and release the shared memory."""
+        self._executor.shutdown(wait=True)
+        self.tensor_field = {}
+        self.slots.close()
+        if self.field_slots is not None:
+            self.field_slots.close()
+    
+    def __enter__(self) -> "ProcessPoolEngine":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
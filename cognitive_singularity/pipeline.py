@@ -0,0 +1,158 @@
+"""
+Streaming batch pipeline for offline query scoring.
+
+Queries are read lazily from JSONL, grouped into fixed-size chunks, run
+through the vectorised batch path (optionally fanned out to a process pool)
+and written out chunk by chunk, so memory stays constant however many
+queries flow through. Output order always matches input order.
+"""
+
+import json
+import logging
+import os
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .core import CognitiveSingularity
+
+logger = logging.getLogger(__name__)
+
+
+def read_queries(lines: Iterable[str], field: str = 'query') -> Iterator[str]:
+    """
+    Yield query strings from JSONL lines.
+    Each non-blank line is either a JSON string or an object holding the query under field.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        
+        record = json.loads(line)
+        if isinstance(record, str):
+            yield record
+        elif isinstance(record, dict) and isinstance(record.get(field), str):
+            yield record[field]
+        else:
+            raise ValueError(f"Line {number}: expected a JSON string or an object with a {field!r} string")
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield consecutive lists of up to size items."""
+    if size < 1:
+        raise ValueError(f"size must be positive, got {size}")
+    
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def process_stream(queries: Iterable[str], chunk_size: int = 1024, workers: int = 1,
+                   singularity: Optional[CognitiveSingularity] = None) -> Iterator[np.ndarray]:
+    """
+    Yield one (chunk, num_components) processed-state matrix per chunk of queries.
+    With workers > 1 each chunk is spread across a ProcessPoolEngine.
+    """
+    if workers > 1:
+        from .parallel import ProcessPoolEngine
+        
+        per_worker = -(-chunk_size // workers)
+        with ProcessPoolEngine(max_workers=workers, capacity=chunk_size, chunk_size=per_worker) as engine:
+            for chunk in chunked(queries, chunk_size):
+                yield engine.process_states(chunk)
+        return
+    
+    if singularity is None:
+        singularity = CognitiveSingularity()
+    for chunk in chunked(queries, chunk_size):
+        yield singularity.process_tensor_batch(singularity.graphql_queries_to_tensor(chunk))
+
+
+class JsonlResultWriter:
+    """Write one JSON object of per-component processed states per query."""
+    
+    def __init__(self, stream: IO[str], names: Iterable[str]):
+        self.stream = stream
+        self.names = list(names)
+        self.count = 0
+    
+    def write(self, states: np.ndarray) -> None:
+        lines = []
+        for row in states.tolist():
+            record = {'index': self.count, 'processed_states': dict(zip(self.names, row))}
+            lines.append(json.dumps(record))
+            self.count += 1
+        if lines:
+            self.stream.write('\n'.join(lines) + '\n')
+    
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class ColumnarResultWriter:
+    """
+    Write processed states as one raw little-endian float32 file per component
+    plus a manifest.json, appending each chunk's columns as it arrives.
+    Columns can be read back with np.fromfile or np.memmap.
+    """
+    
+    def __init__(self, directory: str, names: Iterable[str]):
+        self.directory = directory
+        self.names = list(names)
+        self.count = 0
+        
+        os.makedirs(directory, exist_ok=True)
+        self._files = [open(os.path.join(directory, f"{name}.f32"), 'wb') for name in self.names]
+    
+    def write(self, states: np.ndarray) -> None:
+        columns = np.asarray(states, dtype='<f4').T
+        for f, column in zip(self._files, columns):
+            f.write(np.ascontiguousarray(column).data)
+        self.count += states.shape[0]
+    
+    def close(self) -> None:
+        for f in self._files:
+            f.close()
+        
+        manifest = {
+            'count': self.count,
+            'dtype': 'float32',
+            'byteorder': 'little',
+            'columns': {name: f"{name}.f32" for name in self.names}
+        }
+        with open(os.path.join(self.directory, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+
+def read_columnar_results(directory: str, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """Load the columns written by ColumnarResultWriter."""
+    with open(os.path.join(directory, 'manifest.json')) as f:
+        manifest = json.load(f)
+    
+    columns = {}
+    for name, filename in manifest['columns'].items():
+        path = os.path.join(directory, filename)
+        if mmap and manifest['count']:
+            columns[name] = np.memmap(path, dtype='<f4', mode='r', shape=(manifest['count'],))
+        else:
+            columns[name] = np.fromfile(path, dtype='<f4', count=manifest['count'])
+    
+    return columns
+
+
+def run_pipeline(lines: Iterable[str], writer: Any, chunk_size: int = 1024,
+                 workers: int = 1, field: str = 'query') -> int:
+    """Stream queries from JSONL lines into writer; returns the number of queries processed."""
+    try:
+        for states in process_stream(read_queries(lines, field), chunk_size, workers):
+            writer.write(states)
+    finally:
+        writer.close()
+    
+    logger.info(f"📤 Streamed {writer.count} cognitive query results")
+    return writer.count
@@ -0,0 +1,337 @@
+"""
+Quantised tensor-field storage.
+
+GGML-style storage types for the learned weights of the tensor field:
+
+    f32    float32, 4 bytes per value (the reference)
+    f16    IEEE half precision, 2 bytes per value
+    q8_0   blocks of 32 int8 quants sharing one float16 scale d, 34 bytes
+           per 32 values (ggml's block_q8_0): x ≈ d * q, d = max|x| / 127
+
+Quantised tensors are never expanded to float32 copies on the hot path.
+Processors call multiply(), which dequantises DEQUANT_CHUNK values at a
+time into a small scratch buffer and scales the activations with it, so a
+field stays in its compact form in memory, in checkpoints and in memory
+maps shared between processes. accuracy_report() measures what each
+storage type costs in accuracy against the float32 path.
+"""
+
+import math
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Values per q8_0 block and the on-disk block layout (scale first, as in ggml)
+QK8_0 = 32
+BLOCK_Q8_0 = np.dtype([('d', '<f2'), ('qs', 'i1', (QK8_0,))])
+
+# Storage types, from the float32 reference to the most compact
+QTYPES = ('f32', 'f16', 'q8_0')
+
+# Values dequantised per step of multiply(); a multiple of QK8_0
+DEQUANT_CHUNK = 1 << 12
+
+
+class QuantizedTensor:
+    """
+    A tensor held in a compact storage type. Subclasses define the storage
+    array and how a flat range of values is dequantised to float32.
+    """
+    
+    __slots__ = ('shape', 'data')
+    
+    qtype = ''
+    
+    def __init__(self, data: np.ndarray, shape: Tuple[int, ...]):
+        self.shape: Tuple[int, ...] = tuple(int(dim) for dim in shape)
+        self.data = data
+    
+    @classmethod
+    def empty(cls, shape: Tuple[int, ...]) -> "QuantizedTensor":
+        """An uninitialised tensor of the given logical shape, filled with store()."""
+        raise NotImplementedError
+    
+    @property
+    def size(self) -> int:
+        return math.prod(self.shape)
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes of storage (the float32 tensor would take 4 * size)."""
+        return self.data.nbytes
+    
+    @property
+    def work_size(self) -> int:
+        """float32 scratch elements multiply() needs to run without allocating."""
+        return min(self.size, DEQUANT_CHUNK)
+    
+    def __len__(self) -> int:
+        return self.shape[0]
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(shape={self.shape}, nbytes={self.nbytes})"
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, QuantizedTensor):
+            return NotImplemented
+        return (self.qtype, self.shape) == (other.qtype, other.shape) and np.array_equal(self.data, other.data)
+    
+    def store(self, start: int, values: np.ndarray) -> None:
+        """Quantise values into flat positions start onwards."""
+        raise NotImplementedError
+    
+    def dequantize(self, start: int, stop: int, out: Optional[np.ndarray] = None,
+                   work: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Flat values [start, stop) as float32: written into out when given,
+        else into (a view of) the scratch buffer work when it is large enough.
+        """
+        raise NotImplementedError
+    
+    def to_float32(self) -> np.ndarray:
+        """The whole tensor as a float32 array (a full-size copy; not for the hot path)."""
+        return self.dequantize(0, self.size).reshape(self.shape)
+    
+    def multiply(self, values: np.ndarray, offset: float = 0.0,
+                 work: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Scale values (..., size) in place by offset + tensor, dequantising
+        DEQUANT_CHUNK values at a time into work (of at least work_size
+        elements; allocated when missing or too small).
+        """
+        size = self.size
+        if work is None or work.size < self.work_size:
+            work = np.empty(self.work_size, dtype=np.float32)
+        
+        for start in range(0, size, DEQUANT_CHUNK):
+            stop = min(start + DEQUANT_CHUNK, size)
+            scale = self.dequantize(start, stop, work=work)
+            if offset:
+                scale += np.float32(offset)
+            if stop - start == size:
+                values *= scale
+            else:
+                values[..., start:stop] *= scale
+        return values
+
+
+class Float16Tensor(QuantizedTensor):
+    """Half-precision storage: the values themselves, rounded to float16."""
+    
+    __slots__ = ()
+    
+    qtype = 'f16'
+    
+    def __init__(self, data: np.ndarray, shape: Optional[Tuple[int, ...]] = None):
+        data = np.asanyarray(data)
+        if data.dtype != np.float16:
+            raise ValueError(f"Float16Tensor needs float16 data, got {data.dtype}")
+        super().__init__(data.reshape(-1), data.shape if shape is None else shape)
+        if self.data.size != self.size:
+            raise ValueError(f"Expected {self.size} values for shape {self.shape}, got {self.data.size}")
+    
+    @classmethod
+    def empty(cls, shape: Tuple[int, ...]) -> "Float16Tensor":
+        return cls(np.empty(shape, dtype=np.float16))
+    
+    def store(self, start: int, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float32).reshape(-1)
+        self.data[start:start + values.size] = values
+    
+    def dequantize(self, start: int, stop: int, out: Optional[np.ndarray] = None,
+                   work: Optional[np.ndarray] = None) -> np.ndarray:
+        if out is None:
+            enough = work is not None and work.size >= stop - start
+            out = work[:stop - start] if enough else np.empty(stop - start, dtype=np.float32)
+        np.copyto(out, self.data[start:stop])
+        return out
+
+
+class BlockQ8Tensor(QuantizedTensor):
+    """
+    Block-wise int8 storage: every QK8_0 consecutive values share one
+    float16 scale; the last block is zero-padded.
+    """
+    
+    __slots__ = ()
+    
+    qtype = 'q8_0'
+    
+    def __init__(self, blocks: np.ndarray, shape: Tuple[int, ...]):
+        super().__init__(np.asanyarray(blocks).reshape(-1), shape)
+        if self.data.dtype != BLOCK_Q8_0:
+            raise ValueError(f"BlockQ8Tensor needs {BLOCK_Q8_0} blocks, got {self.data.dtype}")
+        if self.data.size != -(-self.size // QK8_0):
+            raise ValueError(f"Expected {-(-self.size // QK8_0)} blocks for shape {self.shape}, "
+                             f"got {self.data.size}")
+    
+    @classmethod
+    def empty(cls, shape: Tuple[int, ...]) -> "BlockQ8Tensor":
+        return cls(np.zeros(-(-math.prod(shape) // QK8_0), dtype=BLOCK_Q8_0), shape)
+    
+    def store(self, start: int, values: np.ndarray) -> None:
+        if start % QK8_0:
+            raise ValueError(f"q8_0 values are stored in whole blocks; start {start} is not "
+                             f"a multiple of {QK8_0}")
+        values = np.asarray(values, dtype=np.float32).reshape(-1)
+        if start + values.size != self.size and values.size % QK8_0:
+            raise ValueError(f"Only the last store may end inside a block of {QK8_0} values")
+        
+        padded = np.zeros(-(-values.size // QK8_0) * QK8_0, dtype=np.float32)
+        padded[:values.size] = values
+        padded = padded.reshape(-1, QK8_0)
+        
+        # d = max|x| / 127 rounded to float16; quants use that rounded scale
+        scale = (np.abs(padded).max(axis=1) / np.float32(127)).astype(np.float16)
+        inverse = np.zeros(scale.shape, dtype=np.float32)
+        np.divide(np.float32(1), scale, out=inverse, where=scale != 0, dtype=np.float32)
+        quants = np.clip(np.rint(padded * inverse[:, None]), -127, 127).astype(np.int8)
+        
+        blocks = self.data[start // QK8_0:start // QK8_0 + len(padded)]
+        blocks['d'] = scale
+        blocks['qs'] = quants
+    
+    @property
+    def work_size(self) -> int:
+        # Whole blocks of quants plus their expanded scales
+        return 2 * -(-min(self.size, DEQUANT_CHUNK) // QK8_0) * QK8_0
+    
+    def dequantize(self, start: int, stop: int, out: Optional[np.ndarray] = None,
+                   work: Optional[np.ndarray] = None) -> np.ndarray:
+        first, last = start // QK8_0, -(-stop // QK8_0)
+        blocks = self.data[first:last]
+        count = len(blocks) * QK8_0
+        if work is None or work.size < 2 * count:
+            work = np.empty(2 * count, dtype=np.float32)
+        
+        # Plain copies and a same-shape product: broadcasting or mixed-type
+        # ufuncs would allocate iteration buffers on every call
+        values = work[:count].reshape(-1, QK8_0)
+        scales = work[count:2 * count].reshape(-1, QK8_0)
+        np.copyto(values, blocks['qs'])
+        np.copyto(scales, blocks['d'][:, None])
+        values *= scales
+        
+        values = values.reshape(-1)[start - first * QK8_0:stop - first * QK8_0]
+        if out is None:
+            return values
+        np.copyto(out, values)
+        return out
+
+
+_TENSOR_TYPES = {cls.qtype: cls for cls in (Float16Tensor, BlockQ8Tensor)}
+
+# Storage dtype of each quantised type, for checkpoints
+STORAGE_DTYPES = {'f16': np.dtype('<f2'), 'q8_0': BLOCK_Q8_0}
+
+Tensor = Union[np.ndarray, QuantizedTensor]
+
+
+def _check_qtype(qtype: str) -> None:
+    if qtype not in QTYPES:
+        raise ValueError(f"Unknown storage type {qtype!r}; expected one of {list(QTYPES)}")
+
+
+def quantize(tensor: Any, qtype: str) -> Tensor:
+    """Convert a tensor to the given storage type ('f32' gives a float32 array)."""
+    _check_qtype(qtype)
+    if isinstance(tensor, QuantizedTensor):
+        if tensor.qtype == qtype:
+            return tensor
+        tensor = tensor.to_float32()
+    tensor = np.asarray(tensor, dtype=np.float32)
+    if qtype == 'f32':
+        return tensor
+    
+    quantized = _TENSOR_TYPES[qtype].empty(tensor.shape)
+    quantized.store(0, tensor)
+    return quantized
+
+
+def quantize_field(tensor_field: Mapping[str, Any], qtype: str) -> Dict[str, Tensor]:
+    """Convert every tensor of a field to the given storage type."""
+    return {name: quantize(tensor, qtype) for name, tensor in tensor_field.items()}
+
+
+def empty_tensor(shape: Tuple[int, ...], qtype: str) -> Tensor:
+    """An uninitialised tensor of the given shape and storage type."""
+    _check_qtype(qtype)
+    if qtype == 'f32':
+        return np.empty(shape, dtype=np.float32)
+    return _TENSOR_TYPES[qtype].empty(shape)
+
+
+def as_quantized(weights: Any) -> Optional[QuantizedTensor]:
+    """
+    weights as a QuantizedTensor when they are stored compactly (a
+    QuantizedTensor or a float16 array, wrapped without copying), else None.
+    """
+    if isinstance(weights, QuantizedTensor):
+        return weights
+    if isinstance(weights, np.ndarray) and weights.dtype == np.float16:
+        return Float16Tensor(weights)
+    return None
+
+
+def from_storage(data: np.ndarray, shape: Tuple[int, ...]) -> Tensor:
+    """Wrap a checkpoint payload of a storage dtype as the matching tensor."""
+    if data.dtype == BLOCK_Q8_0:
+        return BlockQ8Tensor(data, shape)
+    if data.dtype == np.float16:
+        return Float16Tensor(data.reshape(shape))
+    return data.reshape(shape)
+
+
+def storage_nbytes(shape: Iterable[int], qtype: str) -> int:
+    """Bytes a tensor of the given shape takes in a storage type."""
+    _check_qtype(qtype)
+    size = math.prod(shape)
+    if qtype == 'q8_0':
+        return -(-size // QK8_0) * BLOCK_Q8_0.itemsize
+    return size * (4 if qtype == 'f32' else 2)
+
+
+def field_nbytes(tensor_field: Mapping[str, Tensor]) -> int:
+    """Bytes of storage held by a tensor field."""
+    return sum(tensor.nbytes for tensor in tensor_field.values())
+
+
+def accuracy_report(queries: Sequence[str], shapes: Any = None, qtypes: Iterable[str] = ('f16', 'q8_0'),
+                    seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    Compare quantised fields against the float32 path on the given queries.
+    
+    For each storage type, returns the field's bytes and compression ratio,
+    the largest weight error, and the largest and RMS error of the
+    activations and of the processed states, all measured against the
+    float32 field with the same seed and component shapes.
+    """
+    from .core import CognitiveSingularity
+    from .registry import component_shapes, generate_tensor_field
+    
+    reference_field = generate_tensor_field(component_shapes(shapes), seed=seed)
+    reference = CognitiveSingularity(encoding_cache_size=0, tensor_field=reference_field, shapes=shapes)
+    inputs = reference.graphql_queries_to_tensor(queries)
+    expected = reference.process_tensor_batch(inputs)
+    expected_states = reference.process_cognitive_queries(queries, compact=True).states
+    reference_bytes = field_nbytes(reference_field)
+    
+    report = {}
+    for qtype in ('f32',) + tuple(qtype for qtype in qtypes if qtype != 'f32'):
+        field = quantize_field(reference_field, qtype)
+        singularity = CognitiveSingularity(encoding_cache_size=0, tensor_field=field, shapes=shapes)
+        activations = np.abs(singularity.process_tensor_batch(inputs) - expected)
+        states = np.abs(singularity.process_cognitive_queries(queries, compact=True).states - expected_states)
+        weights = max(float(np.abs(quantize(field[name], 'f32') - tensor).max(initial=0.0))
+                      for name, tensor in reference_field.items())
+        
+        report[qtype] = {
+            'bytes': field_nbytes(field),
+            'compression': reference_bytes / field_nbytes(field),
+            'weight_max_error': weights,
+            'activation_max_error': float(activations.max(initial=0.0)),
+            'activation_rms_error': float(np.sqrt(np.mean(np.square(activations, dtype=np.float64)))),
+            'state_max_error': float(states.max(initial=0.0)),
+            'state_rms_error': float(np.sqrt(np.mean(np.square(states, dtype=np.float64))))
+        }
+    return report
@@ -0,0 +1,388 @@
+"""
+Component registry and compiled execution plans.
+
+A ComponentRegistry maps component names to a tensor shape and a processor
+implementing the ComponentProcessor protocol. compile() freezes the registry
+into an immutable ExecutionPlan holding every offset, shape and activation
+callable, so the hot path runs exactly the plan with no per-query dispatch.
+"""
+
+import functools
+import math
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Mapping, NamedTuple, Optional, Protocol, Tuple, Union
+
+import numpy as np
+
+from .layout import ComponentLayout
+from .quant import QuantizedTensor, Tensor, empty_tensor, quantize_field
+
+# The built-in 776-state component layout
+DEFAULT_COMPONENTS = {
+    'gnn': (7, 7, 7),        # 343 states = 7³
+    'das': (11, 5, 2),       # 110 states = 2 × 5 × 11
+    'esn': (13, 3, 3),       # 117 states = 3² × 13
+    'membrane': (5, 5, 5),   # 125 states = 5³
+    'ecan': (3, 3, 3, 3)     # 81 states = 3⁴
+}
+
+# Named layouts of the five built-in components; 'default' is the 776-state one
+PRESETS: Dict[str, Dict[str, Tuple[int, ...]]] = {
+    'default': DEFAULT_COMPONENTS,
+    'large': {                          # 390,005 states
+        'gnn': (64, 64, 64),            # 262,144-node lattice
+        'das': (11, 50, 20),            # 11,000 concepts
+        'esn': (13, 90, 90),            # 105,300 reservoir units
+        'membrane': (5, 5, 5, 40),      # 40 chain systems
+        'ecan': (9, 9, 9, 9)            # 6,561-node lattice
+    }
+}
+
+# A component shape selection: None (default), a preset name, or {name: shape} overrides
+Shapes = Union[None, str, Mapping[str, Tuple[int, ...]]]
+
+# Average out-degree of built-in reservoirs too large for the default 10% density
+RESERVOIR_DEGREE = 12
+
+# Field values are drawn this many at a time, so no temporary grows with the field
+FIELD_CHUNK = 1 << 16
+
+# Query field names that select each built-in component (matched case-insensitively
+# against every segment of the selected field paths); a component's own name always counts
+DEFAULT_COMPONENT_FIELDS = {
+    'gnn': ('graph', 'neural'),
+    'das': ('atomspace', 'atoms', 'hypergraph'),
+    'esn': ('echo', 'reservoir'),
+    'membrane': ('membranes', 'psystem'),
+    'ecan': ('attention', 'attentionweights')
+}
+
+# Seed of the tensor field that supplies learned weights when none is given
+DEFAULT_FIELD_SEED = 0
+
+Kernel = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+class ComponentProcessor(Protocol):
+    """
+    Activation for one component's slice of the query tensor.
+    
+    activate(block, out) reads block and writes the activated values into out
+    (same shape) and returns out. When batched is True it must also accept
+    (N, size) blocks and treat every row independently; otherwise the plan
+    runs batches row by row.
+    
+    Processors may also define stateful (True when results depend on earlier
+    queries) and version (a value that changes whenever the same input may
+    give a different result); both are optional and read by result caching.
+    """
+    label: str
+    batched: bool
+    
+    def activate(self, block: np.ndarray, out: np.ndarray) -> np.ndarray:
+        ...
+
+
+class ElementwiseProcessor:
+    """A component processor backed by a single (block, out) kernel."""
+    
+    batched = True
+    
+    def __init__(self, label: str, kernel: Kernel):
+        self.label = label
+        self.kernel = kernel
+    
+    def activate(self, block: np.ndarray, out: np.ndarray) -> np.ndarray:
+        return self.kernel(block, out)
+    
+    def __repr__(self) -> str:
+        return f"ElementwiseProcessor({self.label!r}, {self.kernel.__name__})"
+
+
+def tanh_kernel(block: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """GNN activation."""
+    return np.tanh(block, out=out)
+
+
+def sigmoid_kernel(block: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """DAS activation: 1 / (1 + exp(-x)), computed in place."""
+    np.negative(block, out=out)
+    np.exp(out, out=out)
+    np.add(1, out, out=out)
+    return np.divide(1, out, out=out)
+
+
+def echo_kernel(block: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """ESN activation: echo state property (spectral radius < 1)."""
+    return np.multiply(block, 0.95, out=out)
+
+
+def abs_kernel(block: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """P-System activation: rules always produce positive symbols."""
+    return np.abs(block, out=out)
+
+
+def normalise_kernel(block: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """ECAN activation: normalise each row to sum to one; zero-sum rows pass through."""
+    totals = block.sum(axis=-1, keepdims=True)
+    np.divide(block, totals, out=out, where=totals != 0)
+    np.copyto(out, block, where=totals == 0)
+    return out
+
+
+class PlanStep(NamedTuple):
+    """One compiled component: where it lives and how to activate it."""
+    name: str
+    label: str
+    shape: Tuple[int, ...]
+    offset: int
+    size: int
+    processor: ComponentProcessor
+    activate: Kernel
+    activate_batch: Kernel
+    fields: Tuple[str, ...] = ()
+    
+    @property
+    def slice(self) -> slice:
+        return slice(self.offset, self.offset + self.size)
+
+
+def _rowwise(activate: Kernel) -> Kernel:
+    """Run a single-tensor kernel over every row of a batch."""
+    def activate_batch(block: np.ndarray, out: np.ndarray) -> np.ndarray:
+        for row in range(block.shape[0]):
+            activate(block[row], out[row])
+        return out
+    return activate_batch
+
+
+class ExecutionPlan:
+    """
+    Immutable, precompiled component pipeline.
+    steps holds one PlanStep per component in layout order.
+    """
+    
+    __slots__ = ('steps', 'layout', 'components', 'labels')
+    
+    def __init__(self, steps: Tuple[PlanStep, ...], layout: ComponentLayout):
+        object.__setattr__(self, 'steps', steps)
+        object.__setattr__(self, 'layout', layout)
+        object.__setattr__(self, 'components', {step.name: step.shape for step in steps})
+        object.__setattr__(self, 'labels', {step.name: step.label for step in steps})
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("ExecutionPlan is immutable")
+    
+    def __len__(self) -> int:
+        return len(self.steps)
+    
+    def __iter__(self):
+        return iter(self.steps)
+    
+    def __getitem__(self, name: str) -> PlanStep:
+        for step in self.steps:
+            if step.name == name:
+                return step
+        raise KeyError(name)
+    
+    @property
+    def total(self) -> int:
+        return self.layout.total
+    
+    def select(self, names: Iterable[str]) -> Tuple[int, ...]:
+        """Columns of the named components, in plan order."""
+        wanted = set(names)
+        unknown = wanted.difference(self.components)
+        if unknown:
+            raise ValueError(f"Unknown components {sorted(unknown)}; expected some of {list(self.components)}")
+        return tuple(column for column, step in enumerate(self.steps) if step.name in wanted)
+    
+    def infer(self, fields: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Columns of the components named by a query's field paths (see
+        QueryPlan.fields); every column when the query names none.
+        """
+        segments = {segment.lower() for path in fields for segment in path.split('.')}
+        columns = tuple(column for column, step in enumerate(self.steps)
+                        if not segments.isdisjoint(step.fields))
+        return columns or tuple(range(len(self.steps)))
+
+
+class ComponentRegistry:
+    """Ordered, mutable set of components that compiles to an ExecutionPlan."""
+    
+    def __init__(self):
+        self._components: "OrderedDict[str, Tuple[Tuple[int, ...], ComponentProcessor]]" = OrderedDict()
+        self._fields: Dict[str, Tuple[str, ...]] = {}
+    
+    def register(self, name: str, shape: Tuple[int, ...], processor: ComponentProcessor,
+                 replace: bool = False, fields: Iterable[str] = ()) -> "ComponentRegistry":
+        """
+        Add a component (appended to the layout), or swap its implementation
+        in place when replace is True. fields lists extra query field names
+        that select the component when components are inferred from a query
+        (its own name always does). Returns the registry for chaining.
+        """
+        shape = tuple(int(dim) for dim in shape)
+        if not shape or any(dim < 1 for dim in shape):
+            raise ValueError(f"Component {name!r} needs a non-empty positive shape, got {shape}")
+        if name in self._components and not replace:
+            raise ValueError(f"Component {name!r} is already registered")
+        if not callable(getattr(processor, 'activate', None)):
+            raise TypeError(f"Processor for {name!r} must define activate(block, out)")
+        
+        if name not in self._components or fields:
+            self._fields[name] = tuple(dict.fromkeys(field.lower() for field in (name, *fields)))
+        self._components[name] = (shape, processor)
+        return self
+    
+    def unregister(self, name: str) -> "ComponentRegistry":
+        """Remove a component. Returns the registry for chaining."""
+        del self._components[name]
+        del self._fields[name]
+        return self
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._components
+    
+    def __len__(self) -> int:
+        return len(self._components)
+    
+    @property
+    def components(self) -> Dict[str, Tuple[int, ...]]:
+        return {name: shape for name, (shape, _) in self._components.items()}
+    
+    def processor(self, name: str) -> ComponentProcessor:
+        return self._components[name][1]
+    
+    def copy(self) -> "ComponentRegistry":
+        clone = ComponentRegistry()
+        clone._components = OrderedDict(self._components)
+        clone._fields = dict(self._fields)
+        return clone
+    
+    def compile(self) -> ExecutionPlan:
+        """Freeze the registry into an immutable execution plan."""
+        if not self._components:
+            raise ValueError("Cannot compile an empty component registry")
+        
+        layout = ComponentLayout(self.components)
+        steps = []
+        for entry in layout:
+            processor = self._components[entry.name][1]
+            activate = processor.activate
+            batched = getattr(processor, 'batched', False)
+            steps.append(PlanStep(
+                name=entry.name,
+                label=getattr(processor, 'label', entry.name),
+                shape=entry.shape,
+                offset=entry.offset,
+                size=entry.size,
+                processor=processor,
+                activate=activate,
+                activate_batch=activate if batched else _rowwise(activate),
+                fields=self._fields[entry.name]
+            ))
+        
+        return ExecutionPlan(tuple(steps), layout)
+
+
+def generate_tensor_field(components: Dict[str, Tuple[int, ...]], seed: Optional[int] = None,
+                          out: Optional[Dict[str, Tensor]] = None, field_type: str = 'f32') -> Dict[str, Tensor]:
+    """
+    Draw a tensor field of small normal values, one tensor per component.
+    Passing a seed makes the field reproducible; None draws fresh entropy.
+    Values are drawn in FIELD_CHUNK pieces (the same stream as one draw), into
+    the arrays of out when given (e.g. memmaps or shared memory). field_type
+    'f16' or 'q8_0' quantises each chunk as it is drawn (see quant), giving
+    the same tensors as quantising the float32 field without ever holding it.
+    """
+    rng = np.random.default_rng(seed)
+    field = {}
+    for name, shape in components.items():
+        tensor = empty_tensor(shape, field_type) if out is None else out[name]
+        if field_type == 'f32':
+            flat = tensor.reshape(-1)
+            for start in range(0, flat.size, FIELD_CHUNK):
+                stop = min(start + FIELD_CHUNK, flat.size)
+                flat[start:stop] = rng.normal(0, 0.01, stop - start)
+        else:
+            for start in range(0, tensor.size, FIELD_CHUNK):
+                stop = min(start + FIELD_CHUNK, tensor.size)
+                tensor.store(start, rng.normal(0, 0.01, stop - start))
+        field[name] = tensor
+    return field
+
+
+@functools.lru_cache(maxsize=8)
+def _default_field(components: Tuple[Tuple[str, Tuple[int, ...]], ...], field_type: str) -> Dict[str, Tensor]:
+    """
+    The DEFAULT_FIELD_SEED field for a layout, drawn once per process and
+    shared, read-only (the processors copy or only read their weights).
+    """
+    field = generate_tensor_field(dict(components), seed=DEFAULT_FIELD_SEED, field_type=field_type)
+    for tensor in field.values():
+        storage = tensor.data if isinstance(tensor, QuantizedTensor) else tensor
+        storage.flags.writeable = False
+    return field
+
+
+def component_shapes(shapes: Shapes = None) -> Dict[str, Tuple[int, ...]]:
+    """
+    Resolve shapes for the five built-in components: None for the default
+    layout, a PRESETS name, or {name: shape} overriding some default shapes.
+    """
+    if isinstance(shapes, str):
+        if shapes not in PRESETS:
+            raise ValueError(f"Unknown preset {shapes!r}; expected one of {sorted(PRESETS)}")
+        shapes = PRESETS[shapes]
+    
+    resolved = dict(DEFAULT_COMPONENTS)
+    for name, shape in (shapes or {}).items():
+        if name not in resolved:
+            raise ValueError(f"Unknown component {name!r}; expected one of {list(resolved)}")
+        shape = tuple(int(dim) for dim in shape)
+        if not shape or min(shape) < 1:
+            raise ValueError(f"Component {name!r} needs a non-empty shape of positive sizes, got {shape}")
+        resolved[name] = shape
+    return resolved
+
+
+def default_registry(tensor_field: Optional[Dict[str, Tensor]] = None,
+                     stateful_esn: bool = False, shapes: Shapes = None,
+                     field_type: str = 'f32') -> ComponentRegistry:
+    """
+    A fresh registry holding the five built-in components, 776 states in
+    the default layout or sized by shapes (see component_shapes).
+    Learned weights come from tensor_field, or from the field generated
+    with DEFAULT_FIELD_SEED when none is given; a field_type other than
+    'f32' stores them quantised (a given float32 field is converted).
+    With stateful_esn the ESN reservoir keeps its state between queries,
+    so results depend on order.
+    """
+    from .das import HypergraphProcessor
+    from .ecan import AttentionProcessor
+    from .esn import EchoStateReservoir
+    from .gnn import GraphNeuralNetwork
+    from .membrane import MembraneProcessor
+    
+    components = component_shapes(shapes)
+    if tensor_field is None:
+        tensor_field = _default_field(tuple(components.items()), field_type)
+    elif field_type != 'f32':
+        tensor_field = quantize_field(tensor_field, field_type)
+    units = math.prod(components['esn'])
+    
+    processors = {
+        'gnn': GraphNeuralNetwork.lattice(components['gnn'], weights=tensor_field['gnn']),
+        'das': HypergraphProcessor.with_concepts(math.prod(components['das'])),
+        'esn': EchoStateReservoir.random(units, weights=tensor_field['esn'],
+                                         density=min(0.1, RESERVOIR_DEGREE / units), stateful=stateful_esn),
+        'membrane': MembraneProcessor.for_shape(components['membrane']),
+        'ecan': AttentionProcessor.lattice(components['ecan'])
+    }
+    
+    registry = ComponentRegistry()
+    for name, shape in components.items():
+        registry.register(name, shape, processors[name], fields=DEFAULT_COMPONENT_FIELDS[name])
+    return registry
@@ -0,0 +1,219 @@
+"""
+Compact query results for high-volume callers.
+
+The default result of a query is a dict of per-component dicts, each holding
+a shape tuple, a Python float and a label; at millions of results those
+objects cost far more than the math. The compact forms share one
+ResultSchema (names, shapes, labels) and keep only float32 states:
+
+    QueryResult   one query: a __slots__ object over a (components,) array
+    ResultBatch   many queries: one (N, components) float32 matrix
+
+Both are read-only mappings/sequences that build the familiar dicts lazily,
+on access, so result['ecan']['processed_states'] and == against the dict
+form keep working. ResultBatch.records views the matrix as a structured
+record array, and batches serialise without copying the matrix.
+
+Serialised layout (integers little-endian):
+
+    magic        4 bytes   b"CSRB"
+    version      uint32
+    rows         uint64
+    header_len   uint32, header (utf-8 JSON: names, shapes, labels)
+    padding      to a multiple of 8 bytes
+    states       rows x components little-endian float32, row-major
+"""
+
+import json
+import struct
+from collections.abc import Mapping, Sequence
+from typing import IO, Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+MAGIC = b"CSRB"
+VERSION = 1
+
+_PREAMBLE = struct.Struct('<4sIQI')
+_STATE_DTYPE = np.dtype('<f4')
+
+
+class ResultSchema:
+    """Names, shapes and labels of the components in a result, shared by every row."""
+    
+    __slots__ = ('names', 'shapes', 'labels', 'index', 'dtype')
+    
+    def __init__(self, names: Iterable[str], shapes: Iterable[Tuple[int, ...]], labels: Iterable[str]):
+        self.names: Tuple[str, ...] = tuple(names)
+        self.shapes: Tuple[Tuple[int, ...], ...] = tuple(tuple(int(dim) for dim in shape) for shape in shapes)
+        self.labels: Tuple[str, ...] = tuple(labels)
+        if not len(self.names) == len(self.shapes) == len(self.labels):
+            raise ValueError("names, shapes and labels must have the same length")
+        self.index: Dict[str, int] = {name: column for column, name in enumerate(self.names)}
+        # One float32 field per component, matching a row of the state matrix
+        self.dtype = np.dtype([(name, _STATE_DTYPE) for name in self.names])
+    
+    @classmethod
+    def from_steps(cls, steps: Iterable[Any]) -> "ResultSchema":
+        """Schema of the given execution-plan steps."""
+        steps = list(steps)
+        return cls([step.name for step in steps], [step.shape for step in steps],
+                   [step.label for step in steps])
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ResultSchema):
+            return NotImplemented
+        return (self.names, self.shapes, self.labels) == (other.names, other.shapes, other.labels)
+    
+    def __repr__(self) -> str:
+        return f"ResultSchema({list(self.names)})"
+    
+    def header(self) -> bytes:
+        return json.dumps({'names': self.names, 'shapes': self.shapes, 'labels': self.labels}).encode('utf-8')
+    
+    @classmethod
+    def from_header(cls, header: bytes) -> "ResultSchema":
+        fields = json.loads(header.decode('utf-8'))
+        return cls(fields['names'], fields['shapes'], fields['labels'])
+    
+    def entry(self, column: int, value: float) -> Dict[str, Any]:
+        """The dict form of one component's result."""
+        return {
+            'shape': self.shapes[column],
+            'processed_states': value,
+            'component': self.labels[column]
+        }
+
+
+class QueryResult(Mapping):
+    """
+    Compact result of one query: a read-only mapping from component name to
+    its result dict, built on access from a float32 state per component.
+    """
+    
+    __slots__ = ('schema', 'states')
+    
+    def __init__(self, schema: ResultSchema, states: np.ndarray):
+        self.schema = schema
+        self.states = states
+    
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        column = self.schema.index[name]
+        return self.schema.entry(column, float(self.states[column]))
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.schema.names)
+    
+    def __len__(self) -> int:
+        return len(self.schema.names)
+    
+    def __contains__(self, name) -> bool:
+        return name in self.schema.index
+    
+    def state(self, name: str) -> float:
+        """A component's processed state, without building its dict."""
+        return float(self.states[self.schema.index[name]])
+    
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """The full dict form."""
+        schema = self.schema
+        return {name: schema.entry(column, value)
+                for column, (name, value) in enumerate(zip(schema.names, self.states.tolist()))}
+    
+    def __repr__(self) -> str:
+        states = ", ".join(f"{name}={value:.6g}" for name, value in zip(self.schema.names, self.states.tolist()))
+        return f"QueryResult({states})"
+
+
+class ResultBatch(Sequence):
+    """
+    Compact results of many queries: an (N, components) float32 state matrix
+    and its schema. Indexing returns QueryResult views of single rows.
+    """
+    
+    __slots__ = ('schema', 'states')
+    
+    def __init__(self, schema: ResultSchema, states: np.ndarray):
+        states = np.asarray(states)
+        if states.ndim != 2 or states.shape[1] != len(schema):
+            raise ValueError(f"Expected an (N, {len(schema)}) state matrix, got shape {states.shape}")
+        self.schema = schema
+        self.states = states
+    
+    def __len__(self) -> int:
+        return self.states.shape[0]
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[QueryResult, "ResultBatch"]:
+        if isinstance(index, slice):
+            return ResultBatch(self.schema, self.states[index])
+        return QueryResult(self.schema, self.states[index])
+    
+    def __iter__(self) -> Iterator[QueryResult]:
+        schema = self.schema
+        for row in self.states:
+            yield QueryResult(schema, row)
+    
+    def __repr__(self) -> str:
+        return f"ResultBatch({len(self)} rows, {list(self.schema.names)})"
+    
+    def column(self, name: str) -> np.ndarray:
+        """Every row's processed state for one component (a view)."""
+        return self.states[:, self.schema.index[name]]
+    
+    @property
+    def records(self) -> np.ndarray:
+        """The states as a structured record array with one field per component (a view when possible)."""
+        states = np.ascontiguousarray(self.states, dtype=_STATE_DTYPE)
+        return states.view(self.schema.dtype).reshape(len(self))
+    
+    def to_dicts(self) -> List[Dict[str, Dict[str, Any]]]:
+        """The full dict form of every row."""
+        schema = self.schema
+        names = schema.names
+        return [{name: schema.entry(column, value) for column, (name, value) in enumerate(zip(names, row))}
+                for row in self.states.tolist()]
+    
+    def to_frames(self) -> Tuple[bytes, memoryview]:
+        """
+        The serialised batch as (header, payload). The payload is a view of
+        the state matrix itself whenever it is already little-endian float32
+        and contiguous, so writing both frames never copies the states.
+        """
+        header = self.schema.header()
+        preamble = _PREAMBLE.pack(MAGIC, VERSION, len(self), len(header)) + header
+        preamble += b"\0" * (-len(preamble) % 8)
+        states = np.ascontiguousarray(self.states, dtype=_STATE_DTYPE)
+        return preamble, memoryview(states).cast('B')
+    
+    def write(self, file: IO[bytes]) -> int:
+        """Write the serialised batch to a binary file; returns the bytes written."""
+        header, payload = self.to_frames()
+        file.write(header)
+        file.write(payload)
+        return len(header) + payload.nbytes
+    
+    def to_bytes(self) -> bytes:
+        """The serialised batch as one bytes object (joining the frames copies once)."""
+        return b"".join(self.to_frames())
+    
+    @classmethod
+    def from_buffer(cls, buffer) -> "ResultBatch":
+        """Read a serialised batch; the states are a zero-copy view of buffer."""
+        view = memoryview(buffer)
+        if view.nbytes < _PREAMBLE.size:
+            raise ValueError("Buffer is too short for a result batch")
+        magic, version, rows, header_len = _PREAMBLE.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"Not a result batch (magic {bytes(magic)!r})")
+        if version != VERSION:
+            raise ValueError(f"Unsupported result batch version {version}")
+        
+        start = _PREAMBLE.size
+        schema = ResultSchema.from_header(bytes(view[start:start + header_len]))
+        offset = start + header_len
+        offset += -offset % 8
+        states = np.frombuffer(view, dtype=_STATE_DTYPE, count=rows * len(schema), offset=offset)
+        return cls(schema, states.reshape(rows, len(schema)))
@@ -0,0 +1,295 @@
+"""
+Minimal NumPy-only CSR sparse matrices.
+
+The component engines (GNN message passing, ESN reservoirs, ECAN spreading)
+need sparse-dense products over graphs far larger than their 776-state
+slices. CSRMatrix implements exactly that with vectorised gathers over
+padded per-slot index arrays, so no Python loop ever runs over edges and no
+SciPy dependency is needed. The padded tables are stored in row blocks of
+at most BLOCK_ENTRIES entries, so the scratch a product needs stays bounded
+however large the matrix grows. When row degrees are too uneven to pad every
+row to the widest one (hubs in a power-law or star graph), rows are grouped
+by degree instead, so the tables stay O(nnz + rows).
+"""
+
+import functools
+import math
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+# Upper bound on padded (slots × rows) entries per row block; matrices within
+# it keep a single block, so small products are unchanged
+BLOCK_ENTRIES = 1 << 18
+
+# A row block: output rows (a slice or row ids), then (slots, rows) column indices and weights
+RowBlock = Tuple[Union[slice, np.ndarray], np.ndarray, np.ndarray]
+
+
+class CSRMatrix:
+    """
+    Compressed sparse row matrix with batched dense products.
+    matmul accepts a vector or an (N, cols) batch and treats each row independently.
+    """
+    
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray,
+                 shape: Tuple[int, int]):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data)
+        self.shape = (int(shape[0]), int(shape[1]))
+        
+        if self.indptr.shape != (self.shape[0] + 1,) or self.indices.shape != self.data.shape:
+            raise ValueError("Inconsistent CSR arrays")
+        if len(self.indices) and (self.indices.min() < 0 or self.indices.max() >= self.shape[1]):
+            raise ValueError(f"Column indices out of range for shape {self.shape}")
+        
+        # Segment starts for np.add.reduceat over the stored entries
+        counts = np.diff(self.indptr)
+        self._nonempty = np.flatnonzero(counts)
+        self._starts = self.indptr[:-1][self._nonempty]
+        self._blocks = self._row_blocks(counts)
+        self._derived: Dict[str, CSRMatrix] = {}
+    
+    def __getstate__(self):
+        # Derived matrices are recomputed, not pickled
+        state = self.__dict__.copy()
+        state['_derived'] = {}
+        return state
+    
+    def read_only(self) -> "CSRMatrix":
+        """
+        Mark the CSR arrays read-only (for matrices shared between owners);
+        returns self. The private slot tables stay writeable because np.take
+        copies read-only index arrays on every call.
+        """
+        for array in (self.indptr, self.indices, self.data):
+            array.flags.writeable = False
+        return self
+    
+    def _derive(self, key: str, build: Callable[[], "CSRMatrix"]) -> "CSRMatrix":
+        """build(), computed once and shared read-only when this matrix is read-only."""
+        if self.data.flags.writeable:
+            return build()
+        derived = self._derived.get(key)
+        if derived is None:
+            derived = self._derived[key] = build().read_only()
+        return derived
+    
+    def _row_blocks(self, counts: np.ndarray) -> Tuple[RowBlock, ...]:
+        """
+        (rows, indices, weights) per row block. rows is a slice of consecutive
+        rows padded to the widest row overall or, when that padding would exceed
+        twice nnz + rows, an array of row ids whose degrees are within a factor
+        of two of each other, padded to the widest row in the block.
+        """
+        n = self.shape[0]
+        width = max(int(counts.max()) if n else 0, 1)
+        if n * width <= 2 * (self.nnz + n):
+            block = max(1, BLOCK_ENTRIES // width)
+            return tuple((rows,) + self._ellpack_slots(counts, rows, width)
+                         for rows in (slice(start, min(start + block, n)) for start in range(0, n, block)))
+        
+        order = np.argsort(counts, kind='stable')
+        degrees = counts[order]
+        blocks = []
+        start = 0
+        while start < n:
+            stop = int(np.searchsorted(degrees, 2 * max(int(degrees[start]), 1), side='right'))
+            stop = min(stop, start + max(1, BLOCK_ENTRIES // max(int(degrees[stop - 1]), 1)))
+            rows = order[start:stop]
+            blocks.append((rows,) + self._ellpack_slots(counts, rows, max(int(degrees[stop - 1]), 1)))
+            start = stop
+        return tuple(blocks)
+    
+    def _ellpack_slots(self, counts: np.ndarray, rows: Union[slice, np.ndarray],
+                       width: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (slots, rows) column indices and weights of the given rows, padded to
+        width. Rows shorter than a slot read column 0 with weight zero.
+        """
+        slot = np.arange(width)[:, None]
+        present = slot < counts[rows]
+        positions = np.where(present, self.indptr[:-1][rows] + slot, 0)
+        
+        indices = np.zeros(present.shape, dtype=np.int64)
+        weights = np.zeros(present.shape, dtype=self.data.dtype)
+        indices[present] = self.indices[positions[present]]
+        weights[present] = self.data[positions[present]]
+        return indices, weights
+    
+    @classmethod
+    def from_edges(cls, rows: np.ndarray, cols: np.ndarray, weights: Optional[np.ndarray] = None,
+                   shape: Optional[Tuple[int, int]] = None, dtype=np.float32) -> "CSRMatrix":
+        """Build from an edge list (COO triples); duplicate edges are summed."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        weights = np.ones(len(rows), dtype=dtype) if weights is None else np.asarray(weights, dtype=dtype)
+        if shape is None:
+            shape = (int(rows.max()) + 1 if len(rows) else 0, int(cols.max()) + 1 if len(cols) else 0)
+        
+        if shape[0] * shape[1] < 2 ** 63:
+            # One stable sort on a combined key orders exactly like lexsort((cols, rows)), faster
+            order = np.argsort(rows * shape[1] + cols, kind='stable')
+        else:
+            order = np.lexsort((cols, rows))
+        rows, cols, weights = rows[order], cols[order], weights[order]
+        
+        # Sum duplicate (row, col) pairs
+        if len(rows):
+            unique = np.empty(len(rows), dtype=bool)
+            unique[0] = True
+            unique[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+            groups = np.flatnonzero(unique)
+            weights = np.add.reduceat(weights, groups)
+            rows, cols = rows[groups], cols[groups]
+        
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(indptr, cols, weights.astype(dtype, copy=False), shape)
+    
+    @classmethod
+    def random(cls, n: int, density: float, rng: np.random.Generator,
+               dtype=np.float32) -> "CSRMatrix":
+        """An n x n matrix with roughly density * n² normally distributed entries."""
+        nnz = int(round(density * n * n))
+        rows = rng.integers(0, n, nnz)
+        cols = rng.integers(0, n, nnz)
+        return cls.from_edges(rows, cols, rng.standard_normal(nnz), (n, n), dtype)
+    
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+    
+    def row_ids(self) -> np.ndarray:
+        """Row index of every stored entry."""
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+    
+    def degrees(self) -> np.ndarray:
+        """Number of stored entries per row."""
+        return np.diff(self.indptr)
+    
+    def scaled(self, factor: float) -> "CSRMatrix":
+        return CSRMatrix(self.indptr, self.indices, self.data * self.data.dtype.type(factor), self.shape)
+    
+    def row_normalised(self) -> "CSRMatrix":
+        """
+        Divide each row by its sum of weights (mean aggregation); empty rows stay empty.
+        A read-only matrix returns one shared, read-only result.
+        """
+        return self._derive('row_normalised', self._row_normalised)
+    
+    def _row_normalised(self) -> "CSRMatrix":
+        sums = np.add.reduceat(self.data, self._starts) if self.nnz else np.empty(0, self.data.dtype)
+        row_sums = np.ones(self.shape[0], dtype=self.data.dtype)
+        row_sums[self._nonempty] = np.where(sums != 0, sums, 1)
+        return CSRMatrix(self.indptr, self.indices, self.data / row_sums[self.row_ids()], self.shape)
+    
+    def transpose(self) -> "CSRMatrix":
+        return self._derive('transpose', self._transpose)
+    
+    def _transpose(self) -> "CSRMatrix":
+        return CSRMatrix.from_edges(self.indices, self.row_ids(), self.data,
+                                    (self.shape[1], self.shape[0]), self.data.dtype)
+    
+    @property
+    def work_size(self) -> int:
+        """Scratch elements matmul needs per vector (padded slots × rows of the largest block)."""
+        return max((indices.size for _, indices, _ in self._blocks), default=0)
+    
+    def matmul(self, x: np.ndarray, out: Optional[np.ndarray] = None,
+               work: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Sparse-dense product over the last axis: y[..., i] = sum_j A[i, j] x[..., j].
+        Works for a single vector or an (N, cols) batch in one vectorised pass.
+        work is an optional scratch buffer of at least work_size elements per vector.
+        
+        Entries are gathered ELLPACK style into (..., slots, rows), the k-th
+        stored entry of every row in slot k, and summed over the slot axis,
+        one row block at a time. That reduction runs over a non-contiguous
+        axis, so NumPy adds each row's entries left to right for vectors and
+        batches alike (and for any blocking) and all agree bit for bit.
+        """
+        rows = self.shape[0]
+        dtype = np.result_type(x.dtype, self.data.dtype)
+        if out is None:
+            out = np.empty(x.shape[:-1] + (rows,), dtype=dtype)
+        flat = work.reshape(-1) if work is not None and work.dtype == x.dtype else None
+        
+        blocks = self._blocks
+        for target, indices, weights in blocks:
+            shape = x.shape[:-1] + indices.shape
+            size = math.prod(shape)
+            buffer = flat[:size].reshape(shape) if flat is not None and flat.size >= size else None
+            
+            # Indices are validated at construction; mode='clip' lets take() write
+            # straight into the buffer instead of through a temporary
+            gathered = np.take(x, indices, axis=-1, out=buffer, mode='clip')
+            if gathered.dtype != dtype:
+                gathered = gathered.astype(dtype)
+            gathered *= weights
+            if isinstance(target, slice):
+                np.sum(gathered, axis=-2, out=out if len(blocks) == 1 else out[..., target])
+            else:
+                out[..., target] = np.sum(gathered, axis=-2)
+        return out
+    
+    __matmul__ = matmul
+    
+    def to_dense(self) -> np.ndarray:
+        dense = np.zeros(self.shape, dtype=self.data.dtype)
+        np.add.at(dense, (self.row_ids(), self.indices), self.data)
+        return dense
+    
+    def spectral_radius(self, iterations: int = 100, seed: int = 0) -> float:
+        """Estimate the largest absolute eigenvalue by power iteration."""
+        if not self.nnz:
+            return 0.0
+        
+        vector = np.random.default_rng(seed).standard_normal(self.shape[1])
+        radius = 0.0
+        for _ in range(iterations):
+            product = self.matmul(vector.astype(self.data.dtype)).astype(np.float64)
+            norm = np.linalg.norm(product)
+            if norm == 0:
+                return 0.0
+            radius = norm / np.linalg.norm(vector)
+            vector = product / norm
+        return float(radius)
+
+
+def lattice_adjacency(shape: Tuple[int, ...], periodic: bool = False,
+                      dtype=np.float32) -> CSRMatrix:
+    """
+    Adjacency of a regular n-D lattice with nearest-neighbour (von Neumann)
+    links, e.g. the 6-neighbourhood of the 7×7×7 GNN lattice. Nodes are
+    numbered in C order, matching a flattened component tensor.
+    Each lattice is built once per process and shared, read-only.
+    """
+    return _lattice_adjacency(tuple(int(length) for length in shape), bool(periodic), np.dtype(dtype))
+
+
+@functools.lru_cache(maxsize=64)
+def _lattice_adjacency(shape: Tuple[int, ...], periodic: bool, dtype: np.dtype) -> CSRMatrix:
+    ids = np.arange(int(np.prod(shape))).reshape(shape)
+    rows, cols = [], []
+    for axis, length in enumerate(shape):
+        if length < 2:
+            continue
+        for step in (1, -1):
+            neighbours = np.roll(ids, -step, axis=axis)
+            if periodic:
+                mask = np.ones(shape, dtype=bool)
+            else:
+                # Drop links that wrapped around the lattice edge
+                index = np.arange(length)
+                valid = (index + step >= 0) & (index + step < length)
+                mask = np.broadcast_to(valid.reshape([-1 if a == axis else 1 for a in range(len(shape))]),
+                                       shape)
+            rows.append(ids[mask])
+            cols.append(neighbours[mask])
+    
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+    size = ids.size
+    return CSRMatrix.from_edges(rows, cols, shape=(size, size), dtype=dtype).read_only()
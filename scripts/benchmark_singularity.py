@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark Cognitive Singularity Script
+Measures the hot paths and fails when they regress against the committed baseline
+"""
+
+import sys
+import argparse
+import json
+from pathlib import Path
+
+# Add the parent directory to the path so we can import cognitive_singularity
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cognitive_singularity.benchmark import (
+    DEFAULT_THRESHOLD, compare_to_baseline, make_report, merge_baseline, run_benchmarks
+)
+
+BASELINE_PATH = Path(__file__).parent / "benchmark_baseline.json"
+
+
+def benchmark_cognitive_singularity(output: str = None, baseline: str = str(BASELINE_PATH),
+                                    threshold: float = DEFAULT_THRESHOLD, quick: bool = False,
+                                    include_processes: bool = True, only: list = None,
+                                    update_baseline: bool = False, ignore_environment: bool = False) -> bool:
+    """
+    Run the benchmark suite and compare it against a baseline.
+    
+    Returns:
+        True when no benchmark regressed beyond the threshold
+    """
+    print("⏱️ Benchmarking Cognitive Singularity...")
+    report = make_report(run_benchmarks(quick, include_processes, only))
+    
+    for name, result in report['results'].items():
+        print(f"{name:36s} {result['throughput']:>12.0f} items/s   "
+              f"p50 {result['p50'] * 1e6:>10.1f}µs   p99 {result['p99'] * 1e6:>10.1f}µs")
+    
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Results saved to: {output}")
+    
+    if update_baseline:
+        # Only the cases that ran are refreshed; select them with --only
+        previous = None
+        if Path(baseline).exists():
+            with open(baseline) as f:
+                previous = json.load(f)
+        try:
+            merged = merge_baseline(report, previous, ignore_environment)
+        except ValueError as e:
+            print(f"❌ {e}; rerun every case here or pass --ignore-environment")
+            return False
+        with open(baseline, 'w') as f:
+            json.dump(merged, f, indent=2)
+        print(f"📌 Baseline updated: {baseline}")
+        return True
+    
+    if not Path(baseline).exists():
+        print(f"⚠️ No baseline at {baseline}; skipping regression check")
+        return True
+    
+    with open(baseline) as f:
+        recorded = json.load(f)
+    try:
+        regressions = compare_to_baseline(report, recorded, threshold, ignore_environment)
+    except ValueError as e:
+        print(f"❌ {e}; re-record the baseline on this machine or pass --ignore-environment")
+        return False
+    
+    for regression in regressions:
+        print(f"❌ {regression.name}: {regression.baseline * 1e6:.1f}µs → "
+              f"{regression.current * 1e6:.1f}µs per item ({regression.ratio:.2f}x)")
+    
+    if not regressions:
+        print(f"✅ No regressions beyond {threshold:.0%} of the baseline")
+    return not regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Cognitive Singularity")
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed per-item slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--quick", action="store_true", help="Run a short smoke benchmark")
+    parser.add_argument("--no-processes", dest="include_processes", action="store_false",
+                        help="Skip the process pool benchmarks")
+    parser.add_argument("--only", action="append", help="Only run benchmarks with this name prefix")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Refresh the baseline entries of the cases in this run")
+    parser.add_argument("--ignore-environment", action="store_true",
+                        help="Compare or merge even when the baseline was recorded on another machine")
+    
+    args = parser.parse_args()
+    
+    passed = benchmark_cognitive_singularity(args.output, args.baseline, args.threshold, args.quick,
+                                             args.include_processes, args.only, args.update_baseline,
+                                             args.ignore_environment)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
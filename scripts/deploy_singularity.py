@@ -6,6 +6,7 @@ Implements the exact deployment process specified in cognitive-singularity.md
 
 import sys
 import os
+import math
 import argparse
 import subprocess
 import json
@@ -15,20 +16,24 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from cognitive_singularity import CognitiveSingularity
+from cognitive_singularity.registry import PRESETS
 
 
-def deploy_cognitive_singularity(mode: str = "bootstrap", validate: bool = True):
+def deploy_cognitive_singularity(mode: str = "bootstrap", validate: bool = True,
+                                 preset: str = "default"):
     """
     Deploy the cognitive singularity as specified in the YAML workflow.
     
     Args:
         mode: One of 'bootstrap', 'evolve', 'transcend'
         validate: Whether to run validation tests
+        preset: Component shape preset ('default' is the 776-state layout)
     """
     print(f"🧬 Deploying Cognitive Singularity in {mode} mode...")
     
     # Initialize Quantum Cognitive Field (as per YAML spec)
-    singularity = CognitiveSingularity()
+    singularity = CognitiveSingularity(shapes=preset)
+    total = singularity.total_freedom
     
     # Manifest the singularity (this runs the exact code from the YAML)
     singularity.manifest()
@@ -36,15 +41,18 @@ def deploy_cognitive_singularity(mode: str = "bootstrap", validate: bool = True)
     if validate:
         print("\n🧪 Running validation tests...")
         
-        # Verify all 776 states are reachable
-        states = singularity.enumerate_all_states()
-        assert len(states) == 776, f"Expected 776 states, got {len(states)}"
-        print(f"✅ All {len(states)} quantum states are reachable")
+        # Verify all states are reachable
+        states = sum(len(chunk) for chunk in singularity.iter_states())
+        assert states == total, f"Expected {total} states, got {states}"
+        print(f"✅ All {states} quantum states are reachable")
         
         # Verify prime factorization
-        prime_factors = singularity.prime_factorize(776)
-        expected_factors = {2: 3, 97: 1}  # 2³ × 97
-        assert prime_factors == expected_factors, f"Expected {expected_factors}, got {prime_factors}"
+        prime_factors = singularity.prime_factorize(total)
+        product = math.prod(prime ** power for prime, power in prime_factors.items())
+        assert product == total, f"Factors {prime_factors} multiply to {product}, not {total}"
+        if preset == "default":
+            expected_factors = {2: 3, 97: 1}  # 2³ × 97
+            assert prime_factors == expected_factors, f"Expected {expected_factors}, got {prime_factors}"
         print(f"✅ Prime factorization verified: {prime_factors}")
         
         # Test cognitive query processing
@@ -70,7 +78,7 @@ def deploy_cognitive_singularity(mode: str = "bootstrap", validate: bool = True)
         # Validate GGML configuration
         ggml_config = singularity.generate_ggml_config()
         assert ggml_config["frame_problem"] == "SOLVED", "Frame problem not solved!"
-        assert ggml_config["tensor_field"]["shape"] == [776], "Invalid tensor field shape"
+        assert ggml_config["tensor_field"]["shape"] == [total], "Invalid tensor field shape"
         print("✅ GGML configuration validated")
         
         print("\n🎯 All validation tests passed!")
@@ -91,11 +99,13 @@ def main():
                        help="Run validation tests")
     parser.add_argument("--no-validate", dest="validate", action="store_false",
                        help="Skip validation tests")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="default",
+                       help="Component shape preset")
     
     args = parser.parse_args()
     
     try:
-        singularity = deploy_cognitive_singularity(args.mode, args.validate)
+        singularity = deploy_cognitive_singularity(args.mode, args.validate, args.preset)
         sys.exit(0)
     except Exception as e:
         print(f"❌ Deployment failed: {e}")
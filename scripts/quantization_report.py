@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Quantization Report Script
+Compares quantised tensor-field storage (f16, q8_0) against the float32 path
+"""
+
+import sys
+import argparse
+import json
+from pathlib import Path
+
+# Add the parent directory to the path so we can import cognitive_singularity
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cognitive_singularity.benchmark import make_queries
+from cognitive_singularity.quant import QTYPES, accuracy_report
+from cognitive_singularity.registry import PRESETS
+
+
+def report_quantization(preset: str = "default", queries: int = 64, output: str = None) -> dict:
+    """
+    Measure memory and accuracy of every storage type on a batch of queries.
+    
+    Returns:
+        The report: {storage type: {bytes, compression, errors...}}
+    """
+    print(f"🔬 Comparing tensor-field storage on the {preset} preset ({queries} queries)...")
+    report = accuracy_report(make_queries(queries), shapes=preset, qtypes=QTYPES)
+    
+    print(f"{'type':6s} {'bytes':>12s} {'ratio':>7s} {'weight err':>12s} "
+          f"{'act max err':>12s} {'act rms err':>12s} {'state max err':>14s}")
+    for qtype, row in report.items():
+        print(f"{qtype:6s} {row['bytes']:>12d} {row['compression']:>6.2f}x {row['weight_max_error']:>12.3g} "
+              f"{row['activation_max_error']:>12.3g} {row['activation_rms_error']:>12.3g} "
+              f"{row['state_max_error']:>14.3g}")
+    
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report saved to: {output}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare quantised tensor-field storage against float32")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="default",
+                        help="Component shape preset")
+    parser.add_argument("--queries", type=int, default=64, help="Number of queries to compare on")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    
+    args = parser.parse_args()
+    report_quantization(args.preset, args.queries, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Serve Component Script
+Hosts one built-in component on this node for a DistributedSingularity coordinator
+"""
+
+import sys
+import argparse
+import math
+from pathlib import Path
+
+# Add the parent directory to the path so we can import cognitive_singularity
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cognitive_singularity.distributed import MAX_ROWS, ComponentServer
+from cognitive_singularity.quant import QTYPES
+from cognitive_singularity.registry import DEFAULT_COMPONENTS, PRESETS, default_registry
+
+
+def serve(component: str, host: str = "127.0.0.1", port: int = 7760,
+          preset: str = None, field_type: str = "f32", max_rows: int = MAX_ROWS) -> None:
+    """
+    Serve a built-in component until interrupted. preset and field_type must
+    match the coordinator's, so both sides hold the same weights. The server
+    has no authentication: only listen on interfaces trusted coordinators use.
+    """
+    registry = default_registry(shapes=preset, field_type=field_type)
+    width = math.prod(registry.components[component])
+    server = ComponentServer(registry.processor(component), host, port, width, max_rows)
+    print(f"🛰️ Serving {component} on {server.address[0]}:{server.address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host one Cognitive Singularity component for a remote coordinator")
+    parser.add_argument("--component", choices=list(DEFAULT_COMPONENTS), required=True,
+                        help="Component to serve")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Interface to listen on (unauthenticated; e.g. 0.0.0.0 on a trusted network only)")
+    parser.add_argument("--port", type=int, default=7760, help="Port to listen on")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="Component shape preset")
+    parser.add_argument("--field-type", choices=QTYPES, default="f32", help="Weight storage type")
+    parser.add_argument("--max-rows", type=int, default=MAX_ROWS, help="Most rows accepted in one request")
+    
+    args = parser.parse_args()
+    
+    try:
+        serve(args.component, args.host, args.port, args.preset, args.field_type, args.max_rows)
+    except KeyboardInterrupt:
+        sys.exit(0)
+    except Exception as e:
+        print(f"❌ Serving failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Stream Cognitive Singularity Script
+Scores GraphQL queries from JSONL in constant memory for offline batch jobs
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add the parent directory to the path so we can import cognitive_singularity
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.pipeline import ColumnarResultWriter, JsonlResultWriter, run_pipeline
+
+
+def stream_cognitive_singularity(input_path: str = "-", output_path: str = "-",
+                                 output_format: str = "jsonl", chunk_size: int = 1024,
+                                 workers: int = 1, field: str = "query") -> int:
+    """
+    Process every query in a JSONL file (or stdin) and write the results.
+    
+    Args:
+        input_path: JSONL file of queries, or '-' for stdin
+        output_path: JSONL file or '-' for stdout; a directory for columnar output
+        output_format: One of 'jsonl', 'columnar'
+        chunk_size: Queries encoded and processed per chunk
+        workers: Worker processes to fan chunks out to (1 runs in-process)
+        field: Key holding the query when input lines are JSON objects
+    """
+    names = list(CognitiveSingularity().components)
+    
+    source = sys.stdin if input_path == "-" else open(input_path, 'r')
+    try:
+        if output_format == "columnar":
+            if output_path == "-":
+                raise ValueError("columnar output needs a directory, not stdout")
+            writer = ColumnarResultWriter(output_path, names)
+            return run_pipeline(source, writer, chunk_size, workers, field)
+        
+        sink = sys.stdout if output_path == "-" else open(output_path, 'w')
+        try:
+            return run_pipeline(source, JsonlResultWriter(sink, names), chunk_size, workers, field)
+        finally:
+            if sink is not sys.stdout:
+                sink.close()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream GraphQL queries through the Cognitive Singularity")
+    parser.add_argument("--input", default="-", help="JSONL input file ('-' for stdin)")
+    parser.add_argument("--output", default="-",
+                        help="Output file ('-' for stdout), or directory for columnar output")
+    parser.add_argument("--format", choices=["jsonl", "columnar"], default="jsonl",
+                        help="Output format")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="Queries per chunk")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--field", default="query", help="JSON field holding the query")
+    
+    args = parser.parse_args()
+    
+    try:
+        count = stream_cognitive_singularity(args.input, args.output, args.format,
+                                             args.chunk_size, args.workers, args.field)
+        print(f"✅ Processed {count} queries", file=sys.stderr)
+        sys.exit(0)
+    except Exception as e:
+        print(f"❌ Streaming failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Test suite for the asyncio micro-batching front end.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.aio import AsyncCognitiveSingularity
+from cognitive_singularity.core import CognitiveSingularity
+
+
+QUERIES = [f"query Q{i} {{ node(id: {i}) {{ value }} }}" for i in range(40)]
+
+
+class TestAsyncCognitiveSingularity:
+    """Test adaptive micro-batching on the event loop."""
+    
+    def test_concurrent_results_match_single_path(self):
+        """Every awaited result equals the synchronous result for its query."""
+        singularity = CognitiveSingularity()
+        
+        async def run():
+            async with AsyncCognitiveSingularity(singularity, max_batch_size=8) as service:
+                results = await asyncio.gather(*(service.process(q) for q in QUERIES))
+                return results, service.stats()
+        
+        results, stats = asyncio.run(run())
+        
+        assert results == [singularity.process_cognitive_query(q) for q in QUERIES]
+        assert stats['queries'] == len(QUERIES)
+        # Concurrent requests are coalesced, never exceeding the size bound
+        assert len(QUERIES) / 8 <= stats['batches'] < len(QUERIES)
+    
+    def test_idle_request_is_dispatched_after_max_wait(self):
+        """A lone request does not wait for a full batch."""
+        async def run():
+            async with AsyncCognitiveSingularity(max_batch_size=1000, max_wait=0.01) as service:
+                return await asyncio.wait_for(service.process(QUERIES[0]), timeout=5)
+        
+        assert len(asyncio.run(run())) == 5
+    
+    def test_backpressure_bounds_the_queue(self):
+        """Producers wait for room once the queue is full."""
+        async def run():
+            async with AsyncCognitiveSingularity(max_batch_size=2, max_queue_size=2) as service:
+                tasks = [asyncio.ensure_future(service.process(q)) for q in QUERIES]
+                max_pending = 0
+                while not all(task.done() for task in tasks):
+                    max_pending = max(max_pending, service.stats()['pending'])
+                    await asyncio.sleep(0)
+                return max_pending
+        
+        assert asyncio.run(run()) <= 2
+    
+    def test_batch_errors_propagate_to_callers(self):
+        """An exception in the batch path is raised from process()."""
+        class Failing(CognitiveSingularity):
+            def process_cognitive_queries(self, queries):
+                raise RuntimeError("boom")
+        
+        async def run():
+            async with AsyncCognitiveSingularity(Failing()) as service:
+                await service.process(QUERIES[0])
+        
+        with pytest.raises(RuntimeError, match="boom"):
+            asyncio.run(run())
+    
+    def test_bad_query_fails_only_its_caller(self):
+        """A failed batch is rerun query by query, so its other callers still get results."""
+        class Picky(CognitiveSingularity):
+            def process_cognitive_queries(self, queries):
+                if 'bad' in queries:
+                    raise ValueError("bad query")
+                return super().process_cognitive_queries(queries)
+        
+        singularity = Picky()
+        queries = QUERIES[:3] + ['bad'] + QUERIES[3:6]
+        
+        async def run():
+            async with AsyncCognitiveSingularity(singularity, max_batch_size=len(queries),
+                                                 max_wait=0.05) as service:
+                outcomes = await asyncio.gather(*(service.process(q) for q in queries),
+                                                return_exceptions=True)
+                return outcomes, service.stats()
+        
+        outcomes, stats = asyncio.run(run())
+        
+        assert stats['batches'] == 1
+        assert isinstance(outcomes[3], ValueError)
+        good = queries[:3] + queries[4:]
+        assert outcomes[:3] + outcomes[4:] == [singularity.process_cognitive_query(q) for q in good]
+    
+    def test_serves_successive_event_loops(self):
+        """One instance keeps working across asyncio.run() calls, each with its own loop."""
+        singularity = CognitiveSingularity()
+        service = AsyncCognitiveSingularity(singularity)
+        
+        async def run(query):
+            return await asyncio.wait_for(service.process(query), timeout=5)
+        
+        assert asyncio.run(run(QUERIES[0])) == singularity.process_cognitive_query(QUERIES[0])
+        assert asyncio.run(run(QUERIES[1])) == singularity.process_cognitive_query(QUERIES[1])
+        asyncio.run(service.close())
+        assert service.stats()['pending'] == 0
+    
+    def test_close_during_batch_cancels_callers(self):
+        """Requests in the running batch, or still queued, are cancelled by close()."""
+        class Slow(CognitiveSingularity):
+            def process_cognitive_queries(self, queries):
+                time.sleep(0.2)
+                return super().process_cognitive_queries(queries)
+        
+        async def run():
+            service = AsyncCognitiveSingularity(Slow(), max_batch_size=5)
+            tasks = [asyncio.ensure_future(service.process(q)) for q in QUERIES[:10]]
+            await asyncio.sleep(0.05)
+            await service.close()
+            await asyncio.wait(tasks, timeout=2)
+            return [task.cancelled() for task in tasks]
+        
+        assert all(asyncio.run(run()))
+    
+    def test_invalid_bounds(self):
+        """Non-positive bounds are rejected."""
+        with pytest.raises(ValueError):
+            AsyncCognitiveSingularity(max_batch_size=0)
+        with pytest.raises(ValueError):
+            AsyncCognitiveSingularity(max_wait=-1)
@@ -0,0 +1,99 @@
+"""
+Test suite for the benchmark harness (structure and regression logic, not timings).
+"""
+
+import json
+
+import pytest
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.benchmark import (
+    compare_to_baseline, environment, environment_changes, make_queries, make_report, measure,
+    merge_baseline, run_benchmarks
+)
+
+BASELINE = Path(__file__).parent.parent.parent / "scripts" / "benchmark_baseline.json"
+
+
+def report_with(per_item):
+    """A minimal report holding one benchmark per (name, per_item) pair."""
+    return {'results': {name: {'per_item': value} for name, value in per_item.items()}}
+
+
+class TestBenchmarkHarness:
+    """Test measurement, reporting and baseline comparison."""
+    
+    def test_measure_summary(self):
+        """Measurements report latency percentiles and per-item throughput."""
+        result = measure(lambda: None, iterations=10, items=4)
+        
+        assert result['iterations'] == 10
+        assert result['p50'] <= result['p99']
+        assert result['per_item'] == pytest.approx(result['mean'] / 4)
+        assert result['throughput'] > 0
+    
+    def test_make_queries_are_distinct(self):
+        """Generated queries never hit the encoding cache."""
+        queries = make_queries(20, fields=3)
+        assert len(set(queries)) == 20
+    
+    def test_quick_run_report_is_json(self):
+        """A quick run of a subset produces a serialisable report."""
+        report = make_report(run_benchmarks(quick=True, include_processes=False,
+                                            only=["encode/cached", "batch/activate/size=64"]))
+        
+        assert set(report['results']) == {"encode/cached", "batch/activate/size=64"}
+        assert json.loads(json.dumps(report)) == report
+    
+    def test_regressions_beyond_threshold(self):
+        """Only slowdowns beyond the threshold are reported."""
+        baseline = report_with({'a': 1.0, 'b': 1.0, 'c': 1.0})
+        current = report_with({'a': 1.2, 'b': 1.5, 'c': 0.5, 'new': 9.0})
+        
+        regressions = compare_to_baseline(current, baseline, threshold=0.25)
+        
+        assert [regression.name for regression in regressions] == ['b']
+        assert regressions[0].ratio == 1.5
+    
+    def test_merge_baseline_keeps_other_cases(self):
+        """Updating a baseline refreshes only the cases that ran."""
+        baseline = report_with({'a': 1.0, 'b': 1.0})
+        merged = merge_baseline(report_with({'b': 2.0, 'new': 3.0}), baseline)
+        
+        assert {name: result['per_item'] for name, result in merged['results'].items()} == {
+            'a': 1.0, 'b': 2.0, 'new': 3.0}
+        assert baseline['results']['b']['per_item'] == 1.0
+        assert merge_baseline(report_with({'a': 1.0}), None)['results'].keys() == {'a'}
+    
+    def test_other_environments_are_refused(self):
+        """A baseline recorded on another machine is neither compared nor partly refreshed."""
+        baseline = dict(report_with({'a': 1.0, 'b': 1.0}), environment=dict(environment(), cpu_count=64))
+        current = make_report({'a': {'per_item': 5.0}})
+        
+        assert environment_changes(current, baseline) == {'cpu_count': (64, environment()['cpu_count'])}
+        with pytest.raises(ValueError, match="cpu_count 64"):
+            compare_to_baseline(current, baseline)
+        with pytest.raises(ValueError, match="different environment"):
+            merge_baseline(current, baseline)
+        
+        regressions = compare_to_baseline(current, baseline, ignore_environment=True)
+        assert [regression.name for regression in regressions] == ['a']
+        assert merge_baseline(current, baseline, ignore_environment=True)['results'].keys() == {'a', 'b'}
+        
+        # Re-recording every case replaces the environment along with the results
+        rerun = make_report({'a': {'per_item': 5.0}, 'b': {'per_item': 1.0}})
+        assert merge_baseline(rerun, baseline)['environment'] == environment()
+    
+    def test_committed_baseline_covers_the_suite(self):
+        """The committed baseline has an entry for every benchmark case."""
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+        
+        assert baseline['version'] == 1
+        for name in ("encode/cached", "query/uncached", "batch/queries/size=1024",
+                     "field/generate", "config/save", "engine/threads=4", "engine/processes=2"):
+            assert name in baseline['results']
@@ -0,0 +1,294 @@
+"""
+Test suite for the cognitive pipeline caches.
+"""
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.cache import ENTRY_OVERHEAD, PlanCache, ResultCache, TensorCache
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.registry import default_registry
+
+
+class TestTensorCache:
+    """Test the bounded LRU tensor cache."""
+    
+    def test_hit_and_miss_counters(self):
+        """Lookups are counted as hits or misses."""
+        cache = TensorCache(maxsize=4)
+        
+        assert cache.get("a") is None
+        cache.put("a", np.ones(3, dtype=np.float32))
+        assert np.array_equal(cache.get("a"), np.ones(3))
+        
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['size'] == 1
+        assert stats['hit_rate'] == 0.5
+    
+    def test_lru_eviction_order(self):
+        """The least recently used entry is evicted first."""
+        cache = TensorCache(maxsize=2)
+        cache.put("a", np.zeros(1))
+        cache.put("b", np.zeros(1))
+        cache.get("a")
+        cache.put("c", np.zeros(1))
+        
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.stats()['evictions'] == 1
+        assert len(cache) == 2
+    
+    def test_cached_tensors_are_read_only(self):
+        """Stored tensors cannot be mutated through the cache."""
+        cache = TensorCache()
+        tensor = cache.put("a", np.zeros(3))
+        
+        with pytest.raises(ValueError):
+            tensor[0] = 1.0
+    
+    def test_clear_resets_counters(self):
+        """Clearing drops entries and counters."""
+        cache = TensorCache()
+        cache.put("a", np.zeros(1))
+        cache.get("a")
+        cache.clear()
+        
+        assert len(cache) == 0
+        assert cache.stats()['hits'] == 0
+    
+    def test_invalid_maxsize(self):
+        """A non-positive size is rejected."""
+        with pytest.raises(ValueError):
+            TensorCache(maxsize=0)
+
+
+class Plan:
+    """Stand-in plan: PlanCache only reads .text."""
+    
+    def __init__(self, text):
+        self.text = text
+
+
+class TestPlanCache:
+    """Test the bounded plan cache and its raw-text aliases."""
+    
+    def test_equivalent_texts_share_one_plan(self):
+        """A plan put under a second raw text is replaced by the cached one."""
+        cache = PlanCache(maxsize=4)
+        first = cache.put("{ a }", Plan("query { a }"))
+        
+        assert cache.put("query {a}", Plan("query { a }")) is first
+        assert cache.get("query {a}") is first
+        assert cache.get("{ b }") is None
+        
+        stats = cache.stats()
+        assert stats['size'] == 1
+        assert stats['aliases'] == 2
+        assert stats['shared'] == 1
+        assert stats['hit_rate'] == 0.5
+    
+    def test_plans_and_aliases_are_bounded(self):
+        """Both the plans and the alias index evict least recently used entries."""
+        cache = PlanCache(maxsize=2, max_aliases=3)
+        for index in range(4):
+            cache.put(f"q{index}", Plan(f"t{index}"))
+        
+        assert len(cache) == 2 and "t3" in cache and "t0" not in cache
+        assert cache.stats()['aliases'] == 2
+        assert cache.get("q0") is None and cache.get("q1") is None
+        assert cache.stats()['evictions'] == 2
+    
+    def test_evicted_plans_are_not_kept_alive_by_aliases(self):
+        """Evicting a plan drops every raw text aliasing it; aliases of live plans stay."""
+        cache = PlanCache(maxsize=2, max_aliases=100)
+        evicted = Plan("t0")
+        for alias in ("a", "b", "c"):
+            cache.put(alias, evicted)
+        cache.put("d", Plan("t1"))
+        cache.put("e", Plan("t2"))
+        
+        assert "t0" not in cache
+        assert all(cache.get(alias) is None for alias in ("a", "b", "c"))
+        assert all(plan is not evicted for plan in cache._aliases.values())
+        assert cache.stats()['aliases'] == 2
+        
+        # An alias evicted on its own leaves its plan and the plan's other aliases
+        cache = PlanCache(maxsize=4, max_aliases=2)
+        cache.put("x", Plan("t0"))
+        cache.put("y", Plan("t0"))
+        cache.put("z", Plan("t1"))
+        assert cache.get("x") is None and cache.get("y").text == "t0" and "t0" in cache
+
+
+class FakeClock:
+    """Manually advanced time source."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def states(value=0.0):
+    return np.full(5, value, dtype=np.float32)
+
+
+class TestResultCache:
+    """Test the bounded result cache."""
+    
+    def test_lru_eviction_by_entries(self):
+        """The least recently used result is evicted first."""
+        cache = ResultCache(max_entries=2)
+        cache.put("a", states())
+        cache.put("b", states())
+        cache.get("a")
+        cache.put("c", states())
+        
+        assert "a" in cache and "b" not in cache and "c" in cache
+        assert cache.stats()['evictions'] == 1
+    
+    def test_lfu_eviction_keeps_popular_results(self):
+        """LFU evicts the least used result, breaking ties by recency."""
+        cache = ResultCache(max_entries=3, policy='lfu')
+        for key in "abc":
+            cache.put(key, states())
+        for _ in range(3):
+            cache.get("a")
+        cache.get("b")
+        cache.put("d", states())
+        cache.put("e", states())
+        
+        assert "a" in cache and "b" in cache and "e" in cache
+        assert "c" not in cache and "d" not in cache
+        assert cache.stats()['evictions'] == 2
+    
+    def test_byte_bound(self):
+        """Entries are evicted until the cached bytes fit max_bytes."""
+        entry = states().nbytes + ENTRY_OVERHEAD
+        cache = ResultCache(max_entries=100, max_bytes=2 * entry)
+        for key in "abc":
+            cache.put(key, states())
+        
+        assert len(cache) == 2 and "a" not in cache
+        assert cache.stats()['bytes'] == 2 * entry
+        
+        # A value that can never fit is returned but not kept
+        large = np.zeros(1024, dtype=np.float32)
+        assert cache.put("large", large) is large
+        assert "large" not in cache and len(cache) == 2
+    
+    def test_ttl_expiry(self):
+        """Results older than ttl are misses and are dropped."""
+        clock = FakeClock()
+        cache = ResultCache(ttl=10, clock=clock)
+        cache.put("a", states(1.0))
+        cache.put("b", states(2.0))
+        
+        clock.now = 5
+        assert cache.get("a")[0] == 1.0
+        clock.now = 10
+        assert cache.get("a") is None
+        assert cache.expire() == 1
+        
+        stats = cache.stats()
+        assert stats['expirations'] == 2
+        assert stats['size'] == 0 and stats['bytes'] == 0
+        assert stats['hits'] == 1 and stats['misses'] == 1
+    
+    def test_version_change_invalidates(self):
+        """A new configuration version drops every entry."""
+        cache = ResultCache()
+        cache.check_version((0,))
+        cache.put("a", states())
+        cache.check_version((0,))
+        assert "a" in cache
+        
+        cache.check_version((1,))
+        assert len(cache) == 0
+        assert cache.stats()['invalidations'] == 1
+    
+    def test_cached_results_are_read_only(self):
+        """Stored results cannot be mutated through the cache."""
+        value = ResultCache().put("a", states())
+        with pytest.raises(ValueError):
+            value[0] = 1.0
+    
+    def test_clear_resets_counters(self):
+        """Clearing drops entries and counters."""
+        cache = ResultCache()
+        cache.put("a", states())
+        cache.get("a")
+        cache.invalidate()
+        assert len(cache) == 0 and cache.stats()['hits'] == 1
+        
+        cache.clear()
+        assert cache.stats()['hits'] == 0 and cache.stats()['invalidations'] == 0
+    
+    @pytest.mark.parametrize('kwargs', [{'max_entries': 0}, {'max_bytes': 0}, {'policy': 'fifo'}, {'ttl': 0}])
+    def test_invalid_arguments(self, kwargs):
+        """Invalid bounds, policies and ttls are rejected."""
+        with pytest.raises(ValueError):
+            ResultCache(**kwargs)
+
+
+class TestResultCaching:
+    """Test result caching in process_cognitive_query."""
+    
+    def test_cached_results_match(self):
+        """Hits return the same results as processing, in both forms."""
+        cached = CognitiveSingularity(result_cache=ResultCache())
+        plain = CognitiveSingularity()
+        query = "query { user { name email } }"
+        
+        for _ in range(2):
+            assert cached.process_cognitive_query(query) == plain.process_cognitive_query(query)
+            assert (cached.process_cognitive_query(query, compact=True).to_dict()
+                    == plain.process_cognitive_query(query))
+            assert (cached.process_cognitive_query(query, components='ecan')
+                    == plain.process_cognitive_query(query, components='ecan'))
+        
+        stats = cached.stats()['result_cache']
+        assert stats['misses'] == 2
+        assert stats['hits'] == 4
+    
+    def test_equivalent_queries_share_a_result(self):
+        """Queries with the same normalised text hit the same entry."""
+        singularity = CognitiveSingularity(result_cache=ResultCache())
+        singularity.process_cognitive_query("query { user { name email } }")
+        singularity.process_cognitive_query("{ user { email, name } }")
+        
+        assert singularity.stats()['result_cache']['hits'] == 1
+    
+    def test_store_changes_invalidate(self):
+        """Adding links to the das store invalidates cached results."""
+        singularity = CognitiveSingularity(result_cache=ResultCache())
+        processor = singularity.plan['das'].processor
+        before = singularity.process_cognitive_query("query { a }")['das']['processed_states']
+        
+        processor.atomspace.add_link('ListLink', processor.concepts[:3])
+        after = singularity.process_cognitive_query("query { a }")['das']['processed_states']
+        assert after > before
+        assert singularity.stats()['result_cache']['invalidations'] == 1
+    
+    def test_stateful_components_bypass(self):
+        """Selections with a stateful ESN are never cached."""
+        singularity = CognitiveSingularity(registry=default_registry(stateful_esn=True),
+                                           result_cache=ResultCache())
+        first = singularity.process_cognitive_query("query { a }")['esn']['processed_states']
+        second = singularity.process_cognitive_query("query { a }")['esn']['processed_states']
+        assert first != second
+        singularity.process_cognitive_query("query { a }", components='gnn')
+        singularity.process_cognitive_query("query { a }", components='gnn')
+        
+        stats = singularity.stats()['result_cache']
+        assert stats['bypasses'] == 2
+        assert stats['hits'] == 1 and stats['size'] == 1
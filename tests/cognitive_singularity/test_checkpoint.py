@@ -0,0 +1,130 @@
+"""
+Test suite for binary tensor-field checkpoints.
+"""
+
+import struct
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.checkpoint import (
+    DEFAULT_ALIGNMENT, load_tensor_field, read_checkpoint_header, save_tensor_field
+)
+from cognitive_singularity.core import CognitiveSingularity
+
+
+class TestCheckpoint:
+    """Test the checkpoint format and loaders."""
+    
+    def setup_method(self):
+        """Setup for each test method."""
+        self.singularity = CognitiveSingularity()
+        self.field = self.singularity.generate_tensor_field(seed=11)
+    
+    def test_round_trip_mmap(self, tmp_path):
+        """Memory-mapped loads return identical, zero-copy views."""
+        path = save_tensor_field(self.field, str(tmp_path / "field.cstf"))
+        loaded = load_tensor_field(path, mmap=True)
+        
+        assert list(loaded) == list(self.field)
+        for name, tensor in self.field.items():
+            assert isinstance(loaded[name], np.memmap)
+            assert loaded[name].dtype == np.float32
+            assert np.array_equal(loaded[name], tensor)
+        
+        # Every view shares one read-only mapping of the file
+        assert np.shares_memory(loaded['gnn'].base, loaded['ecan'].base)
+        with pytest.raises(ValueError):
+            loaded['gnn'][0, 0, 0] = 1.0
+    
+    def test_round_trip_in_memory(self, tmp_path):
+        """Non-mmap loads read plain arrays."""
+        path = save_tensor_field(self.field, str(tmp_path / "field.cstf"))
+        loaded = load_tensor_field(path, mmap=False)
+        
+        for name, tensor in self.field.items():
+            assert not isinstance(loaded[name], np.memmap)
+            assert np.array_equal(loaded[name], tensor)
+    
+    def test_offset_table_is_aligned(self, tmp_path):
+        """Payload offsets are aligned and describe every component."""
+        path = save_tensor_field(self.field, str(tmp_path / "field.cstf"))
+        entries = read_checkpoint_header(path)
+        
+        assert [entry.name for entry in entries] == list(self.singularity.components)
+        for entry in entries:
+            assert entry.offset % DEFAULT_ALIGNMENT == 0
+            assert entry.shape == self.singularity.components[entry.name]
+            assert entry.nbytes == 4 * int(np.prod(entry.shape))
+    
+    def test_rejects_foreign_files(self, tmp_path):
+        """Files without the checkpoint magic are rejected."""
+        path = tmp_path / "not-a-checkpoint"
+        path.write_bytes(b"{\"version\": \"1.0.0\"}")
+        
+        with pytest.raises(ValueError, match="not a tensor-field checkpoint"):
+            load_tensor_field(str(path))
+    
+    def test_rejects_truncated_files(self, tmp_path):
+        """Checkpoints cut short anywhere raise ValueError, not struct or reshape errors."""
+        path = save_tensor_field(self.field, str(tmp_path / "field.cstf"))
+        data = Path(path).read_bytes()
+        header_end = read_checkpoint_header(path)[0].offset
+        
+        truncated = tmp_path / "truncated.cstf"
+        for size in (20, 30, header_end // 2, header_end + 8, len(data) - 1):
+            truncated.write_bytes(data[:size])
+            with pytest.raises(ValueError, match="Truncated|past the end"):
+                load_tensor_field(str(truncated))
+            with pytest.raises(ValueError, match="Truncated|past the end"):
+                load_tensor_field(str(truncated), mmap=False)
+    
+    def test_rejects_wrong_payload_size(self, tmp_path):
+        """An nbytes that does not match the stored shape names the entry."""
+        path = save_tensor_field({'weights': np.zeros((4, 8), dtype=np.float32)}, str(tmp_path / "w.cstf"))
+        entry = read_checkpoint_header(path)[0]
+        data = bytearray(Path(path).read_bytes())
+        nbytes_at = data.index(struct.pack('<QQ', entry.offset, entry.nbytes)) + 8
+        data[nbytes_at:nbytes_at + 8] = struct.pack('<Q', entry.nbytes - 4)
+        Path(path).write_bytes(bytes(data))
+        
+        with pytest.raises(ValueError, match="'weights'.*expected 128"):
+            load_tensor_field(path)
+    
+    def test_rejects_unsupported_dtype(self, tmp_path):
+        """Only registered dtypes can be stored."""
+        with pytest.raises(ValueError, match="Unsupported checkpoint dtype"):
+            save_tensor_field({'x': np.zeros(3, dtype=np.int64)}, str(tmp_path / "x.cstf"))
+    
+    def test_singularity_checkpoint_methods(self, tmp_path):
+        """The singularity saves seeded fields and validates shapes on load."""
+        path = self.singularity.save_tensor_field(str(tmp_path / "field.cstf"), seed=11)
+        loaded = self.singularity.load_tensor_field(path)
+        
+        for name, tensor in self.field.items():
+            assert np.array_equal(loaded[name], tensor)
+        
+        bad = dict(self.field, gnn=np.zeros((3, 3), dtype=np.float32))
+        bad_path = save_tensor_field(bad, str(tmp_path / "bad.cstf"))
+        with pytest.raises(ValueError, match="gnn"):
+            self.singularity.load_tensor_field(bad_path)
+    
+    def test_quantised_round_trip(self, tmp_path):
+        """Quantised fields are stored compactly and map back without copying."""
+        from cognitive_singularity.quant import BlockQ8Tensor, Float16Tensor, quantize_field
+        
+        for qtype, kind in (('f16', Float16Tensor), ('q8_0', BlockQ8Tensor)):
+            field = quantize_field(self.field, qtype)
+            path = save_tensor_field(field, str(tmp_path / f"{qtype}.cstf"))
+            
+            for mmap in (True, False):
+                loaded = load_tensor_field(path, mmap=mmap)
+                assert all(isinstance(tensor, kind) for tensor in loaded.values())
+                assert loaded == field
+            assert [entry.shape for entry in read_checkpoint_header(path)] == list(self.singularity.components.values())
+            assert isinstance(load_tensor_field(path)['gnn'].data, np.memmap)
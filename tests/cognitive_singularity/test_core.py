@@ -89,6 +89,14 @@ class TestCognitiveSingularity:
         assert min(states) == 0
         assert max(states) == 775
     
+    def test_enumerated_states_are_flat_tensor_indices(self):
+        """Each state is its index in the flat tensor, so components never repeat local indices."""
+        states = self.singularity.enumerate_all_states()
+        
+        for entry in self.singularity.layout:
+            assert np.array_equal(states[entry.slice], np.arange(entry.offset, entry.offset + entry.size))
+        assert np.array_equal(np.concatenate(list(self.singularity.iter_states(100))), states)
+    
     def test_tensor_field_generation(self):
         """Test tensor field generation for all components."""
         tensor_field = self.singularity.generate_tensor_field()
@@ -142,6 +150,44 @@ class TestCognitiveSingularity:
         tensor1_repeat = self.singularity.graphql_query_to_tensor(query1)
         assert np.array_equal(tensor1, tensor1_repeat)
     
+    def test_query_encoding_is_stable_across_processes(self):
+        """Encodings do not depend on the per-process hash() salt."""
+        import subprocess
+        
+        code = (
+            "import sys; sys.path.insert(0, %r); "
+            "from cognitive_singularity.core import CognitiveSingularity; "
+            "print(CognitiveSingularity().graphql_query_to_tensor('query { user { name } }').tobytes().hex())"
+        ) % str(Path(__file__).parent.parent.parent)
+        
+        outputs = set()
+        for seed in ("1", "2"):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            outputs.add(subprocess.check_output([sys.executable, "-c", code], env=env).strip())
+        
+        assert len(outputs) == 1
+        local = self.singularity.graphql_query_to_tensor("query { user { name } }")
+        assert outputs.pop().decode() == local.tobytes().hex()
+    
+    def test_encoding_cache(self):
+        """Repeated queries are served from the encoding cache."""
+        query = "query { user { name } }"
+        first = self.singularity.graphql_query_to_tensor(query)
+        second = self.singularity.graphql_query_to_tensor(query)
+        
+        assert np.array_equal(first, second)
+        stats = self.singularity.encoding_cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        
+        # Returned tensors are private copies
+        first[:] = 0
+        assert np.array_equal(self.singularity.graphql_query_to_tensor(query), second)
+        
+        uncached = CognitiveSingularity(encoding_cache_size=0)
+        assert uncached.encoding_cache is None
+        assert np.array_equal(uncached.graphql_query_to_tensor(query), second)
+    
     def test_cognitive_query_processing(self):
         """Test full cognitive query processing pipeline."""
         test_query = """
@@ -320,4 +366,87 @@ class TestIntegration:
         
         # Convert to match string keys in expected structure
         config_str_keys = json.loads(json.dumps(config))
-        assert config_str_keys == expected_structure
\ No newline at end of file
+        assert config_str_keys == expected_structure
+
+
+class TestBatchProcessing:
+    """Test the batched (N, 776) query processing path."""
+    
+    def setup_method(self):
+        """Setup for each test method."""
+        self.singularity = CognitiveSingularity()
+        self.queries = [
+            "query { user { name } }",
+            "query { posts { title content } }",
+            "",
+            "query CognitiveTest { thoughts { concept attention emergence } }",
+        ]
+    
+    def test_batch_encoding_matches_single(self):
+        """Each row of the batch matrix equals the single-query encoding."""
+        matrix = self.singularity.graphql_queries_to_tensor(self.queries)
+        
+        assert matrix.shape == (len(self.queries), 776)
+        assert matrix.dtype == np.float32
+        for row, query in zip(matrix, self.queries):
+            assert np.array_equal(row, self.singularity.graphql_query_to_tensor(query))
+    
+    def test_batch_results_match_single_path_exactly(self):
+        """Batched results are identical to per-query results."""
+        batch = self.singularity.process_cognitive_queries(self.queries)
+        
+        assert len(batch) == len(self.queries)
+        for result, query in zip(batch, self.queries):
+            assert result == self.singularity.process_cognitive_query(query)
+    
+    def test_batch_ecan_zero_sum_row(self):
+        """A zero-sum ECAN slice passes through unchanged, as in the single path."""
+        matrix = np.zeros((2, 776), dtype=np.float32)
+        matrix[1] = self.singularity.graphql_query_to_tensor("query { a }")
+        
+        states = self.singularity.process_tensor_batch(matrix)
+        
+        assert states.shape == (2, 5)
+        assert states[0, 4] == 0.0
+        assert states[0, 1] == np.float32(0.5) * 110
+    
+    def test_steady_state_query_reuses_arena(self):
+        """A repeated query is served from the thread's arena without new tensors."""
+        import tracemalloc
+        
+        query = self.queries[0]
+        expected = self.singularity.process_cognitive_query(query)
+        arena = self.singularity._arena()
+        
+        tracemalloc.start()
+        try:
+            self.singularity.process_cognitive_query(query)
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            result = self.singularity.process_cognitive_query(query)
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+        
+        assert result == expected
+        assert self.singularity._arena() is arena
+        # Only the result dicts are allocated, never a full 776-float tensor
+        assert peak < 776 * np.dtype(np.float32).itemsize
+    
+    def test_layout_table(self):
+        """The precomputed layout covers the flat tensor end to end."""
+        layout = self.singularity.layout
+        
+        assert layout.total == 776
+        assert layout.names == tuple(self.singularity.components)
+        assert [entry.offset for entry in layout] == [0, 343, 453, 570, 695]
+        assert layout['ecan'].slice == slice(695, 776)
+        
+        flat = np.arange(776, dtype=np.float32)
+        views = layout.views(flat)
+        assert views['gnn'].shape == (7, 7, 7)
+        assert np.shares_memory(views['ecan'], flat)
+    
+    def test_empty_batch(self):
+        """An empty batch produces no results."""
+        assert self.singularity.process_cognitive_queries([]) == []
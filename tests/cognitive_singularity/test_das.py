@@ -0,0 +1,230 @@
+"""
+Test suite for the DAS AtomSpace store and hypergraph component.
+"""
+
+import pickle
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.das import (
+    AtomSpace, HypergraphProcessor, ShardedAtomSpace, Variable
+)
+
+
+def build_family(space):
+    """A small inheritance hypergraph: cat, dog -> mammal -> animal."""
+    cat, dog, mammal, animal = space.add_nodes('ConceptNode', ['cat', 'dog', 'mammal', 'animal'])
+    inherits = space.add_links('InheritanceLink', [[cat, mammal], [dog, mammal], [mammal, animal]])
+    return (cat, dog, mammal, animal), inherits
+
+
+class TestAtomSpace:
+    """Test storage, indexes and pattern matching."""
+
+    def setup_method(self):
+        """Setup for each test method."""
+        self.space = AtomSpace()
+        (self.cat, self.dog, self.mammal, self.animal), self.inherits = build_family(self.space)
+
+    def test_nodes_and_links_are_deduplicated(self):
+        """Adding an existing atom returns its handle instead of a copy."""
+        assert self.space.add_node('ConceptNode', 'cat') == self.cat
+        assert self.space.add_link('InheritanceLink', [self.cat, self.mammal]) == self.inherits[0]
+        assert list(self.space.add_nodes('ConceptNode', ['fish', 'fish'])) == [7, 7]
+        assert len(self.space) == 8
+
+    def test_lookups(self):
+        """Type, name, outgoing and truth value columns round-trip."""
+        assert self.space.get_node('ConceptNode', 'dog') == self.dog
+        assert self.space.get_node('ConceptNode', 'unicorn') is None
+        assert self.space.get_link('InheritanceLink', [self.mammal, self.animal]) == self.inherits[2]
+        assert self.space.type_of(self.inherits[0]) == 'InheritanceLink'
+        assert self.space.name_of(self.cat) == 'cat'
+        assert self.space.name_of(self.inherits[0]) is None
+        assert list(self.space.outgoing(self.inherits[1])) == [self.dog, self.mammal]
+
+        self.space.set_truth(self.cat, 0.8, 0.5)
+        assert self.space.truth(self.cat) == pytest.approx((0.8, 0.5))
+
+    def test_type_name_and_incoming_indexes(self):
+        """Hash and incoming indexes answer without scanning the store."""
+        assert list(self.space.by_type('InheritanceLink')) == list(self.inherits)
+        assert list(self.space.by_name('mammal')) == [self.mammal]
+        assert list(self.space.incoming(self.mammal)) == list(self.inherits)
+        assert list(self.space.incoming_counts([self.cat, self.mammal, self.animal])) == [1, 3, 1]
+
+    def test_match_fixed_and_wildcard_positions(self):
+        """Fixed handles, wildcards and types narrow the match."""
+        assert list(self.space.match('InheritanceLink', [None, self.mammal])) == list(self.inherits[:2])
+        assert list(self.space.match('InheritanceLink', [self.mammal, None])) == [self.inherits[2]]
+        assert list(self.space.match('ConceptNode', name='dog')) == [self.dog]
+        assert len(self.space.match('InheritanceLink', [None])) == 0
+        assert len(self.space.match('MissingType')) == 0
+
+    def test_bind_variables(self):
+        """Variables return aligned bindings; repeated variables must agree."""
+        handles, bindings = self.space.bind('InheritanceLink', [Variable('x'), self.mammal])
+        assert list(handles) == list(self.inherits[:2])
+        assert list(bindings['x']) == [self.cat, self.dog]
+
+        loop = self.space.add_link('InheritanceLink', [self.animal, self.animal])
+        handles, bindings = self.space.bind('InheritanceLink', [Variable('x'), Variable('x')])
+        assert list(handles) == [loop]
+        assert list(bindings['x']) == [self.animal]
+
+    def test_rejects_dangling_links(self):
+        """Links must reference existing atoms."""
+        with pytest.raises(ValueError, match="existing atoms"):
+            self.space.add_link('ListLink', [self.cat, 99])
+
+    def test_incoming_index_stays_current_across_writes(self):
+        """Links added after the index compiles are still found."""
+        self.space.incoming_counts([self.mammal])
+        fish = self.space.add_node('ConceptNode', 'fish')
+        link = self.space.add_link('InheritanceLink', [fish, self.animal])
+
+        assert list(self.space.incoming(self.animal)) == [self.inherits[2], link]
+        assert list(self.space.match('InheritanceLink', [None, self.animal])) == [self.inherits[2], link]
+
+    def test_bulk_store_and_selective_match(self):
+        """A 100k-link store answers selective matches from the index."""
+        space = AtomSpace()
+        nodes = space.add_nodes('ConceptNode', (f"n{index}" for index in range(20000)))
+        rng = np.random.default_rng(0)
+        edges = rng.integers(0, len(nodes), (100000, 2))
+        links = space.add_links('ListLink', nodes[edges])
+
+        target = int(nodes[edges[0, 1]])
+        expected = np.unique(links[edges[:, 1] == edges[0, 1]])
+        assert np.array_equal(space.match('ListLink', [None, target]), expected)
+        assert space.stats()['column_bytes'] < 100 * len(space)
+
+    def test_pickling(self):
+        """Stores survive pickling."""
+        clone = pickle.loads(pickle.dumps(self.space))
+        assert list(clone.incoming(self.mammal)) == list(self.inherits)
+
+    def test_copies_are_independent(self):
+        """Writes to a copy or its source never reach the other, shared index columns included."""
+        clone = self.space.copy()
+        assert list(clone.incoming(self.mammal)) == list(self.inherits)
+
+        fish = clone.add_node('ConceptNode', 'fish')
+        clone.add_node('PredicateNode', 'cat')
+        clone.add_link('InheritanceLink', [fish, self.animal])
+        clone.set_truth(self.cat, 0.8, 0.5)
+        self.space.add_node('SchemaNode', 'mammal')
+
+        assert len(clone) == len(self.space) + 2
+        assert len(clone.by_name('cat')) == 2 and len(self.space.by_name('cat')) == 1
+        assert len(clone.by_name('mammal')) == 1 and len(self.space.by_name('mammal')) == 2
+        assert len(clone.by_type('InheritanceLink')) == len(self.space.by_type('InheritanceLink')) + 1
+        assert list(self.space.incoming(self.animal)) == [self.inherits[2]]
+        assert self.space.truth(self.cat) == pytest.approx((1.0, 0.0))
+
+
+@pytest.mark.parametrize("processes", [False, True])
+class TestShardedAtomSpace:
+    """Test sharding across in-process and worker-process shards."""
+
+    def test_sharded_matches_single_store(self, processes):
+        """Sharded results equal a single store's, up to handle numbering."""
+        with ShardedAtomSpace(shards=3, processes=processes) as sharded:
+            (cat, dog, mammal, animal), inherits = build_family(sharded)
+
+            assert len(sharded) == 7
+            assert sharded.get_node('ConceptNode', 'mammal') == mammal
+            assert sharded.name_of(dog) == 'dog'
+            assert sharded.type_of(inherits[0]) == 'InheritanceLink'
+            assert list(sharded.outgoing(inherits[2])) == [mammal, animal]
+            assert list(sharded.incoming(mammal)) == sorted(inherits)
+            assert list(sharded.match('ConceptNode', name='cat')) == [cat]
+
+            handles, bindings = sharded.bind('InheritanceLink', [Variable('x'), mammal])
+            assert sorted(zip(handles, bindings['x'])) == sorted(zip(inherits[:2], [cat, dog]))
+            assert sharded.stats()['atoms'] == 7
+
+    def test_errors_propagate(self, processes):
+        """A failing shard call raises in the caller."""
+        with ShardedAtomSpace(shards=2, processes=processes) as sharded:
+            with pytest.raises(IndexError):
+                sharded.type_of(1000)
+
+    def test_failed_scatter_leaves_shards_in_sync(self, processes):
+        """After one shard fails a scattered call, later calls get their own replies."""
+        with ShardedAtomSpace(shards=2, processes=processes) as sharded:
+            build_family(sharded)
+            with pytest.raises(ValueError):
+                sharded.bind('ConceptNode', outgoing=['x'])
+
+            assert len(sharded) == 7
+            assert sharded.stats()['atoms'] == 7
+
+    def test_transport_errors_leave_shards_in_sync(self, processes, monkeypatch):
+        """A send or receive that fails on one shard still reads every other reply."""
+        with ShardedAtomSpace(shards=3, processes=processes) as sharded:
+            build_family(sharded)
+            shard = sharded._shards[1]
+
+            def broken_send(method, args):
+                raise BrokenPipeError("shard 1 is gone")
+
+            with monkeypatch.context() as patch:
+                patch.setattr(shard, 'send', broken_send)
+                with pytest.raises(BrokenPipeError):
+                    len(sharded)
+            assert len(sharded) == 7
+
+            receive = shard.receive
+
+            def broken_receive():
+                receive()
+                raise EOFError("shard 1 hung up")
+
+            with monkeypatch.context() as patch:
+                patch.setattr(shard, 'receive', broken_receive)
+                with pytest.raises(EOFError):
+                    sharded.stats()
+            assert len(sharded) == 7
+            assert sharded.stats()['atoms'] == 7
+
+
+class TestHypergraphProcessor:
+    """Test the AtomSpace-backed das component."""
+
+    def test_empty_store_is_plain_sigmoid(self):
+        """Without links the activation is exactly the sigmoid."""
+        processor = HypergraphProcessor.with_concepts(10)
+        block = np.linspace(-3, 3, 10, dtype=np.float32)
+        expected = 1 / (1 + np.exp(-block))
+
+        assert np.array_equal(processor.activate(block, np.empty_like(block)), expected)
+
+    def test_links_prime_concepts(self):
+        """Concepts referenced by links get a log-degree bias."""
+        processor = HypergraphProcessor.with_concepts(4)
+        space = processor.atomspace
+        other = space.add_node('ConceptNode', 'other')
+        space.add_links('ListLink', [[processor.concepts[1], other], [other, processor.concepts[1]]])
+
+        block = np.zeros((2, 4), dtype=np.float32)
+        result = processor.activate(block, np.empty_like(block))
+        assert result[0, 1] == pytest.approx(1 / (1 + np.exp(-np.log(3))))
+        assert np.all(result[:, [0, 2, 3]] == 0.5)
+
+    def test_singularity_das_reads_the_store(self):
+        """Links added to the singularity's store change das results."""
+        singularity = CognitiveSingularity()
+        processor = singularity.plan['das'].processor
+        before = singularity.process_cognitive_query("query { a }")['das']['processed_states']
+
+        processor.atomspace.add_link('ListLink', processor.concepts[:3])
+        after = singularity.process_cognitive_query("query { a }")['das']['processed_states']
+        assert after > before
@@ -0,0 +1,256 @@
+"""
+Test suite for component sharding across worker processes.
+"""
+
+import os
+import socket
+import struct
+import time
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.distributed import (
+    ERROR, MAGIC, MAX_MESSAGE_BYTES, REQUEST, RESPONSE, ComponentServer, DistributedSingularity,
+    FrameError, WorkerError, recv_frame, send_frame
+)
+from cognitive_singularity.registry import ComponentRegistry, ElementwiseProcessor, tanh_kernel
+
+
+QUERIES = [f'query {{ node(id: {i}) {{ value }} }}' for i in range(40)]
+
+COORDINATOR = os.getpid()
+
+
+class SleepyProcessor:
+    """Copies its block after sleeping, in worker processes only."""
+    
+    label = 'Sleepy'
+    batched = True
+    
+    def __init__(self, seconds):
+        self.seconds = seconds
+    
+    def activate(self, block, out):
+        if os.getpid() != COORDINATOR:
+            time.sleep(self.seconds)
+        np.copyto(out, block)
+        return out
+
+
+class FailingProcessor:
+    """Raises in worker processes only."""
+    
+    label = 'Failing'
+    batched = True
+    
+    def activate(self, block, out):
+        if os.getpid() != COORDINATOR:
+            raise ValueError("bad block")
+        np.copyto(out, block)
+        return out
+
+
+def sleepy_singularity(seconds, components=4):
+    registry = ComponentRegistry()
+    for index in range(components):
+        registry.register(f"c{index}", (8,), SleepyProcessor(seconds))
+    return CognitiveSingularity(registry=registry)
+
+
+class TestFraming:
+    """Test the binary frame format."""
+    
+    def test_round_trip(self):
+        """Frames carry a float32 matrix and their header fields."""
+        left, right = socket.socketpair()
+        with left, right:
+            block = np.arange(12, dtype=np.float32).reshape(3, 4)
+            send_frame(left, REQUEST, 7, block, 3, 4, flags=1)
+            frame = recv_frame(right)
+            
+            assert (frame.kind, frame.flags, frame.request_id) == (REQUEST, 1, 7)
+            assert np.array_equal(frame.array(), block)
+            
+            left.close()
+            assert recv_frame(right) is None
+    
+    def test_rejects_malformed_frames(self):
+        """Bad magic and payload sizes that do not match the shape are errors."""
+        left, right = socket.socketpair()
+        with left, right:
+            left.sendall(b"XX" + bytes(22))
+            with pytest.raises(FrameError):
+                recv_frame(right)
+            
+            send_frame(left, RESPONSE, 1, np.zeros(3, dtype=np.float32), 2, 2)
+            with pytest.raises(FrameError):
+                recv_frame(right)
+    
+    
+    def test_rejects_oversized_frames_before_reading(self):
+        """Header sizes past the limits fail without allocating the payload."""
+        left, right = socket.socketpair()
+        with left, right:
+            left.sendall(struct.pack('<2sBBIIIQ', MAGIC, REQUEST, 0, 1, 1 << 30, 1 << 30, 1 << 62))
+            with pytest.raises(FrameError, match="exceeds"):
+                recv_frame(right)
+            
+            left.sendall(struct.pack('<2sBBIIIQ', MAGIC, REQUEST, 0, 1, 1 << 20, 64, 1 << 28))
+            with pytest.raises(FrameError, match="exceeds"):
+                recv_frame(right, max_bytes=1 << 20)
+            
+            left.sendall(struct.pack('<2sBBIIIQ', MAGIC, ERROR, 0, 1, 0, 0, MAX_MESSAGE_BYTES + 1))
+            with pytest.raises(FrameError, match="exceeds"):
+                recv_frame(right)
+            
+            left.sendall(struct.pack('<2sBBIIIQ', MAGIC, 9, 0, 1, 0, 0, 0))
+            with pytest.raises(FrameError, match="Unknown frame kind"):
+                recv_frame(right)
+    
+    def test_server_rejects_wrong_width_and_too_many_rows(self):
+        """A server answers requests of the wrong width or too many rows with ERROR frames."""
+        with ComponentServer(ElementwiseProcessor('GraphQL-GNN', tanh_kernel), width=4, max_rows=8).start() as server:
+            with socket.create_connection(server.address, timeout=5) as sock:
+                send_frame(sock, REQUEST, 1, np.ones((2, 5), dtype=np.float32), 2, 5)
+                reply = recv_frame(sock)
+                assert reply.kind == ERROR and b"4 values wide" in reply.payload
+                
+                send_frame(sock, REQUEST, 2, np.ones((2, 4), dtype=np.float32), 2, 4)
+                reply = recv_frame(sock)
+                assert reply.kind == RESPONSE and np.allclose(reply.array(), np.tanh(1))
+                
+                # Past width x max_rows the connection is dropped unread
+                sock.sendall(struct.pack('<2sBBIIIQ', MAGIC, REQUEST, 0, 3, 1 << 20, 4, 1 << 24))
+                assert recv_frame(sock) is None
+        
+        with ComponentServer(ElementwiseProcessor('GraphQL-GNN', tanh_kernel), max_rows=8).start() as server:
+            with socket.create_connection(server.address, timeout=5) as sock:
+                send_frame(sock, REQUEST, 4, np.ones((9, 4), dtype=np.float32), 9, 4)
+                reply = recv_frame(sock)
+                assert reply.kind == ERROR and b"At most 8 rows" in reply.payload
+
+
+class TestDistributedSingularity:
+    """Test scatter/gather across local and remote component workers."""
+    
+    def test_results_match_in_process(self):
+        """Every result form is bit-identical to the in-process path."""
+        singularity = CognitiveSingularity()
+        with DistributedSingularity() as cluster:
+            assert cluster.process_cognitive_queries(QUERIES) == singularity.process_cognitive_queries(QUERIES)
+            assert cluster.process_cognitive_query(QUERIES[0]) == singularity.process_cognitive_query(QUERIES[0])
+            assert (cluster.process_cognitive_query(QUERIES[1], compact=True).to_dict()
+                    == singularity.process_cognitive_query(QUERIES[1]))
+            assert (cluster.process_cognitive_queries(QUERIES, components=['esn', 'ecan'])
+                    == singularity.process_cognitive_queries(QUERIES, components=['esn', 'ecan']))
+            
+            matrix = singularity.graphql_queries_to_tensor(QUERIES)
+            expected = np.empty_like(matrix)
+            activations = np.empty_like(matrix)
+            assert np.array_equal(cluster.process_tensor_batch(matrix, activations=activations),
+                                  singularity.process_tensor_batch(matrix, activations=expected))
+            assert np.array_equal(activations, expected)
+            
+            stats = cluster.stats()
+            assert stats['esn']['requests'] == 5
+            assert stats['gnn']['requests'] == 4
+            assert all(worker['fallbacks'] == 0 for worker in stats.values())
+    
+    def test_components_run_concurrently(self):
+        """Four workers sleeping 0.3 s each answer in well under 1.2 s."""
+        with DistributedSingularity(sleepy_singularity(0.3)) as cluster:
+            started = time.perf_counter()
+            states = cluster.process_tensor_batch(np.ones((2, 32), dtype=np.float32))
+            elapsed = time.perf_counter() - started
+        
+        assert np.array_equal(states, np.full((2, 4), 8, dtype=np.float32))
+        assert elapsed < 0.9
+    
+    def test_timeout_falls_back_in_process(self):
+        """A worker missing the deadline is dropped and its slice runs locally."""
+        with DistributedSingularity(sleepy_singularity(2.0, components=2), timeout=0.3,
+                                    retry_interval=60) as cluster:
+            states = cluster.process_tensor_batch(np.ones((1, 16), dtype=np.float32))
+            assert np.array_equal(states, [[8, 8]])
+            
+            stats = cluster.stats()
+            assert stats['c0']['failures'] == 1 and stats['c0']['fallbacks'] == 1
+            assert not stats['c0']['alive']
+            
+            # Not retried before retry_interval: straight to the fallback
+            cluster.process_tensor_batch(np.ones((1, 16), dtype=np.float32))
+            assert cluster.stats()['c0']['fallbacks'] == 2
+    
+    def test_slow_worker_does_not_fail_healthy_ones(self):
+        """Only the worker that misses the deadline is failed; the others' replies are used."""
+        registry = ComponentRegistry().register('slow', (8,), SleepyProcessor(2.0))
+        for name in ('b', 'c', 'd'):
+            registry.register(name, (8,), SleepyProcessor(0.0))
+        with DistributedSingularity(CognitiveSingularity(registry=registry), timeout=0.3,
+                                    retry_interval=60) as cluster:
+            states = cluster.process_tensor_batch(np.ones((1, 32), dtype=np.float32))
+            assert np.array_equal(states, [[8, 8, 8, 8]])
+            
+            stats = cluster.stats()
+            assert stats['slow']['failures'] == 1 and stats['slow']['fallbacks'] == 1
+            for name in ('b', 'c', 'd'):
+                assert stats[name]['failures'] == 0 and stats[name]['fallbacks'] == 0
+                assert stats[name]['alive']
+    
+    def test_dead_worker_is_restarted(self):
+        """A killed worker process is replaced on a later call."""
+        singularity = CognitiveSingularity()
+        with DistributedSingularity(retry_interval=0) as cluster:
+            worker = cluster._workers[0]
+            worker.process.kill()
+            worker.process.join()
+            
+            assert cluster.process_cognitive_queries(QUERIES) == singularity.process_cognitive_queries(QUERIES)
+            assert cluster.process_cognitive_queries(QUERIES) == singularity.process_cognitive_queries(QUERIES)
+            
+            stats = cluster.stats()['gnn']
+            assert stats['failures'] == 1 and stats['fallbacks'] == 1
+            assert stats['restarts'] == 1 and stats['alive']
+    
+    def test_failures_raise_without_fallback(self):
+        """With fallback off, an unavailable worker raises WorkerError."""
+        with DistributedSingularity(fallback=False, retry_interval=60) as cluster:
+            cluster._workers[2].process.kill()
+            cluster._workers[2].process.join()
+            
+            with pytest.raises(WorkerError) as error:
+                cluster.process_cognitive_queries(QUERIES)
+            assert error.value.component == 'esn'
+            
+            # The other workers' streams stay in sync
+            assert cluster.process_cognitive_queries(QUERIES, components='gnn')
+    
+    def test_processor_errors_are_reported(self):
+        """An exception inside a worker comes back as WorkerError and the worker keeps serving."""
+        registry = ComponentRegistry().register('bad', (4,), FailingProcessor())
+        with DistributedSingularity(CognitiveSingularity(registry=registry)) as cluster:
+            for _ in range(2):
+                with pytest.raises(WorkerError, match="ValueError: bad block"):
+                    cluster.process_tensor_batch(np.ones((1, 4), dtype=np.float32))
+            assert cluster.stats()['bad']['failures'] == 0
+    
+    def test_remote_component_server(self):
+        """A component hosted by a TCP ComponentServer gives the same results."""
+        singularity = CognitiveSingularity()
+        with ComponentServer(ElementwiseProcessor('GraphQL-GNN', tanh_kernel), width=343).start() as server:
+            registry = ComponentRegistry().register('gnn', (7, 7, 7), ElementwiseProcessor('GraphQL-GNN', tanh_kernel))
+            local = CognitiveSingularity(registry=registry)
+            with DistributedSingularity(CognitiveSingularity(registry=registry),
+                                        addresses={'gnn': server.address}) as cluster:
+                assert cluster.process_cognitive_queries(QUERIES) == local.process_cognitive_queries(QUERIES)
+                assert cluster.stats()['gnn']['address'] == server.address
+        
+        with pytest.raises(ValueError):
+            DistributedSingularity(singularity, addresses={'nope': server.address})
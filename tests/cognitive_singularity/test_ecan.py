@@ -0,0 +1,149 @@
+"""
+Test suite for the ECAN attention bank and spreading component.
+"""
+
+import pickle
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.ecan import AttentionBank, AttentionProcessor, IndexedHeap
+from cognitive_singularity.sparse import CSRMatrix, lattice_adjacency
+
+
+def reference_top(keys, k):
+    """Descending keys, ties broken by the lower id."""
+    return list(np.lexsort((np.arange(len(keys)), -keys))[:k])
+
+
+class TestIndexedHeap:
+    """Test the indexed max-heap."""
+    
+    def test_random_updates_keep_top_k_exact(self):
+        """Single and bulk updates keep top(k) equal to a full sort."""
+        rng = np.random.default_rng(0)
+        keys = rng.integers(0, 50, 500).astype(np.float64)
+        heap = IndexedHeap(keys)
+        
+        for _ in range(300):
+            item = int(rng.integers(0, 500))
+            keys[item] = rng.integers(0, 50)
+            heap.update(item)
+            assert list(heap.top(10)) == reference_top(keys, 10)
+        
+        items = rng.choice(500, 100, replace=False)
+        keys[items] += 25
+        heap.update_many(items)
+        assert list(heap.top(500)) == reference_top(keys, 500)
+        assert heap.peek() == reference_top(keys, 1)[0]
+    
+    def test_top_is_bounded_by_size(self):
+        """top(k) with k past the size returns every item."""
+        heap = IndexedHeap(np.array([1.0, 3.0, 2.0]))
+        assert list(heap.top(10)) == [1, 2, 0]
+        assert len(heap.top(0)) == 0
+
+
+class TestAttentionBank:
+    """Test wages, rent, spreading and the attentional focus."""
+    
+    def setup_method(self):
+        """Setup for each test method."""
+        # A chain 0 -> 1 -> 2 -> ... -> 9 with a fork from 0 to 5
+        rows = np.array([0, 0, 1, 2, 3, 4, 5, 6, 7, 8])
+        cols = np.array([1, 5, 2, 3, 4, 5, 6, 7, 8, 9])
+        weights = np.array([3.0, 1.0, 1, 1, 1, 1, 1, 1, 1, 1])
+        self.links = CSRMatrix.from_edges(rows, cols, weights, (10, 10))
+        self.bank = AttentionBank(10, self.links, focus_size=3, wage=2.0, rent=0.5,
+                                  spread_fraction=0.5)
+    
+    def test_stimulate_pays_wages(self):
+        """Stimulus raises STI and LTI and is paid out of the funds."""
+        paid = self.bank.stimulate([4, 4, 7], [1.0, 2.0, 1.0])
+        
+        assert paid == 8.0
+        assert self.bank.sti[4] == 6.0 and self.bank.sti[7] == 2.0
+        assert self.bank.lti[4] == pytest.approx(0.3)
+        assert self.bank.funds == -8.0
+        assert list(self.bank.focus) == [4, 7, 0]
+    
+    def test_rent_is_charged_to_the_focus_only(self):
+        """Items outside the focus pay no rent."""
+        self.bank.stimulate([1, 2, 3, 4], [4.0, 3.0, 2.0, 1.0])
+        assert self.bank.collect_rent() == 1.5
+        
+        assert list(self.bank.sti[1:5]) == [7.5, 5.5, 3.5, 2.0]
+        assert self.bank.in_focus(3) and not self.bank.in_focus(4)
+    
+    def test_spreading_follows_link_weights(self):
+        """A focus item's spread is split by its normalised out-link weights."""
+        self.bank.stimulate([0], [4.0])
+        moved = self.bank.spread()
+        
+        assert moved == 4.0
+        assert self.bank.sti[0] == 4.0
+        assert self.bank.sti[1] == 3.0 and self.bank.sti[5] == 1.0
+        assert list(self.bank.focus) == [0, 1, 5]
+    
+    def test_cycles_conserve_currency(self):
+        """STI plus funds stays constant over wages, rent and spreading."""
+        bank = AttentionBank(2000, lattice_adjacency((40, 50)), focus_size=50)
+        rng = np.random.default_rng(1)
+        for _ in range(20):
+            bank.stimulate(rng.integers(0, 2000, 30), rng.random(30))
+            bank.cycle()
+            assert bank.sti.sum() + bank.funds == pytest.approx(0.0, abs=1e-9)
+            assert list(bank.focus) == reference_top(bank.sti, 50)
+    
+    def test_validation_and_pickling(self):
+        """Bad arguments are rejected; banks survive pickling."""
+        with pytest.raises(ValueError, match="shape"):
+            AttentionBank(5, self.links)
+        with pytest.raises(ValueError, match="non-negative"):
+            AttentionBank(10, self.links.scaled(-1.0))
+        
+        self.bank.stimulate([3], [1.0])
+        clone = pickle.loads(pickle.dumps(self.bank))
+        clone.stimulate([8], [5.0])
+        assert list(clone.focus) == [8, 3, 0]
+
+
+class TestAttentionProcessor:
+    """Test the ecan component processor."""
+    
+    def test_spreading_conserves_and_normalises(self):
+        """Lattice spreading moves mass between neighbours; rows still sum to one."""
+        processor = AttentionProcessor.lattice((3, 3), steps=1)
+        block = np.zeros(9, dtype=np.float32)
+        block[4] = 1.0
+        result = processor.activate(block, np.empty_like(block))
+        
+        assert result.sum() == pytest.approx(1.0)
+        assert result[4] == pytest.approx(0.8)
+        assert list(result[[1, 3, 5, 7]]) == pytest.approx([0.05] * 4)
+        assert result[0] == 0.0
+    
+    def test_batch_rows_match_single_activations(self):
+        """Batched activation equals activating every row alone."""
+        processor = AttentionProcessor.lattice()
+        block = np.random.default_rng(2).random((6, 81)).astype(np.float32)
+        
+        result = processor.activate(block, np.empty_like(block))
+        for row in range(6):
+            assert np.array_equal(result[row], processor.activate(block[row], np.empty(81, np.float32)))
+    
+    def test_singularity_attention(self):
+        """The singularity's component attention is backed by its bank."""
+        singularity = CognitiveSingularity()
+        weights = singularity.calculate_attention_weights()
+        assert weights.argmax() == 0
+        
+        singularity.attention.stimulate([4], [1000.0])
+        assert singularity.calculate_attention_weights().argmax() == 4
+        assert singularity.process_cognitive_query("query { a }")['ecan']['processed_states'] == pytest.approx(1.0)
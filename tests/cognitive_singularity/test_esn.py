@@ -0,0 +1,128 @@
+"""
+Test suite for the ESN reservoir component.
+"""
+
+import pickle
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.esn import EchoStateReservoir, estimate_spectral_radius
+from cognitive_singularity.registry import default_registry
+
+
+class TestEchoStateReservoir:
+    """Test reservoir construction, stepping and sequence modes."""
+
+    def setup_method(self):
+        """Setup for each test method."""
+        self.rng = np.random.default_rng(0)
+        self.reservoir = EchoStateReservoir.random(50, spectral_radius=0.8, leak=0.5)
+        self.inputs = self.rng.normal(0, 0.5, (20, 50)).astype(np.float32)
+
+    def test_spectral_radius_below_one(self):
+        """The recurrent matrix is rescaled to the requested spectral radius."""
+        assert estimate_spectral_radius(self.reservoir.recurrent) == pytest.approx(0.8, rel=1e-4)
+        with pytest.raises(ValueError, match="spectral_radius"):
+            EchoStateReservoir.random(10, spectral_radius=1.2)
+
+    def test_step_matches_dense_reference(self):
+        """Steps follow x' = (1 - a) x + a tanh(W x + s * u)."""
+        dense = self.reservoir.recurrent.to_dense().astype(np.float64)
+        expected = np.zeros(50)
+        for vector in self.inputs[:5]:
+            expected = 0.5 * expected + 0.5 * np.tanh(dense @ expected + vector)
+            result = self.reservoir.step(vector)
+
+        assert np.allclose(result, expected, atol=1e-5)
+        assert np.array_equal(self.reservoir.state, result)
+
+    def test_run_equals_incremental_steps(self):
+        """Sequence mode visits exactly the states of stepping one input at a time."""
+        stepped = EchoStateReservoir.random(50, spectral_radius=0.8, leak=0.5)
+        expected = np.array([stepped.step(vector) for vector in self.inputs])
+
+        assert np.array_equal(self.reservoir.run(self.inputs), expected)
+        assert np.array_equal(self.reservoir.state, stepped.state)
+
+    def test_run_batch_matches_each_sequence(self):
+        """Lockstep multi-sequence runs equal each sequence run on its own."""
+        sequences = self.rng.normal(0, 0.5, (4, 10, 50)).astype(np.float32)
+        outputs, final = self.reservoir.run_batch(sequences)
+
+        for index in range(4):
+            single = EchoStateReservoir.random(50, spectral_radius=0.8, leak=0.5)
+            assert np.array_equal(outputs[index], single.run(sequences[index]))
+            assert np.array_equal(final[index], single.state)
+        assert not self.reservoir.state.any()
+
+    def test_snapshot_and_restore(self):
+        """Restoring a snapshot replays the stream identically."""
+        self.reservoir.run(self.inputs[:10])
+        snapshot = self.reservoir.snapshot()
+        first = self.reservoir.run(self.inputs[10:])
+
+        self.reservoir.restore(snapshot)
+        assert np.array_equal(self.reservoir.run(self.inputs[10:]), first)
+
+        self.reservoir.reset()
+        assert not self.reservoir.state.any()
+        with pytest.raises(ValueError, match="snapshot"):
+            self.reservoir.restore(np.zeros(3))
+
+    def test_pure_mode_ignores_state_and_order(self):
+        """Without stateful, activation is a function of the query alone."""
+        block = self.inputs[:3]
+        batch = self.reservoir.activate(block, np.empty_like(block))
+        self.reservoir.run(self.inputs)
+
+        for row in range(3):
+            assert np.array_equal(batch[row], self.reservoir.activate(block[row], np.empty(50, np.float32)))
+
+    def test_stateful_batch_is_a_stream(self):
+        """Stateful activation treats batch rows as consecutive steps."""
+        stateful = EchoStateReservoir.random(50, spectral_radius=0.8, leak=0.5, stateful=True)
+        result = stateful.activate(self.inputs, np.empty_like(self.inputs))
+
+        assert np.array_equal(result, self.reservoir.run(self.inputs))
+
+    def test_pickling(self):
+        """Reservoirs survive pickling with their state."""
+        self.reservoir.run(self.inputs[:3])
+        clone = pickle.loads(pickle.dumps(self.reservoir))
+
+        assert np.array_equal(clone.state, self.reservoir.state)
+        assert np.array_equal(clone.step(self.inputs[3]), self.reservoir.step(self.inputs[3]))
+
+
+class TestSingularityESN:
+    """Test the reservoir wired into the singularity."""
+
+    def test_default_esn_is_order_independent(self):
+        """The default singularity gives each query the same esn result every time."""
+        singularity = CognitiveSingularity()
+        first = singularity.process_cognitive_query("query { a }")['esn']
+        singularity.process_cognitive_query("query { b }")
+
+        assert singularity.process_cognitive_query("query { a }")['esn'] == first
+
+    def test_stateful_esn_carries_context(self):
+        """A stateful reservoir remembers earlier queries; a batch is a stream."""
+        queries = ["query { a }", "query { b }", "query { c }"]
+        singularity = CognitiveSingularity(registry=default_registry(stateful_esn=True))
+        reservoir = singularity.plan['esn'].processor
+
+        snapshot = reservoir.snapshot()
+        first = singularity.process_cognitive_query(queries[0])['esn']
+        assert singularity.process_cognitive_query(queries[0])['esn'] != first
+
+        reservoir.restore(snapshot)
+        streamed = singularity.process_cognitive_queries(queries)
+        reservoir.restore(snapshot)
+        assert [singularity.process_cognitive_query(query) for query in queries] == streamed
@@ -0,0 +1,107 @@
+"""
+Test suite for the GraphQL-GNN message-passing component.
+"""
+
+import pickle
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.gnn import GraphNeuralNetwork
+from cognitive_singularity.sparse import CSRMatrix, lattice_adjacency
+
+
+class TestGraphNeuralNetwork:
+    """Test message passing over sparse graphs."""
+    
+    def test_matches_dense_reference(self):
+        """Each round equals tanh(h + (1 + w) * (Â h)) with a dense Â."""
+        rng = np.random.default_rng(0)
+        weights = rng.normal(0, 0.1, (4, 4, 4)).astype(np.float32)
+        gnn = GraphNeuralNetwork.lattice((4, 4, 4), weights=weights, rounds=3)
+        features = rng.normal(0, 0.5, 64).astype(np.float32)
+        
+        dense = lattice_adjacency((4, 4, 4)).to_dense()
+        dense /= dense.sum(axis=1, keepdims=True)
+        expected = features.astype(np.float64)
+        for _ in range(3):
+            expected = np.tanh(expected + (1 + weights.ravel()) * (dense @ expected))
+        
+        result = gnn.activate(features, np.empty_like(features))
+        assert np.allclose(result, expected, atol=1e-5)
+    
+    def test_batch_rows_match_single_queries_exactly(self):
+        """An (N, nodes) batch equals running every row on its own."""
+        gnn = GraphNeuralNetwork.lattice()
+        batch = np.random.default_rng(1).normal(0, 0.1, (6, 343)).astype(np.float32)
+        
+        result = gnn.activate(batch, np.empty_like(batch))
+        for row in range(6):
+            assert np.array_equal(result[row], gnn.activate(batch[row], np.empty(343, np.float32)))
+    
+    def test_edgeless_single_round_is_tanh(self):
+        """Without edges one round reduces to the plain activation."""
+        edgeless = CSRMatrix(np.zeros(11, dtype=np.int64), [], np.empty(0, np.float32), (10, 10))
+        gnn = GraphNeuralNetwork(edgeless, rounds=1)
+        features = np.linspace(-2, 2, 10, dtype=np.float32)
+        
+        assert np.array_equal(gnn.activate(features, np.empty_like(features)), np.tanh(features))
+    
+    def test_custom_edge_list(self):
+        """User-supplied CSR graphs are supported."""
+        graph = CSRMatrix.from_edges([0, 1, 2], [1, 2, 0], shape=(3, 3))
+        gnn = GraphNeuralNetwork(graph, rounds=1)
+        features = np.array([1.0, 2.0, 3.0], dtype=np.float32)
+        
+        expected = np.tanh(features + features[[1, 2, 0]])
+        assert np.allclose(gnn.activate(features, np.empty_like(features)), expected)
+    
+    def test_scales_to_large_lattices(self):
+        """A 32³ lattice (32768 nodes) runs batched without per-edge loops."""
+        gnn = GraphNeuralNetwork.lattice((32, 32, 32), rounds=2)
+        batch = np.random.default_rng(2).normal(0, 0.1, (4, 32 ** 3)).astype(np.float32)
+        
+        result = gnn.activate(batch, np.empty_like(batch))
+        assert result.shape == (4, 32 ** 3)
+        assert np.all(np.abs(result) < 1)
+    
+    def test_validation_and_pickling(self):
+        """Bad weights are rejected; processors survive pickling."""
+        with pytest.raises(ValueError, match="node weights"):
+            GraphNeuralNetwork.lattice((3, 3), weights=np.zeros(4))
+        with pytest.raises(ValueError, match="rounds"):
+            GraphNeuralNetwork.lattice((3, 3), rounds=0)
+        
+        gnn = pickle.loads(pickle.dumps(GraphNeuralNetwork.lattice((3, 3))))
+        features = np.ones(9, dtype=np.float32)
+        assert gnn.activate(features, np.empty_like(features)).shape == (9,)
+
+
+class TestSingularityGNN:
+    """Test the GNN wired into the singularity."""
+    
+    def test_weights_come_from_the_tensor_field(self):
+        """The gnn result depends on the tensor field's learned weights."""
+        query = "query { a }"
+        default = CognitiveSingularity()
+        field = default.generate_tensor_field(seed=99)
+        field['gnn'] *= 50
+        weighted = CognitiveSingularity(tensor_field=field)
+        
+        assert (weighted.process_cognitive_query(query)['gnn']
+                != default.process_cognitive_query(query)['gnn'])
+        assert (weighted.process_cognitive_query(query)['das']
+                == default.process_cognitive_query(query)['das'])
+    
+    def test_tensor_field_needs_default_registry(self):
+        """tensor_field cannot be combined with a custom registry."""
+        from cognitive_singularity.registry import default_registry
+        
+        with pytest.raises(ValueError):
+            CognitiveSingularity(registry=default_registry(), tensor_field={})
@@ -0,0 +1,169 @@
+"""
+Test suite for GraphQL parsing and compiled query plans.
+"""
+
+import time
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.graphql import (
+    FEATURE_SIZE, MAX_NESTING, MAX_SELECTIONS, GraphQLSyntaxError, compile_query, normalise, parse, tokenize
+)
+
+
+class TestParser:
+    """Test tokenizing, parsing and normalisation."""
+    
+    def test_tokens_skip_whitespace_commas_and_comments(self):
+        """Insignificant characters never reach the parser."""
+        kinds = [token.kind for token in tokenize('{ a, # note\n b(x: -1.5e3, s: "q") ... }')]
+        assert kinds == ['punct', 'name', 'name', 'punct', 'name', 'punct', 'number',
+                         'name', 'punct', 'string', 'punct', 'spread', 'punct', 'eof']
+    
+    def test_layout_and_order_do_not_matter(self):
+        """Whitespace, commas, field order and argument order normalise away."""
+        first = normalise('query { user(id: 1, active: true) { name, email } posts { title } }')
+        second = normalise("""
+            # Same query, written differently
+            query {
+                posts { title }
+                user(active: true id: 1) { email name }
+            }
+        """)
+        assert first == second == 'query { posts { title } user(active: true, id: 1) { email name } }'
+    
+    def test_shorthand_and_repeated_fields(self):
+        """{ ... } is a query; repeated fields merge their selections."""
+        assert normalise('{ a { x } a { y } b b }') == 'query { a { x y } b }'
+        assert normalise('{ a: a }') == 'query { a }'
+        assert normalise('{ first: a a }') == 'query { a first: a }'
+    
+    def test_values_are_canonical(self):
+        """Object fields are sorted and block strings become plain strings."""
+        query = 'mutation { set(input: {b: [1, 2], a: $v}, text: """\n    hi\n""") }'
+        assert normalise(query) == 'mutation { set(input: {a: $v, b: [1, 2]}, text: "hi") }'
+    
+    def test_operations_variables_and_fragments(self):
+        """Variable definitions, directives and fragments round-trip."""
+        document = parse('query Q($id: ID! = 3) @live { node(id: $id) { ...F ... on T { z } } } '
+                         'fragment F on Node { id }')
+        
+        assert document.operations[0].name == 'Q'
+        assert str(document.operations[0].variables[0]) == '$id: ID! = 3'
+        assert document.fragments[0].type_condition == 'Node'
+        assert str(document) == ('query Q($id: ID! = 3) @live { node(id: $id) { ... on T { z } ...F } } '
+                                 'fragment F on Node { id }')
+    
+    @pytest.mark.parametrize("query, message", [
+        ('test query', 'Expected an operation or fragment'),
+        ('', 'Expected a definition'),
+        ('query { }', 'Expected a selection'),
+        ('query { a(', 'Expected a name'),
+        ('query { a(x: 1, x: 2) }', 'Duplicate argument'),
+        ('query { a(x: ) }', 'Expected a value'),
+        ('query ($a: Int = $b) { a }', 'Variables are not allowed'),
+        ('{ a } ~', 'Unexpected character'),
+    ])
+    def test_syntax_errors(self, query, message):
+        """Invalid documents raise GraphQLSyntaxError with a position."""
+        with pytest.raises(GraphQLSyntaxError, match=message):
+            parse(query)
+
+
+class TestQueryPlan:
+    """Test compiled plans."""
+    
+    def test_fields_depth_and_features(self):
+        """Plans list field paths through fragments and count structure."""
+        plan = compile_query('query { a { b ...F } c(x: 1) } fragment F on T { d { e } }')
+        
+        assert plan.fields == ('a', 'a.b', 'a.d', 'a.d.e', 'c')
+        assert plan.depth == 3
+        assert plan.features.shape == (FEATURE_SIZE,)
+        assert plan.features[0] == pytest.approx(np.log1p(5))
+        assert not plan.features.flags.writeable
+        assert plan.valid
+    
+    def test_fragment_errors(self):
+        """Unknown and self-spreading fragments are rejected."""
+        with pytest.raises(GraphQLSyntaxError, match="Unknown fragment"):
+            compile_query('{ ...Missing }')
+        with pytest.raises(GraphQLSyntaxError, match="spreads itself"):
+            compile_query('{ ...F } fragment F on T { a { ...F } }')
+    
+    def test_nesting_is_bounded(self):
+        """Documents nested past MAX_NESTING are syntax errors, not RecursionError."""
+        deep = '{ ' + 'a { ' * MAX_NESTING + 'b' + ' }' * (MAX_NESTING + 1)
+        with pytest.raises(GraphQLSyntaxError, match="Nesting deeper"):
+            compile_query(deep)
+        with pytest.raises(GraphQLSyntaxError, match="Nesting deeper"):
+            parse('{ a(x: ' + '[' * 500 + ']' * 500 + ') }')
+        
+        chain = ' '.join(f'fragment F{i} on T {{ ...F{i + 1} }}' for i in range(200))
+        with pytest.raises(GraphQLSyntaxError, match="through fragments"):
+            compile_query('{ ...F0 } ' + chain + ' fragment F200 on T { a }')
+        
+        assert compile_query('{ ' + 'a { ' * (MAX_NESTING - 1) + 'b' + ' }' * MAX_NESTING).depth == MAX_NESTING
+    
+    def test_fragment_expansion_is_bounded(self):
+        """Fragments spreading the next one twice fail fast instead of taking 2^N work."""
+        chain = ' '.join(f'fragment F{i} on T {{ a{i}: a ...F{i + 1} b{i}: b {{ ...F{i + 1} }} }}'
+                         for i in range(30))
+        query = '{ ...F0 } ' + chain + ' fragment F30 on T { z }'
+        
+        started = time.perf_counter()
+        with pytest.raises(GraphQLSyntaxError, match=f"More than {MAX_SELECTIONS} selections"):
+            compile_query(query)
+        assert time.perf_counter() - started < 1.0
+        assert not CognitiveSingularity().compile_query(query).valid
+    
+    def test_deep_query_gets_an_opaque_plan(self):
+        """A pathologically deep query is still processed, as opaque text."""
+        query = 'query { ' + 'a { ' * 200 + 'b' + ' }' * 201
+        singularity = CognitiveSingularity()
+        
+        assert not singularity.compile_query(query).valid
+        result = singularity.process_cognitive_query(query)
+        assert result.keys() == singularity.process_cognitive_query('{ a }').keys()
+
+
+class TestSingularityPlans:
+    """Test plan caching in the singularity."""
+    
+    def test_equivalent_queries_share_plan_and_encoding(self):
+        """Layout variants compile once and share one cached encoding."""
+        singularity = CognitiveSingularity()
+        first = singularity.graphql_query_to_tensor('query { user { name email } }')
+        second = singularity.graphql_query_to_tensor('{\n  user { email, name }\n}')
+        
+        assert np.array_equal(first, second)
+        assert singularity.compile_query('{ user { email name } }') is singularity.compile_query(
+            'query { user { name email } }')
+        
+        stats = singularity.stats()
+        assert stats['encoding_cache']['size'] == 1
+        assert stats['plan_cache']['size'] == 1
+        assert stats['plan_cache']['shared'] == 2
+    
+    def test_plan_cache_does_not_change_encodings(self):
+        """Encodings are the same with and without plan caching."""
+        query = 'query { node(id: 7) { value } }'
+        assert np.array_equal(CognitiveSingularity().graphql_query_to_tensor(query),
+                              CognitiveSingularity(plan_cache_size=0).graphql_query_to_tensor(query))
+    
+    def test_non_graphql_text_still_encodes(self):
+        """Text that does not parse gets an opaque plan keyed by its raw text."""
+        singularity = CognitiveSingularity()
+        plan = singularity.compile_query('not graphql')
+        
+        assert not plan.valid and plan.text == 'not graphql'
+        assert len(singularity.graphql_query_to_tensor('not graphql')) == 776
+        assert not np.array_equal(singularity.graphql_query_to_tensor('not graphql'),
+                                  singularity.graphql_query_to_tensor('not  graphql'))
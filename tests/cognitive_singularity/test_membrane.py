@@ -0,0 +1,167 @@
+"""
+Test suite for the P-System membrane engine.
+"""
+
+import pickle
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.membrane import MembraneProcessor, PSystem
+
+
+class TestPSystem:
+    """Test rule semantics of single and batched systems."""
+    
+    def test_maximally_parallel_step(self):
+        """Every applicable object is rewritten in one step."""
+        system = PSystem('ab', [-1]).add_rule(0, 'a', produce='bb')
+        state = system.state({0: 'aaa'})
+        
+        assert system.step(state)[0] == 3
+        assert system.multiset(state, 0) == {'b': 6}
+    
+    def test_products_wait_for_the_next_step(self):
+        """Objects produced in a step cannot be consumed in the same step."""
+        system = PSystem('ab', [-1]).add_rule(0, 'a', produce='b').add_rule(0, 'b', produce='a')
+        state = system.state({0: 'aab'})
+        
+        system.step(state)
+        assert system.multiset(state, 0) == {'a': 1, 'b': 2}
+    
+    def test_competing_rules_follow_priority(self):
+        """Earlier rules take objects first; later rules get the rest."""
+        system = PSystem('acd', [-1]).add_rule(0, 'aa', produce='c').add_rule(0, 'a', produce='d')
+        state = system.state({0: 'aaaaa'})
+        
+        system.step(state)
+        assert system.multiset(state, 0) == {'c': 2, 'd': 1}
+        assert len(system.compile()) == 2
+    
+    def test_multi_object_left_hand_sides(self):
+        """A rule applies as often as its scarcest object allows."""
+        system = PSystem('abc', [-1]).add_rule(0, {'a': 2, 'b': 1}, produce='c')
+        state = system.state({0: {'a': 7, 'b': 5}})
+        
+        system.step(state)
+        assert system.multiset(state, 0) == {'a': 1, 'b': 2, 'c': 3}
+    
+    def test_communication(self):
+        """Objects move out to the parent, into children and out of the skin."""
+        system = (PSystem('abc', [-1, 0])
+                  .add_rule(1, 'a', out='b')
+                  .add_rule(0, 'b', into={1: 'c'}, out='a'))
+        state = system.state({1: 'aa'})
+        
+        system.step(state)
+        assert system.multiset(state, 0) == {'b': 2}
+        system.step(state)
+        assert system.multiset(state, 1) == {'c': 2}
+        assert system.multiset(state, system.environment) == {'a': 2}
+    
+    def test_dissolution_releases_contents_to_the_ancestor(self):
+        """A dissolved membrane hands its objects to the nearest living ancestor."""
+        system = (PSystem('xyz', [-1, 0, 1])
+                  .add_rule(1, 'x', produce='y', dissolve=True)
+                  .add_rule(1, 'z', produce='z')
+                  .add_rule(2, 'z', out='z'))
+        state = system.state({1: 'x', 2: 'zz'})
+        
+        system.step(state)
+        assert list(state.alive[0]) == [True, False, True]
+        assert system.multiset(state, 0) == {'y': 1, 'z': 2}
+        assert system.multiset(state, 1) == {}
+        
+        # Rules of the dissolved membrane no longer run
+        assert system.step(state)[0] == 0
+    
+    def test_batch_runs_in_lockstep(self):
+        """A batch of systems evolves exactly like each system alone."""
+        system = MembraneProcessor.chain(4, 8).system
+        contents = np.random.default_rng(0).integers(0, 40, (6, 4, 8))
+        
+        batch = system.state(contents)
+        steps = system.run(batch)
+        for index in range(6):
+            single = system.state(contents[index])
+            assert system.run(single)[0] == steps[index]
+            assert np.array_equal(single.counts[0], batch.counts[index])
+            assert np.array_equal(single.alive[0], batch.alive[index])
+    
+    def test_run_halts(self):
+        """run() stops once no rule applies."""
+        system = PSystem('ab', [-1]).add_rule(0, 'aa', produce='b')
+        state = system.state({0: {'a': 8}})
+        
+        assert system.run(state)[0] == 1
+        assert system.multiset(state, 0) == {'b': 4}
+    
+    def test_validation(self):
+        """Malformed structures and rules are rejected."""
+        with pytest.raises(ValueError, match="skin"):
+            PSystem('a', [0])
+        with pytest.raises(ValueError, match="earlier membrane"):
+            PSystem('a', [-1, 2, 0])
+        
+        system = PSystem('ab', [-1, 0, 0])
+        with pytest.raises(ValueError, match="cannot dissolve"):
+            system.add_rule(0, 'a', dissolve=True)
+        with pytest.raises(ValueError, match="consume"):
+            system.add_rule(0, '')
+        with pytest.raises(ValueError, match="not a child"):
+            system.add_rule(1, 'a', into={2: 'b'})
+        with pytest.raises(ValueError, match="Unknown object"):
+            system.add_rule(0, 'q')
+
+
+class TestMembraneProcessor:
+    """Test the membrane component processor."""
+    
+    def test_batch_rows_match_single_activations(self):
+        """Batched activation equals activating every row alone."""
+        processor = MembraneProcessor.chain()
+        block = np.random.default_rng(1).normal(0, 0.1, (5, 125)).astype(np.float32)
+        
+        result = processor.activate(block, np.empty_like(block))
+        for row in range(5):
+            assert np.array_equal(result[row], processor.activate(block[row], np.empty(125, np.float32)))
+    
+    def test_rules_conserve_weighted_mass(self):
+        """Fusing two o_k into one o_{k+1} conserves sum(count * 2**k)."""
+        processor = MembraneProcessor.chain(steps=6)
+        block = np.random.default_rng(2).normal(0, 0.2, 125).astype(np.float32)
+        result = processor.activate(block, np.empty_like(block))
+        
+        weights = 2.0 ** np.arange(25)
+        before = (np.floor(np.abs(block.astype(np.float64)) * 100).reshape(5, 25) * weights).sum()
+        after = (np.round(result.astype(np.float64) * 100).reshape(5, 25) * weights).sum()
+        assert after == before
+    
+    def test_replicas_tile_the_chain(self):
+        """for_shape replicates the chain along trailing axes; each block runs alone."""
+        processor = MembraneProcessor.for_shape((5, 5, 5, 3))
+        single = MembraneProcessor.chain()
+        block = np.random.default_rng(3).normal(0, 0.1, (2, 375)).astype(np.float32)
+        result = processor.activate(block, np.empty_like(block))
+        
+        assert processor.size == 375 and processor.replicas == 3
+        for replica in range(3):
+            part = block[:, replica * 125:(replica + 1) * 125]
+            assert np.array_equal(result[:, replica * 125:(replica + 1) * 125],
+                                  single.activate(part, np.empty_like(part)))
+    
+    def test_singularity_uses_the_engine(self):
+        """The membrane component runs the P system and survives pickling."""
+        singularity = CognitiveSingularity()
+        processor = pickle.loads(pickle.dumps(singularity.plan['membrane'].processor))
+        result = singularity.process_cognitive_query("query { membranes }")['membrane']
+        
+        assert result['component'] == 'P-System-Membrane'
+        assert result['processed_states'] >= 0
+        assert processor.system.num_membranes == 5
@@ -0,0 +1,119 @@
+"""
+Test suite for the opt-in instrumentation surface.
+"""
+
+import logging
+
+import pytest
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.metrics import LatencyHistogram, Metrics
+
+
+class TestLatencyHistogram:
+    """Test the log-bucketed histogram."""
+    
+    def test_percentiles_bound_observations(self):
+        """Percentiles fall in the bucket holding the observation."""
+        histogram = LatencyHistogram()
+        for _ in range(99):
+            histogram.observe(1e-5)
+        histogram.observe(1e-2)
+        
+        snapshot = histogram.snapshot()
+        assert snapshot['count'] == 100
+        assert 1e-5 <= snapshot['p50'] < 1.3e-5
+        assert 1e-5 <= snapshot['p99'] < 1.3e-5
+        assert snapshot['max'] == 1e-2
+        assert histogram.percentile(100) >= 1e-2
+    
+    def test_empty_histogram(self):
+        """An empty histogram reports zeros."""
+        assert LatencyHistogram().snapshot()['p99'] == 0.0
+
+
+class TestMetrics:
+    """Test stage timers, counters and exporters."""
+    
+    def test_lap_chains_stages(self):
+        """lap() records each stage and returns the next clock reading."""
+        metrics = Metrics()
+        clock = metrics.clock()
+        clock = metrics.lap('a', clock)
+        metrics.lap('b', clock)
+        metrics.increment('n', 3)
+        
+        stats = metrics.stats()
+        assert set(stats['stages']) == {'a', 'b'}
+        assert stats['counters'] == {'n': 3}
+        
+        metrics.reset()
+        assert metrics.stats() == {'counters': {}, 'stages': {}}
+    
+    def test_exporters_receive_snapshots(self):
+        """export() pushes a snapshot to every registered exporter."""
+        received = []
+        metrics = Metrics(exporters=[received.append])
+        metrics.increment('n')
+        metrics.add_exporter(received.append)
+        
+        snapshot = metrics.export()
+        assert received == [snapshot, snapshot]
+        assert snapshot['counters'] == {'n': 1}
+    
+    def test_interval_export(self):
+        """With export_interval=0 every counter update exports."""
+        received = []
+        metrics = Metrics(exporters=[received.append], export_interval=0)
+        metrics.increment('n')
+        metrics.increment('n')
+        
+        assert [snapshot['counters']['n'] for snapshot in received] == [1, 2]
+
+
+class TestSingularityInstrumentation:
+    """Test instrumentation wired into the singularity."""
+    
+    def test_per_stage_timings(self):
+        """Single and batched queries record per-stage timings."""
+        metrics = Metrics()
+        singularity = CognitiveSingularity(metrics=metrics)
+        singularity.process_cognitive_query("query { a }")
+        singularity.process_cognitive_queries(["query { a }", "query { b }"])
+        
+        stats = singularity.stats()
+        stages = stats['metrics']['stages']
+        for stage in ('encode', 'gnn', 'das', 'esn', 'membrane', 'ecan', 'results', 'query',
+                      'batch.encode', 'batch.gnn', 'batch.ecan', 'batch.results'):
+            assert stages[stage]['count'] >= 1
+        assert stats['metrics']['counters'] == {'queries': 1, 'batches': 1, 'batch_rows': 2}
+        assert stats['encoding_cache']['hits'] == 1
+    
+    def test_results_unchanged_by_instrumentation(self):
+        """Instrumentation never changes results."""
+        query = "query { a }"
+        assert (CognitiveSingularity(metrics=Metrics()).process_cognitive_query(query)
+                == CognitiveSingularity().process_cognitive_query(query))
+    
+    def test_disabled_by_default(self):
+        """Without metrics, stats() reports only the cache."""
+        stats = CognitiveSingularity().stats()
+        assert stats['metrics'] is None
+        assert stats['encoding_cache']['size'] == 0
+    
+    def test_query_logging_is_lazy(self, caplog):
+        """The per-query log line is emitted at INFO and skipped otherwise."""
+        singularity = CognitiveSingularity()
+        
+        with caplog.at_level(logging.WARNING, logger="cognitive_singularity.core"):
+            singularity.process_cognitive_query("query { quiet }")
+        assert "quiet" not in caplog.text
+        
+        with caplog.at_level(logging.INFO, logger="cognitive_singularity.core"):
+            singularity.process_cognitive_query("query { loud }")
+        assert "Processing cognitive query: query { loud }" in caplog.text
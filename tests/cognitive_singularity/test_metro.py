@@ -0,0 +1,98 @@
+"""
+Test suite for the MetroHash64 port.
+"""
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.graphql import compile_query, query_fingerprint, query_fingerprints
+from cognitive_singularity.metro import metro_hash64, metro_hash64_batch
+
+
+# The MetroHash reference test vector: 63 bytes, so every tail step runs
+REFERENCE = b'012345678901234567890123456789012345678901234567890123456789012'
+
+# (seed, input, hash) computed with the vendored go-metro Hash64
+GO_METRO = [
+    (0, b'', 8097384203561113213),
+    (0, b'a', 12641362448282233803),
+    (0, b'abc', 17099979927131455419),
+    (0, b'query { a }', 10630202564495113191),
+    (7, b'query { a }', 3620420757631109264),
+    (0, bytes(range(100)), 14101403071010447550)
+]
+
+
+class TestMetroHash:
+    """Test the scalar and batch hashes against the reference implementation."""
+    
+    def test_reference_vectors(self):
+        """Test the published MetroHash64 test vectors."""
+        assert metro_hash64(REFERENCE, 0).to_bytes(8, 'little').hex().upper() == '6B753DAE06704BAD'
+        assert metro_hash64(REFERENCE, 1).to_bytes(8, 'little').hex().upper() == '3B0D481CF4B9B8DF'
+    
+    @pytest.mark.parametrize('seed,data,expected', GO_METRO)
+    def test_matches_go_metro(self, seed, data, expected):
+        """Test agreement with the vendored Go package."""
+        assert metro_hash64(data, seed) == expected
+        assert metro_hash64_batch([data], seed)[0] == expected
+    
+    def test_input_types(self):
+        """Test that str is UTF-8 encoded and buffers hash like bytes."""
+        text = 'query { ñame }'
+        expected = metro_hash64(text.encode('utf-8'))
+        
+        assert metro_hash64(text) == expected
+        assert metro_hash64(bytearray(text, 'utf-8')) == expected
+        assert metro_hash64(memoryview(text.encode('utf-8'))) == expected
+        assert metro_hash64_batch([text, text.encode('utf-8')]).tolist() == [expected, expected]
+    
+    def test_seed_is_masked_to_64_bits(self):
+        """Test that seeds wrap like uint64."""
+        assert metro_hash64(REFERENCE, -1) == metro_hash64(REFERENCE, (1 << 64) - 1)
+        assert metro_hash64(REFERENCE, 1 << 64) == metro_hash64(REFERENCE, 0)
+    
+    def test_batch_matches_scalar_for_every_tail(self):
+        """Test every combination of rounds and 16/8/4/2/1-byte tails."""
+        rng = np.random.default_rng(0)
+        items = [rng.integers(0, 256, size, dtype=np.uint8).tobytes() for size in range(130)]
+        items += [rng.integers(0, 256, size, dtype=np.uint8).tobytes() for size in rng.integers(0, 130, 50)]
+        
+        for seed in (0, 1, 0xFFFFFFFFFFFFFFFF):
+            hashes = metro_hash64_batch(items, seed)
+            assert hashes.dtype == np.uint64
+            assert hashes.tolist() == [metro_hash64(item, seed) for item in items]
+    
+    def test_batch_keeps_input_order_across_passes(self, monkeypatch):
+        """Test that inputs split over several bounded passes come back in order."""
+        monkeypatch.setattr('cognitive_singularity.metro.BATCH_BYTES', 256)
+        items = [bytes([i]) * (i * 7 % 90) for i in range(40)]
+        
+        assert metro_hash64_batch(items).tolist() == [metro_hash64(item) for item in items]
+    
+    def test_empty_batch(self):
+        """Test that an empty batch gives an empty array."""
+        hashes = metro_hash64_batch([])
+        assert hashes.shape == (0,)
+        assert hashes.dtype == np.uint64
+
+
+class TestQueryFingerprints:
+    """Test query fingerprints built on MetroHash64."""
+    
+    def test_fingerprint_is_metro_hash(self):
+        """Test that fingerprints are MetroHash64 of the UTF-8 text."""
+        query = 'query { cognitive { state } }'
+        assert query_fingerprint(query) == metro_hash64(query.encode('utf-8'))
+        plan = compile_query(query)
+        assert plan.fingerprint == query_fingerprint(plan.text)
+    
+    def test_batch_fingerprints(self):
+        """Test that query_fingerprints agrees with query_fingerprint."""
+        queries = [f'query {{ node(id: {i}) {{ value }} }}' for i in range(20)]
+        assert query_fingerprints(queries).tolist() == [query_fingerprint(query) for query in queries]
@@ -0,0 +1,164 @@
+"""
+Test suite for the concurrent execution engines.
+"""
+
+import threading
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.parallel import ProcessPoolEngine, ThreadPoolEngine
+
+
+QUERIES = [f"query Q{i} {{ node(id: {i}) {{ value }} }}" for i in range(50)]
+
+
+class TestThreadSafety:
+    """Concurrent use of one CognitiveSingularity instance."""
+    
+    def test_concurrent_encoding_is_deterministic(self):
+        """Threads hammering one instance all see the reference encodings."""
+        singularity = CognitiveSingularity(encoding_cache_size=8)
+        expected = {q: CognitiveSingularity(encoding_cache_size=0).graphql_query_to_tensor(q)
+                    for q in QUERIES}
+        mismatches = []
+        
+        def worker():
+            for query in QUERIES:
+                if not np.array_equal(singularity.graphql_query_to_tensor(query), expected[query]):
+                    mismatches.append(query)
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert mismatches == []
+    
+    def test_global_rng_is_untouched(self):
+        """Encoding and field generation leave the global NumPy RNG alone."""
+        singularity = CognitiveSingularity()
+        np.random.seed(1234)
+        expected = np.random.random()
+        
+        np.random.seed(1234)
+        singularity.graphql_query_to_tensor("query { a }")
+        singularity.generate_tensor_field()
+        assert np.random.random() == expected
+    
+    def test_seeded_tensor_field(self):
+        """A seeded tensor field is reproducible."""
+        singularity = CognitiveSingularity()
+        first = singularity.generate_tensor_field(seed=7)
+        second = singularity.generate_tensor_field(seed=7)
+        
+        for name in singularity.components:
+            assert np.array_equal(first[name], second[name])
+
+
+class TestThreadPoolEngine:
+    """Test the thread-pool execution mode."""
+    
+    def test_results_match_serial_path_in_order(self):
+        """Chunked concurrent results equal the serial results, in order."""
+        singularity = CognitiveSingularity()
+        with ThreadPoolEngine(singularity, max_workers=4, chunk_size=7) as engine:
+            results = engine.process_cognitive_queries(QUERIES)
+        
+        assert results == [singularity.process_cognitive_query(q) for q in QUERIES]
+    
+    def test_submit_single_query(self):
+        """Single queries resolve through futures."""
+        with ThreadPoolEngine(max_workers=2) as engine:
+            future = engine.submit(QUERIES[0])
+            assert future.result() == engine.singularity.process_cognitive_query(QUERIES[0])
+    
+    def test_invalid_chunk_size(self):
+        """A non-positive chunk size is rejected."""
+        with pytest.raises(ValueError):
+            ThreadPoolEngine(chunk_size=0)
+
+
+class TestProcessPoolEngine:
+    """Test the shared-memory process pool engine."""
+    
+    def test_results_match_serial_path_in_order(self):
+        """Pool results equal the serial results, across several slot windows."""
+        singularity = CognitiveSingularity()
+        with ProcessPoolEngine(max_workers=2, capacity=16, chunk_size=5) as engine:
+            results = engine.process_cognitive_queries(QUERIES)
+        
+        assert results == [singularity.process_cognitive_query(q) for q in QUERIES]
+    
+    def test_workers_write_into_shared_slots(self):
+        """Encodings and activations land in the shared request/response slots."""
+        singularity = CognitiveSingularity()
+        with ProcessPoolEngine(max_workers=2, capacity=8, chunk_size=4) as engine:
+            states = engine.process_states(QUERIES[:3])
+            requests = engine.slots.arrays['requests'][:3].copy()
+            responses = engine.slots.arrays['responses'][:3].copy()
+        
+        expected = singularity.graphql_queries_to_tensor(QUERIES[:3])
+        assert np.array_equal(requests, expected)
+        activations = np.empty_like(expected)
+        assert np.array_equal(states, singularity.process_tensor_batch(expected, activations=activations))
+        assert np.array_equal(responses, activations)
+    
+    def test_pre_encoded_tensor_batch(self):
+        """Already-encoded matrices can be activated across the pool."""
+        singularity = CognitiveSingularity()
+        matrix = singularity.graphql_queries_to_tensor(QUERIES[:10])
+        with ProcessPoolEngine(max_workers=2, capacity=4, chunk_size=3) as engine:
+            states = engine.process_tensor_states(matrix)
+        
+        assert np.array_equal(states, singularity.process_tensor_batch(matrix))
+    
+    def test_failed_chunk_waits_for_the_whole_window(self):
+        """An error is raised only once no chunk of its window still writes the shared slots."""
+        singularity = CognitiveSingularity()
+        with ProcessPoolEngine(max_workers=2, capacity=64, chunk_size=2) as engine:
+            submitted = []
+            submit = engine._executor.submit
+            
+            def recording_submit(*args):
+                submitted.append(submit(*args))
+                return submitted[-1]
+            
+            engine._executor.submit = recording_submit
+            with pytest.raises(TypeError):
+                engine.process_states([None] + QUERIES * 3)
+            assert all(future.done() for future in submitted)
+            
+            engine._executor.submit = submit
+            assert engine.process_cognitive_queries(QUERIES[:5]) == [
+                singularity.process_cognitive_query(q) for q in QUERIES[:5]]
+    
+    def test_shared_tensor_field(self):
+        """The shared tensor field matches a seeded field generated locally."""
+        singularity = CognitiveSingularity()
+        with ProcessPoolEngine(max_workers=1, capacity=1, field_seed=3) as engine:
+            expected = singularity.generate_tensor_field(seed=3)
+            for name, tensor in expected.items():
+                assert np.array_equal(engine.tensor_field[name], tensor)
+    
+    def test_tensor_field_from_checkpoint(self, tmp_path):
+        """Engines can map a binary checkpoint instead of generating a field."""
+        singularity = CognitiveSingularity()
+        path = singularity.save_tensor_field(str(tmp_path / "field.cstf"), seed=5)
+        
+        with ProcessPoolEngine(max_workers=1, capacity=4, field_path=path) as engine:
+            assert engine.field_slots is None
+            assert isinstance(engine.tensor_field['gnn'], np.memmap)
+            results = engine.process_cognitive_queries(QUERIES[:3])
+        
+        # Workers take their learned weights from the checkpoint
+        weighted = CognitiveSingularity(tensor_field=singularity.load_tensor_field(path))
+        assert results == [weighted.process_cognitive_query(q) for q in QUERIES[:3]]
+        assert results != [singularity.process_cognitive_query(q) for q in QUERIES[:3]]
@@ -0,0 +1,109 @@
+"""
+Test suite for the streaming batch pipeline.
+"""
+
+import io
+import json
+import subprocess
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.pipeline import (
+    ColumnarResultWriter, JsonlResultWriter, chunked, process_stream,
+    read_columnar_results, read_queries, run_pipeline
+)
+
+
+QUERIES = [f"query Q{i} {{ node(id: {i}) {{ value }} }}" for i in range(23)]
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "stream_singularity.py"
+
+
+def jsonl(queries):
+    """Mix bare strings and objects, with a blank line, as real inputs do."""
+    lines = []
+    for i, query in enumerate(queries):
+        lines.append(json.dumps(query if i % 2 else {'query': query, 'id': i}))
+    lines.insert(3, "")
+    return [line + "\n" for line in lines]
+
+
+class TestPipeline:
+    """Test the streaming pipeline building blocks."""
+    
+    def setup_method(self):
+        """Setup for each test method."""
+        self.singularity = CognitiveSingularity()
+        self.expected = self.singularity.process_tensor_batch(
+            self.singularity.graphql_queries_to_tensor(QUERIES))
+    
+    def test_read_queries(self):
+        """Strings and objects are read lazily; blank lines are skipped."""
+        reader = read_queries(iter(jsonl(QUERIES)))
+        assert next(reader) == QUERIES[0]
+        assert list(reader) == QUERIES[1:]
+        
+        assert list(read_queries(['{"body": "q"}'], field='body')) == ["q"]
+        with pytest.raises(ValueError, match="Line 1"):
+            list(read_queries(['{"other": 1}']))
+    
+    def test_chunked(self):
+        """Chunks are fixed size except for the remainder."""
+        assert [len(chunk) for chunk in chunked(range(23), 10)] == [10, 10, 3]
+        assert list(chunked([], 4)) == []
+    
+    def test_process_stream_in_process(self):
+        """Chunked processing matches one big batch."""
+        chunks = list(process_stream(iter(QUERIES), chunk_size=5))
+        
+        assert [len(chunk) for chunk in chunks] == [5, 5, 5, 5, 3]
+        assert np.array_equal(np.concatenate(chunks), self.expected)
+    
+    def test_process_stream_with_workers_preserves_order(self):
+        """Fanning chunks out to a process pool keeps input order."""
+        chunks = list(process_stream(iter(QUERIES), chunk_size=6, workers=2))
+        
+        assert np.array_equal(np.concatenate(chunks), self.expected)
+    
+    def test_jsonl_output(self):
+        """JSONL output has one indexed record per query."""
+        out = io.StringIO()
+        count = run_pipeline(jsonl(QUERIES), JsonlResultWriter(out, self.singularity.components),
+                             chunk_size=4)
+        
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert count == len(QUERIES) == len(records)
+        for i, (record, query) in enumerate(zip(records, QUERIES)):
+            assert record['index'] == i
+            single = self.singularity.process_cognitive_query(query)
+            assert record['processed_states'] == {
+                name: result['processed_states'] for name, result in single.items()
+            }
+    
+    def test_columnar_output(self, tmp_path):
+        """Columnar output stores one float32 column per component."""
+        directory = str(tmp_path / "results")
+        run_pipeline(jsonl(QUERIES), ColumnarResultWriter(directory, self.singularity.components),
+                     chunk_size=7)
+        
+        columns = read_columnar_results(directory)
+        assert list(columns) == list(self.singularity.components)
+        for column, name in enumerate(self.singularity.components):
+            assert np.array_equal(columns[name], self.expected[:, column])
+    
+    def test_cli_streams_stdin_to_stdout(self):
+        """The CLI reads JSONL from stdin and writes JSONL to stdout."""
+        completed = subprocess.run(
+            [sys.executable, str(SCRIPT), "--chunk-size", "8"],
+            input="".join(jsonl(QUERIES)), capture_output=True, text=True, check=True
+        )
+        
+        records = [json.loads(line) for line in completed.stdout.splitlines()]
+        assert [record['index'] for record in records] == list(range(len(QUERIES)))
+        assert "Processed 23 queries" in completed.stderr
@@ -0,0 +1,167 @@
+"""
+Test suite for quantised tensor-field storage.
+"""
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.esn import EchoStateReservoir
+from cognitive_singularity.gnn import GraphNeuralNetwork
+from cognitive_singularity.quant import (
+    BLOCK_Q8_0, QK8_0, BlockQ8Tensor, Float16Tensor, accuracy_report, quantize, quantize_field,
+    storage_nbytes
+)
+from cognitive_singularity.registry import DEFAULT_COMPONENTS, generate_tensor_field
+
+
+QUERIES = [f'query {{ node(id: {i}) {{ value }} }}' for i in range(6)]
+
+
+class TestQuantizedTensors:
+    """Test the f16 and q8_0 storage types."""
+    
+    def setup_method(self):
+        """Setup for each test method."""
+        self.values = np.random.default_rng(5).normal(0, 0.01, (7, 7, 7)).astype(np.float32)
+    
+    def test_q8_0_blocks(self):
+        """Blocks hold a float16 scale and 32 int8 quants; the tail block is padded."""
+        tensor = quantize(self.values, 'q8_0')
+        
+        assert isinstance(tensor, BlockQ8Tensor)
+        assert tensor.data.dtype == BLOCK_Q8_0 and BLOCK_Q8_0.itemsize == 34
+        assert len(tensor.data) == -(-343 // QK8_0) == 11
+        assert tensor.nbytes == storage_nbytes((7, 7, 7), 'q8_0') == 374
+        assert np.abs(tensor.data['qs']).max() == 127
+        assert not tensor.data['qs'][-1, 343 % QK8_0:].any()
+        
+        error = np.abs(tensor.to_float32() - self.values).reshape(-1)
+        scales = np.repeat(tensor.data['d'].astype(np.float32), QK8_0)[:343]
+        assert np.all(error <= scales * 0.5 + 1e-7)
+    
+    def test_f16_storage(self):
+        """Half precision rounds each value to float16."""
+        tensor = quantize(self.values, 'f16')
+        
+        assert isinstance(tensor, Float16Tensor)
+        assert tensor.nbytes == 686
+        assert np.array_equal(tensor.to_float32(), self.values.astype(np.float16).astype(np.float32))
+        assert quantize(tensor, 'f16') is tensor
+        assert np.array_equal(quantize(tensor, 'f32'), tensor.to_float32())
+    
+    def test_dequantize_ranges(self):
+        """Any flat range dequantises to the same values as the whole tensor."""
+        for qtype in ('f16', 'q8_0'):
+            tensor = quantize(self.values, qtype)
+            whole = tensor.to_float32().reshape(-1)
+            for start, stop in ((0, 343), (32, 64), (5, 70), (320, 343)):
+                assert np.array_equal(tensor.dequantize(start, stop), whole[start:stop])
+    
+    def test_multiply_matches_float32_scaling(self, monkeypatch):
+        """multiply() scales by offset + w chunk by chunk, exactly as a float32 1 + w would."""
+        monkeypatch.setattr('cognitive_singularity.quant.DEQUANT_CHUNK', 64)
+        tensor = quantize(self.values, 'q8_0')
+        values = np.random.default_rng(6).standard_normal((3, 343)).astype(np.float32)
+        expected = values * (np.float32(1) + tensor.to_float32().reshape(-1))
+        
+        assert np.array_equal(tensor.multiply(values.copy(), 1.0), expected)
+        assert np.array_equal(tensor.multiply(values[1].copy(), 1.0, np.empty(64, np.float32)), expected[1])
+    
+    def test_generated_fields_match_quantised_float32(self, monkeypatch):
+        """Fields quantised chunk by chunk while drawn equal quantised float32 fields."""
+        monkeypatch.setattr('cognitive_singularity.registry.FIELD_CHUNK', 64)
+        reference = generate_tensor_field(DEFAULT_COMPONENTS, seed=3)
+        
+        for qtype in ('f16', 'q8_0'):
+            assert generate_tensor_field(DEFAULT_COMPONENTS, seed=3, field_type=qtype) == quantize_field(reference, qtype)
+    
+    def test_invalid_types(self):
+        """Unknown storage types and misaligned stores are rejected."""
+        with pytest.raises(ValueError, match="Unknown storage type"):
+            quantize(self.values, 'q4_0')
+        with pytest.raises(ValueError, match="whole blocks"):
+            BlockQ8Tensor.empty((64,)).store(3, np.zeros(8))
+        with pytest.raises(ValueError, match="float16"):
+            Float16Tensor(self.values)
+
+
+class TestQuantizedProcessors:
+    """Test components running on quantised weights."""
+    
+    def test_processors_keep_weights_compact(self):
+        """GNN and ESN hold the quantised tensors and never a float32 scale."""
+        singularity = CognitiveSingularity(field_type='q8_0')
+        gnn, esn = singularity.plan['gnn'].processor, singularity.plan['esn'].processor
+        
+        assert isinstance(gnn.message_weights, BlockQ8Tensor) and gnn.message_scale is None
+        assert isinstance(esn.input_weights, BlockQ8Tensor) and esn.input_scale is None
+        assert singularity.generate_ggml_config()['tensor_field']['type'] == 'q8_0'
+        assert singularity.generate_ggml_config()['tensor_field']['nbytes'] == sum(
+            storage_nbytes(shape, 'q8_0') for shape in DEFAULT_COMPONENTS.values())
+    
+    def test_exactly_representable_weights_match_float32(self):
+        """Weights that float16 holds exactly give the float32 results bit for bit."""
+        weights = (np.random.default_rng(7).normal(0, 0.01, 343).astype(np.float16)).astype(np.float32)
+        block = np.random.default_rng(8).normal(0, 0.5, (4, 343)).astype(np.float32)
+        
+        reference = GraphNeuralNetwork.lattice(weights=weights).activate(block, np.empty_like(block))
+        quantised = GraphNeuralNetwork.lattice(weights=weights.astype(np.float16))
+        assert np.array_equal(quantised.activate(block, np.empty_like(block)), reference)
+        
+        reference = EchoStateReservoir.random(343, weights=weights).activate(block, np.empty_like(block))
+        quantised = EchoStateReservoir.random(343, weights=quantize(weights, 'f16'))
+        assert np.array_equal(quantised.activate(block, np.empty_like(block)), reference)
+    
+    def test_batch_rows_match_single_queries(self):
+        """Quantised batches and single queries agree exactly."""
+        for field_type in ('f16', 'q8_0'):
+            singularity = CognitiveSingularity(field_type=field_type)
+            assert singularity.process_cognitive_queries(QUERIES) == [
+                singularity.process_cognitive_query(query) for query in QUERIES]
+    
+    def test_steady_state_query_does_not_dequantise_copies(self):
+        """A repeated quantised query allocates no float32 copy of the weights."""
+        import tracemalloc
+        
+        singularity = CognitiveSingularity(field_type='q8_0')
+        singularity.process_cognitive_query(QUERIES[0])
+        
+        tracemalloc.start()
+        try:
+            singularity.process_cognitive_query(QUERIES[0])
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            singularity.process_cognitive_query(QUERIES[0])
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+        
+        assert peak < 776 * np.dtype(np.float32).itemsize
+    
+    def test_registry_conflicts(self):
+        """field_type sizes the default registry, so it cannot come with a custom one."""
+        from cognitive_singularity.registry import default_registry
+        with pytest.raises(ValueError, match="field_type"):
+            CognitiveSingularity(registry=default_registry(), field_type='f16')
+
+
+class TestAccuracyReport:
+    """Test the accuracy-versus-memory report."""
+    
+    def test_report(self):
+        """Smaller storage costs bounded accuracy against the float32 path."""
+        report = accuracy_report(QUERIES)
+        
+        assert list(report) == ['f32', 'f16', 'q8_0']
+        assert report['f32']['compression'] == 1.0 and report['f32']['state_max_error'] == 0.0
+        assert report['f16']['bytes'] == 776 * 2
+        assert report['q8_0']['compression'] > 3.5
+        assert 0 < report['f16']['weight_max_error'] < report['q8_0']['weight_max_error'] < 1e-3
+        assert report['q8_0']['activation_max_error'] < 1e-3
+        assert report['q8_0']['state_rms_error'] <= report['q8_0']['state_max_error']
@@ -0,0 +1,236 @@
+"""
+Test suite for the component registry and compiled execution plans.
+"""
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.parallel import ProcessPoolEngine
+from cognitive_singularity.registry import (
+    DEFAULT_COMPONENTS, PRESETS, ComponentRegistry, ElementwiseProcessor, ExecutionPlan,
+    component_shapes, default_registry, tanh_kernel
+)
+
+
+def square_kernel(block, out):
+    """A replacement activation used to swap implementations."""
+    return np.square(block, out=out)
+
+
+class RowOnlyProcessor:
+    """A processor that only understands one flat slice at a time."""
+    
+    label = 'Row-Only'
+    batched = False
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def activate(self, block, out):
+        assert block.ndim == 1
+        self.calls += 1
+        out[...] = block[::-1]
+        return out
+
+
+class TestComponentRegistry:
+    """Test registration and plan compilation."""
+    
+    def test_default_plan(self):
+        """The default registry compiles to the 776-state layout."""
+        plan = default_registry().compile()
+        
+        assert isinstance(plan, ExecutionPlan)
+        assert plan.total == 776
+        assert [step.name for step in plan] == ['gnn', 'das', 'esn', 'membrane', 'ecan']
+        assert [step.offset for step in plan] == [0, 343, 453, 570, 695]
+        assert plan['ecan'].label == 'ECAN-Attention'
+    
+    def test_plan_is_immutable(self):
+        """Compiled plans cannot be modified."""
+        plan = default_registry().compile()
+        with pytest.raises(AttributeError):
+            plan.steps = ()
+    
+    def test_registration_errors(self):
+        """Duplicate names, bad shapes and non-processors are rejected."""
+        registry = default_registry()
+        processor = ElementwiseProcessor('X', tanh_kernel)
+        
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register('gnn', (2,), processor)
+        with pytest.raises(ValueError, match="positive shape"):
+            registry.register('x', (0, 3), processor)
+        with pytest.raises(TypeError):
+            registry.register('x', (3,), object())
+        with pytest.raises(ValueError):
+            ComponentRegistry().compile()
+    
+    def test_swap_implementation(self):
+        """Replacing a processor keeps its position and changes only its result."""
+        registry = default_registry().register(
+            'gnn', (7, 7, 7), ElementwiseProcessor('Squared-GNN', square_kernel), replace=True)
+        custom = CognitiveSingularity(registry=registry)
+        default = CognitiveSingularity()
+        query = "query { a }"
+        
+        result = custom.process_cognitive_query(query)
+        expected = float(np.square(default.graphql_query_to_tensor(query)[:343]).sum())
+        
+        assert result['gnn']['component'] == 'Squared-GNN'
+        assert result['gnn']['processed_states'] == pytest.approx(expected, rel=1e-5)
+        assert result['ecan'] == default.process_cognitive_query(query)['ecan']
+    
+    def test_add_and_remove_components(self):
+        """Custom registries may add or drop components without the 776 guard."""
+        registry = default_registry().unregister('das').register('extra', (4, 4), RowOnlyProcessor())
+        singularity = CognitiveSingularity(registry=registry)
+        
+        assert list(singularity.components) == ['gnn', 'esn', 'membrane', 'ecan', 'extra']
+        assert singularity.total_freedom == 776 - 110 + 16
+        
+        queries = ["query { a }", "query { b }", "query { c }"]
+        batch = singularity.process_cognitive_queries(queries)
+        assert batch == [singularity.process_cognitive_query(q) for q in queries]
+        assert batch[0]['extra']['component'] == 'Row-Only'
+    
+    def test_non_batched_processor_runs_row_by_row(self):
+        """Processors without batch support are looped over rows by the plan."""
+        processor = RowOnlyProcessor()
+        registry = ComponentRegistry().register('solo', (5,), processor)
+        singularity = CognitiveSingularity(registry=registry)
+        
+        matrix = np.arange(15, dtype=np.float32).reshape(3, 5)
+        states = singularity.process_tensor_batch(matrix)
+        
+        assert processor.calls == 3
+        assert np.array_equal(states[:, 0], matrix.sum(axis=1))
+    
+    def test_custom_registry_in_process_pool(self):
+        """Registries are shipped to pool workers."""
+        registry = default_registry().register(
+            'gnn', (7, 7, 7), ElementwiseProcessor('Squared-GNN', square_kernel), replace=True)
+        singularity = CognitiveSingularity(registry=registry)
+        queries = ["query { a }", "query { b }"]
+        
+        with ProcessPoolEngine(max_workers=1, capacity=2, registry=registry) as engine:
+            assert engine.process_cognitive_queries(queries) == singularity.process_cognitive_queries(queries)
+
+
+class TestSelectiveExecution:
+    """Test running a subset of the components."""
+    
+    def setup_method(self):
+        """Setup for each test method."""
+        self.singularity = CognitiveSingularity()
+    
+    def test_plan_select_and_infer(self):
+        """Names resolve to plan columns; field paths infer them."""
+        plan = self.singularity.plan
+        
+        assert plan.select(['ecan', 'gnn']) == (0, 4)
+        assert plan.infer(['echo', 'attentionWeights.value']) == (2, 4)
+        assert plan.infer(['user.name']) == (0, 1, 2, 3, 4)
+        with pytest.raises(ValueError, match="Unknown components"):
+            plan.select(['nope'])
+    
+    def test_selected_results_match_the_full_run(self):
+        """Selected components give exactly their full-pipeline results."""
+        query = "query { node(id: 3) { value } }"
+        full = self.singularity.process_cognitive_query(query)
+        
+        assert self.singularity.process_cognitive_query(query, components='ecan') == {'ecan': full['ecan']}
+        partial = self.singularity.process_cognitive_query(query, components=['esn', 'das'])
+        assert partial == {'das': full['das'], 'esn': full['esn']}
+    
+    def test_skipped_components_are_not_encoded(self):
+        """Only the selected slices are generated; the rest stay zero."""
+        uncached = CognitiveSingularity(encoding_cache_size=0)
+        query = "query { attention { weights } }"
+        matrix = uncached.graphql_queries_to_tensor([query], components='auto')
+        
+        ecan = uncached.plan['ecan'].slice
+        assert np.array_equal(matrix[0, ecan], uncached.graphql_query_to_tensor(query)[ecan])
+        assert not matrix[0, :ecan.start].any()
+        assert list(uncached.process_cognitive_query(query, components='auto')) == ['ecan']
+    
+    def test_batches_run_the_union(self):
+        """An inferred batch runs every component any query names."""
+        queries = ["query { attention }", "query { reservoir { state } }"]
+        batch = self.singularity.process_cognitive_queries(queries, components='auto')
+        
+        assert [list(result) for result in batch] == [['esn', 'ecan'], ['esn', 'ecan']]
+        for query, result in zip(queries, batch):
+            assert result == self.singularity.process_cognitive_query(query, components=['esn', 'ecan'])
+    
+    def test_custom_component_fields(self):
+        """Registered field names select custom components."""
+        registry = default_registry().register('extra', (4,), RowOnlyProcessor(), fields=['Bonus'])
+        singularity = CognitiveSingularity(registry=registry)
+        
+        assert list(singularity.process_cognitive_query("{ bonus }", components='auto')) == ['extra']
+        assert list(singularity.process_cognitive_query("{ extra }", components='auto')) == ['extra']
+
+
+class TestComponentShapes:
+    """Test configurable component shapes and chunked processing of large fields."""
+    
+    SHAPES = {'gnn': (9, 9, 9), 'esn': (4000,), 'membrane': (5, 5, 5, 3)}
+    QUERIES = [f'query {{ node(id: {i}) {{ value }} }}' for i in range(5)]
+    
+    def test_resolving_shapes(self):
+        """None is the default layout, presets are named, overrides merge."""
+        assert component_shapes() == DEFAULT_COMPONENTS
+        assert component_shapes('large') == PRESETS['large']
+        assert component_shapes({'esn': [10, 10]}) == {**DEFAULT_COMPONENTS, 'esn': (10, 10)}
+        
+        with pytest.raises(ValueError, match="Unknown preset"):
+            component_shapes('huge')
+        with pytest.raises(ValueError, match="Unknown component"):
+            component_shapes({'cnn': (3,)})
+        with pytest.raises(ValueError, match="positive sizes"):
+            component_shapes({'esn': (0,)})
+    
+    def test_custom_shapes(self):
+        """A custom layout sizes the field, the config and the state enumeration."""
+        singularity = CognitiveSingularity(shapes=self.SHAPES)
+        total = 729 + 110 + 4000 + 375 + 81
+        
+        assert singularity.total_freedom == total
+        assert singularity.generate_ggml_config()['tensor_field']['shape'] == [total]
+        assert np.array_equal(singularity.enumerate_all_states(), np.arange(total))
+        assert np.array_equal(np.concatenate(list(singularity.iter_states(1000))), np.arange(total))
+        assert singularity.plan['membrane'].processor.replicas == 3
+        
+        result = singularity.process_cognitive_query(self.QUERIES[0])
+        assert result['esn']['shape'] == (4000,)
+        assert singularity.process_cognitive_queries(self.QUERIES) == [
+            singularity.process_cognitive_query(query) for query in self.QUERIES]
+    
+    def test_small_chunks_change_nothing(self, monkeypatch):
+        """Row, scratch and field chunk sizes bound memory without changing results."""
+        expected = CognitiveSingularity(shapes=self.SHAPES)
+        states = expected.graphql_queries_to_tensor(self.QUERIES)
+        
+        monkeypatch.setattr('cognitive_singularity.core.BATCH_CHUNK_ELEMENTS', 6000)
+        monkeypatch.setattr('cognitive_singularity.layout.SCRATCH_SIZE', 512)
+        monkeypatch.setattr('cognitive_singularity.registry.FIELD_CHUNK', 100)
+        chunked = CognitiveSingularity(shapes=self.SHAPES, encoding_cache_size=0)
+        
+        assert np.array_equal(chunked.generate_tensor_field(seed=7)['esn'],
+                              expected.generate_tensor_field(seed=7)['esn'])
+        assert np.array_equal(chunked.graphql_queries_to_tensor(self.QUERIES), states)
+        assert np.array_equal(chunked.process_tensor_batch(states), expected.process_tensor_batch(states))
+        assert (chunked.process_cognitive_queries(self.QUERIES, compact=True).to_dicts()
+                == expected.process_cognitive_queries(self.QUERIES))
+    
+    def test_shapes_conflict_with_a_registry(self):
+        """Shapes size the default registry, so they cannot come with a custom one."""
+        with pytest.raises(ValueError, match="registry"):
+            CognitiveSingularity(registry=default_registry(), shapes='large')
@@ -0,0 +1,118 @@
+"""
+Test suite for compact query results.
+"""
+
+import io
+import pickle
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.results import QueryResult, ResultBatch, ResultSchema
+
+
+QUERIES = [f'query {{ node(id: {i}) {{ value }} }}' for i in range(7)]
+
+
+class TestCompactResults:
+    """Test compact results against the dict form."""
+    
+    def setup_method(self):
+        """Setup for each test method."""
+        self.singularity = CognitiveSingularity()
+    
+    def test_single_query_matches_dict_form(self):
+        """A compact result is a slotted mapping equal to the dict result."""
+        result = self.singularity.process_cognitive_query(QUERIES[0], compact=True)
+        expected = self.singularity.process_cognitive_query(QUERIES[0])
+        
+        assert isinstance(result, QueryResult)
+        assert not hasattr(result, '__dict__')
+        assert result == expected and expected == result
+        assert result.to_dict() == expected
+        assert result['ecan'] == expected['ecan']
+        assert result.state('gnn') == expected['gnn']['processed_states']
+        assert list(result) == list(expected)
+    
+    def test_batch_matches_dict_form(self):
+        """Every row of a ResultBatch equals the dict result of its query."""
+        batch = self.singularity.process_cognitive_queries(QUERIES, compact=True)
+        expected = self.singularity.process_cognitive_queries(QUERIES)
+        
+        assert isinstance(batch, ResultBatch) and len(batch) == len(QUERIES)
+        assert batch.to_dicts() == expected
+        assert all(row == dicts for row, dicts in zip(batch, expected))
+        assert batch[3] == expected[3]
+        assert batch[2:4].to_dicts() == expected[2:4]
+        assert list(batch.column('esn')) == [row['esn']['processed_states'] for row in expected]
+    
+    def test_records_view_the_states(self):
+        """The record array shares memory with the state matrix."""
+        batch = self.singularity.process_cognitive_queries(QUERIES, compact=True)
+        records = batch.records
+        
+        assert records.dtype.names == ('gnn', 'das', 'esn', 'membrane', 'ecan')
+        assert np.shares_memory(records, batch.states)
+        assert np.array_equal(records['das'], batch.column('das'))
+    
+    def test_selected_components(self):
+        """Compact results carry only the selected components."""
+        single = self.singularity.process_cognitive_query(QUERIES[0], components=['esn', 'ecan'],
+                                                          compact=True)
+        batch = self.singularity.process_cognitive_queries(QUERIES, components='ecan', compact=True)
+        
+        assert single == self.singularity.process_cognitive_query(QUERIES[0], components=['esn', 'ecan'])
+        assert batch.schema.names == ('ecan',)
+        assert batch.to_dicts() == self.singularity.process_cognitive_queries(QUERIES, components='ecan')
+        assert self.singularity.result_schema('ecan') is batch.schema
+
+
+class TestSerialisation:
+    """Test the binary batch format."""
+    
+    def setup_method(self):
+        """Setup for each test method."""
+        self.batch = CognitiveSingularity().process_cognitive_queries(QUERIES, compact=True)
+    
+    def test_round_trip_is_zero_copy(self):
+        """Frames reference the matrix; reading back views the buffer."""
+        header, payload = self.batch.to_frames()
+        assert np.shares_memory(np.frombuffer(payload, dtype=np.float32), self.batch.states)
+        assert len(header) % 8 == 0
+        
+        data = bytearray(self.batch.to_bytes())
+        loaded = ResultBatch.from_buffer(data)
+        assert loaded.schema == self.batch.schema
+        assert np.array_equal(loaded.states, self.batch.states)
+        assert loaded.to_dicts() == self.batch.to_dicts()
+        
+        data[-4:] = np.float32(5.0).tobytes()
+        assert loaded.states[-1, -1] == 5.0
+    
+    def test_write_to_file(self):
+        """write() emits the same bytes as to_bytes()."""
+        stream = io.BytesIO()
+        assert self.batch.write(stream) == len(self.batch.to_bytes())
+        assert stream.getvalue() == self.batch.to_bytes()
+    
+    def test_invalid_buffers(self):
+        """Foreign and truncated buffers are rejected."""
+        with pytest.raises(ValueError, match="too short"):
+            ResultBatch.from_buffer(b"CSRB")
+        with pytest.raises(ValueError, match="Not a result batch"):
+            ResultBatch.from_buffer(b"XXXX" + self.batch.to_bytes()[4:])
+        with pytest.raises(ValueError, match="state matrix"):
+            ResultBatch(self.batch.schema, np.zeros((2, 3), dtype=np.float32))
+    
+    def test_pickling(self):
+        """Slotted results pickle like any other value."""
+        clone = pickle.loads(pickle.dumps(self.batch))
+        assert clone.to_dicts() == self.batch.to_dicts()
+        assert pickle.loads(pickle.dumps(self.batch[0])) == self.batch[0]
+        assert pickle.loads(pickle.dumps(self.batch.schema)) == self.batch.schema
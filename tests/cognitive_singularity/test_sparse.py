@@ -0,0 +1,122 @@
+"""
+Test suite for the NumPy CSR sparse matrices.
+"""
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.sparse import CSRMatrix, lattice_adjacency
+
+
+class TestCSRMatrix:
+    """Test construction and sparse-dense products."""
+    
+    def setup_method(self):
+        """Setup for each test method."""
+        # Row 2 is empty; (0, 1) appears twice and is summed
+        self.matrix = CSRMatrix.from_edges([0, 0, 1, 3, 0], [1, 2, 0, 3, 1],
+                                           [1.0, 2.0, 3.0, 4.0, 5.0], shape=(4, 4))
+        self.dense = np.array([[0, 6, 2, 0], [3, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 4]],
+                              dtype=np.float32)
+    
+    def test_from_edges_sums_duplicates(self):
+        """Duplicate edges collapse into one summed entry."""
+        assert self.matrix.nnz == 4
+        assert np.array_equal(self.matrix.to_dense(), self.dense)
+    
+    def test_matmul_vector_and_batch(self):
+        """Vectors and batches agree with the dense product, empty rows included."""
+        rng = np.random.default_rng(0)
+        vector = rng.standard_normal(4).astype(np.float32)
+        batch = rng.standard_normal((5, 4)).astype(np.float32)
+        
+        assert np.allclose(self.matrix @ vector, self.dense @ vector)
+        assert np.allclose(self.matrix.matmul(batch), batch @ self.dense.T)
+        for row in range(5):
+            assert np.array_equal(self.matrix.matmul(batch)[row], self.matrix.matmul(batch[row]))
+    
+    def test_matmul_batch_rows_match_vectors_exactly(self):
+        """Rows with many entries still sum in the same order for vectors and batches."""
+        rng = np.random.default_rng(3)
+        matrix = CSRMatrix.random(200, 0.2, rng)
+        batch = rng.standard_normal((8, 200)).astype(np.float32)
+        product = matrix.matmul(batch)
+        
+        assert np.allclose(product, batch @ matrix.to_dense().T, atol=1e-4)
+        for row in range(8):
+            assert np.array_equal(product[row], matrix.matmul(batch[row]))
+    
+    def test_row_normalised_and_transpose(self):
+        """Row normalisation gives mean aggregation; transpose flips the matrix."""
+        normalised = self.matrix.row_normalised().to_dense()
+        assert np.allclose(normalised.sum(axis=1), [1, 1, 0, 1])
+        assert np.array_equal(self.matrix.transpose().to_dense(), self.dense.T)
+    
+    def test_spectral_radius(self):
+        """Power iteration approximates the largest absolute eigenvalue."""
+        matrix = CSRMatrix.random(60, 0.1, np.random.default_rng(1), dtype=np.float64)
+        symmetric = CSRMatrix.from_edges(
+            np.concatenate([matrix.row_ids(), matrix.indices]),
+            np.concatenate([matrix.indices, matrix.row_ids()]),
+            np.concatenate([matrix.data, matrix.data]), (60, 60), np.float64)
+        expected = np.abs(np.linalg.eigvalsh(symmetric.to_dense())).max()
+        
+        assert symmetric.spectral_radius(iterations=500) == pytest.approx(expected, rel=1e-3)
+    
+    def test_rejects_out_of_range_columns(self):
+        """Column indices must fit the declared shape."""
+        with pytest.raises(ValueError, match="out of range"):
+            CSRMatrix.from_edges([0], [5], shape=(2, 2))
+    
+    def test_blocked_matmul_matches_exactly(self, monkeypatch):
+        """Splitting the rows into blocks bounds the scratch and changes no bits."""
+        rng = np.random.default_rng(4)
+        whole = CSRMatrix.random(300, 0.05, rng)
+        batch = rng.standard_normal((3, 300)).astype(np.float32)
+        
+        monkeypatch.setattr('cognitive_singularity.sparse.BLOCK_ENTRIES', 256)
+        blocked = CSRMatrix(whole.indptr, whole.indices, whole.data, whole.shape)
+        
+        assert blocked.work_size <= 256 < whole.work_size
+        assert np.array_equal(blocked.matmul(batch), whole.matmul(batch))
+        assert np.array_equal(blocked.matmul(batch[1]), whole.matmul(batch[1]))
+    
+    def test_skewed_degrees_stay_linear_in_nnz(self):
+        """A star graph is not padded to the hub's degree on every row."""
+        n = 8000
+        leaves = np.arange(1, n)
+        star = CSRMatrix.from_edges(np.concatenate([np.zeros(n - 1, dtype=np.int64), leaves]),
+                                    np.concatenate([leaves, np.zeros(n - 1, dtype=np.int64)]), shape=(n, n))
+        padded = sum(indices.size for _, indices, _ in star._blocks)
+        assert padded <= 2 * (star.nnz + n)
+        
+        rng = np.random.default_rng(5)
+        batch = rng.standard_normal((3, n)).astype(np.float32)
+        product = star.matmul(batch)
+        assert np.allclose(product[:, 0], batch[:, 1:].sum(axis=1), rtol=1e-4)
+        assert np.array_equal(product[:, 1:], np.repeat(batch[:, :1], n - 1, axis=1))
+        for row in range(3):
+            assert np.array_equal(product[row], star.matmul(batch[row]))
+
+
+class TestLatticeAdjacency:
+    """Test the nearest-neighbour lattice builder."""
+    
+    def test_open_lattice_degrees(self):
+        """Corners have 3 neighbours and interior nodes 6 on a 7³ lattice."""
+        adjacency = lattice_adjacency((7, 7, 7))
+        degrees = adjacency.degrees().reshape(7, 7, 7)
+        
+        assert adjacency.shape == (343, 343)
+        assert degrees[0, 0, 0] == 3
+        assert degrees[3, 3, 3] == 6
+        assert np.array_equal(adjacency.to_dense(), adjacency.to_dense().T)
+    
+    def test_periodic_lattice_is_regular(self):
+        """A periodic lattice gives every node the full neighbourhood."""
+        assert np.all(lattice_adjacency((4, 5), periodic=True).degrees() == 4)
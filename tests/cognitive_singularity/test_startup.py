@@ -0,0 +1,121 @@
+"""
+Test suite for import and construction cost.
+"""
+
+import subprocess
+import time
+
+import pytest
+import numpy as np
+
+# Import the module under test
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cognitive_singularity.core import CognitiveSingularity
+from cognitive_singularity.sparse import lattice_adjacency
+
+ROOT = Path(__file__).parent.parent.parent
+
+# Budgets sit well above measured costs (about 0.15 s cold import including
+# NumPy, about 0.2 ms per construction) so only real regressions trip them
+IMPORT_BUDGET = 1.0
+CONSTRUCTION_BUDGET = 0.0006
+
+# Per-component sums of process_tensor_batch(np.ones((2, 776))) and the
+# processed_states of one node query, recorded from the reference build
+EXPECTED_BATCH_SUMS = [328.77493, 80.41643, 71.09439, 36.25, 0.99999994]
+EXPECTED_QUERY_STATES = {'gnn': 2.2782249450683594, 'das': 54.940147399902344, 'esn': 2.2432050704956055,
+                         'membrane': 3.059999942779541, 'ecan': 1.0000001192092896}
+
+
+def run_python(code: str) -> str:
+    """Run code in a fresh interpreter at the repository root and return its output."""
+    completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                               text=True, check=True, timeout=60)
+    return completed.stdout.strip()
+
+
+class TestImport:
+    """Test what importing the package costs."""
+    
+    def test_package_exports_are_lazy(self):
+        """The package imports nothing heavy until an export is used."""
+        output = run_python(
+            "import sys, cognitive_singularity\n"
+            "print('numpy' in sys.modules)\n"
+            "from cognitive_singularity import CognitiveSingularity\n"
+            "print(sorted(m for m in ('asyncio', 'concurrent.futures', 'multiprocessing') if m in sys.modules))\n"
+            "print(cognitive_singularity.ThreadPoolEngine.__name__)"
+        )
+        assert output.splitlines() == ['False', '[]', 'ThreadPoolEngine']
+    
+    def test_unknown_export(self):
+        """Unknown names still raise AttributeError."""
+        import cognitive_singularity
+        with pytest.raises(AttributeError, match="no attribute"):
+            cognitive_singularity.Missing
+    
+    def test_import_time_budget(self):
+        """A cold import of the core stays inside the budget (best of three)."""
+        code = ("import time\n"
+                "started = time.perf_counter()\n"
+                "from cognitive_singularity import CognitiveSingularity\n"
+                "print(time.perf_counter() - started)")
+        assert min(float(run_python(code)) for _ in range(3)) < IMPORT_BUDGET
+
+
+class TestConstruction:
+    """Test what constructing a singularity costs."""
+    
+    def test_construction_time_budget(self):
+        """Warm constructions stay inside the per-instance budget (best of five rounds)."""
+        CognitiveSingularity()
+        rounds = []
+        for _ in range(5):
+            started = time.perf_counter()
+            for _ in range(10):
+                CognitiveSingularity()
+            rounds.append((time.perf_counter() - started) / 10)
+        assert min(rounds) < CONSTRUCTION_BUDGET
+    
+    def test_invariant_structures_are_shared(self):
+        """Derived matrices, fields and compiled rules are built once; they are read-only."""
+        first, second = CognitiveSingularity(), CognitiveSingularity()
+        
+        assert first.plan['esn'].processor.recurrent is second.plan['esn'].processor.recurrent
+        assert lattice_adjacency((7, 7, 7)) is lattice_adjacency([7, 7, 7])
+        assert not lattice_adjacency((7, 7, 7)).data.flags.writeable
+        assert first.plan['gnn'].processor.adjacency is second.plan['gnn'].processor.adjacency
+        assert first.plan['ecan'].processor.spreading is second.plan['ecan'].processor.spreading
+        assert not first.plan['ecan'].processor.spreading.data.flags.writeable
+        assert first.plan['das'].processor.concepts is second.plan['das'].processor.concepts
+        assert (first.plan['membrane'].processor.system.compile()
+                is second.plan['membrane'].processor.system.compile())
+    
+    def test_mutable_state_stays_per_instance(self):
+        """Instances never see each other's rules, atoms or configs."""
+        first, second = CognitiveSingularity(), CognitiveSingularity()
+        
+        system = first.plan['membrane'].processor.system
+        system.add_rule(0, {'o0': 1})
+        assert len(system.rules) == len(second.plan['membrane'].processor.system.rules) + 1
+        assert system.compile() is not second.plan['membrane'].processor.system.compile()
+        
+        first.plan['das'].processor.atomspace.add_node('ConceptNode', 'extra')
+        assert len(first.plan['das'].processor.atomspace) == len(second.plan['das'].processor.atomspace) + 1
+        
+        config = first.generate_ggml_config()
+        config['tensor_field']['components'].clear()
+        assert len(second.generate_ggml_config()['tensor_field']['components']) == 5
+    
+    def test_results_do_not_change(self):
+        """Shared structures give the recorded results."""
+        result = CognitiveSingularity().process_cognitive_query('query { node(id: 3) { value } }')
+        assert {name: entry['processed_states'] for name, entry in result.items()} == pytest.approx(
+            EXPECTED_QUERY_STATES, rel=1e-6)
+        
+        sums = CognitiveSingularity().process_tensor_batch(np.ones((2, 776)))
+        assert sums.shape == (2, 5)
+        np.testing.assert_allclose(sums, [EXPECTED_BATCH_SUMS] * 2, rtol=1e-6)